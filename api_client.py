@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client for the backend test harnesses
+Keeps one pooled, keep-alive requests.Session per API base URL with:
+- Configurable pool size and retries
+- Per-endpoint timeouts
+- Connection reuse counters
+- Per-route latency/size/status histograms (see latency_stats.py)
+
+Environment overrides:
+    API_POOL_SIZE   max pooled connections per host (default 10)
+    API_RETRIES     retries for connection errors and 502/503/504 (default 2)
+    API_TIMEOUT     default request timeout in seconds (default 30)
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from latency_stats import LatencyRecorder
+
+DEFAULT_POOL_SIZE = int(os.getenv("API_POOL_SIZE", "10"))
+DEFAULT_RETRIES = int(os.getenv("API_RETRIES", "2"))
+DEFAULT_TIMEOUT = float(os.getenv("API_TIMEOUT", "30"))
+
+# Endpoint prefix -> timeout in seconds (longest matching prefix wins)
+ENDPOINT_TIMEOUTS = {
+    "/upload": 120,
+    "/contact/send": 60,
+    "/auth/login": 15,
+}
+
+
+class ApiClient:
+    def __init__(self, api_base: str, pool_size: int = None, retries: int = None,
+                 timeout: float = None, endpoint_timeouts: Dict[str, float] = None):
+        self.api_base = api_base.rstrip("/")
+        self.pool_size = pool_size or DEFAULT_POOL_SIZE
+        self.timeout = timeout or DEFAULT_TIMEOUT
+        self.endpoint_timeouts = dict(ENDPOINT_TIMEOUTS if endpoint_timeouts is None else endpoint_timeouts)
+
+        # POST is never retried on read errors, so non-idempotent calls are not replayed
+        retry = Retry(
+            total=DEFAULT_RETRIES if retries is None else retries,
+            backoff_factor=0.2,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET", "PUT", "DELETE", "HEAD", "OPTIONS"}),
+            raise_on_status=False
+        )
+        self.adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+        self.recorder = LatencyRecorder()
+
+    def timeout_for(self, endpoint: str) -> float:
+        """Resolve the timeout for an endpoint from the per-prefix table"""
+        path = endpoint.split("?", 1)[0]
+        matches = [prefix for prefix in self.endpoint_timeouts if path.startswith(prefix)]
+        if matches:
+            return self.endpoint_timeouts[max(matches, key=len)]
+        return self.timeout
+
+    def request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+        """Send a request through the pooled session; raises requests.exceptions.RequestException"""
+        kwargs.setdefault("timeout", self.timeout_for(endpoint))
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method.upper(), f"{self.api_base}{endpoint}", **kwargs)
+        except requests.exceptions.RequestException:
+            self.recorder.record(method, endpoint, (time.perf_counter() - start) * 1000, 0, 0)
+            raise
+        self.recorder.record(method, endpoint, (time.perf_counter() - start) * 1000,
+                             len(response.content), response.status_code)
+        return response
+
+    def connection_stats(self) -> Dict[str, int]:
+        """Requests served vs. TCP/TLS connections opened across all host pools"""
+        opened = 0
+        served = 0
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            opened += pool.num_connections
+            served += pool.num_requests
+        return {
+            "requests": served,
+            "connections_opened": opened,
+            "connections_reused": max(served - opened, 0)
+        }
+
+    def print_connection_stats(self):
+        stats = self.connection_stats()
+        print(f"🔌 Connections: {stats['requests']} requests over {stats['connections_opened']} "
+              f"connections ({stats['connections_reused']} reused)")
+
+    def close(self):
+        self.session.close()
+
+
+_clients: Dict[str, ApiClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(api_base: str, pool_size: Optional[int] = None) -> ApiClient:
+    """Return the shared client for an API base URL, creating it on first use"""
+    key = api_base.rstrip("/")
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = ApiClient(key, pool_size=pool_size)
+            _clients[key] = client
+        return client
@@ -27,8 +27,11 @@ export default function AdminDashboard() {
   const [contactInfo, setContactInfo] = useState(null);
   const [admins, setAdmins] = useState([]);
   const [storageItems, setStorageItems] = useState([]);
+  const [storageCursor, setStorageCursor] = useState(null);
   const [conversations, setConversations] = useState([]);
   const [totalUnread, setTotalUnread] = useState(0);
+  const [totalConversations, setTotalConversations] = useState(0);
+  const [conversationsCursor, setConversationsCursor] = useState(null);
   const [selectedChat, setSelectedChat] = useState(null);
   const [replyMessage, setReplyMessage] = useState('');
   const [saving, setSaving] = useState(false);
@@ -59,11 +62,11 @@ export default function AdminDashboard() {
     try {
       const headers = getAuthHeaders();
       const [contentRes, skillsRes, servicesRes, projectsRes, contactRes] = await Promise.all([
-        fetch('/api/content'),
-        fetch('/api/skills'),
-        fetch('/api/services'),
+        fetch('/api/content', { cache: 'no-cache' }),
+        fetch('/api/skills', { cache: 'no-cache' }),
+        fetch('/api/services', { cache: 'no-cache' }),
         fetch('/api/projects', { headers }),
-        fetch('/api/contact/info')
+        fetch('/api/contact/info', { cache: 'no-cache' })
       ]);
 
       const contentData = await contentRes.json();
@@ -88,6 +91,7 @@ export default function AdminDashboard() {
       const storageRes = await fetch('/api/storage', { headers });
       const storageData = await storageRes.json();
       setStorageItems(storageData.items || []);
+      setStorageCursor(storageData.nextCursor || null);
 
       // Fetch chat conversations (if user has permission)
       if (authUser?.role === 'super_admin' || authUser?.permissions?.canAccessChat) {
@@ -98,15 +102,29 @@ export default function AdminDashboard() {
     }
   };
 
-  const fetchConversations = async () => {
+  const loadMoreStorage = async () => {
+    try {
+      const res = await fetch(`/api/storage?cursor=${encodeURIComponent(storageCursor)}`, { headers: getAuthHeaders() });
+      const data = await res.json();
+      setStorageItems(prev => [...prev, ...(data.items || [])]);
+      setStorageCursor(data.nextCursor || null);
+    } catch (error) {
+      console.error('Error loading storage items:', error);
+    }
+  };
+
+  const fetchConversations = async (cursor = null) => {
     try {
       const headers = getAuthHeaders();
-      const res = await fetch('/api/chat/conversations', { headers });
+      const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+      const res = await fetch(`/api/chat/conversations${query}`, { headers });
       const data = await res.json();
       
       if (data.success) {
-        setConversations(data.conversations || []);
+        setConversations(prev => cursor ? [...prev, ...(data.conversations || [])] : (data.conversations || []));
+        setConversationsCursor(data.nextCursor || null);
         setTotalUnread(data.totalUnread || 0);
+        setTotalConversations(data.totalConversations || 0);
       }
     } catch (error) {
       console.error('Error fetching conversations:', error);
@@ -119,8 +137,19 @@ export default function AdminDashboard() {
   };
 
   const openChat = async (conversation) => {
-    setSelectedChat(conversation);
+    setSelectedChat({ ...conversation, messages: conversation.lastMessage ? [conversation.lastMessage] : [] });
     setReplyMessage('');
+
+    // The list only carries summaries; load the full message history
+    try {
+      const res = await fetch(`/api/chat/${conversation.id}`, { headers: getAuthHeaders() });
+      const data = await res.json();
+      if (data.success) {
+        setSelectedChat(data.conversation);
+      }
+    } catch (error) {
+      console.error('Error loading conversation:', error);
+    }
     
     // Mark as read
     if (conversation.unreadCount > 0) {
@@ -161,8 +190,11 @@ export default function AdminDashboard() {
         setReplyMessage('');
         
         // Update conversations list
+        const { messages, ...summary } = data.conversation;
         setConversations(prev => 
-          prev.map(c => c.id === selectedChat.id ? data.conversation : c)
+          prev.map(c => c.id === selectedChat.id
+            ? { ...c, ...summary, lastMessage: messages[messages.length - 1] || null }
+            : c)
         );
         
         alert('Reply sent successfully!');
@@ -433,10 +465,11 @@ export default function AdminDashboard() {
         body: formData
       });
 
+      const data = await res.json();
       if (res.ok) {
-        const data = await res.json();
         return data.url;
       }
+      alert(data.error || 'Failed to upload file');
     } catch (error) {
       console.error('Upload failed:', error);
       alert('Failed to upload file');
@@ -887,6 +920,13 @@ export default function AdminDashboard() {
                     ))
                   )}
                 </div>
+                {storageCursor && (
+                  <div className="mt-4 text-center">
+                    <Button variant="outline" onClick={loadMoreStorage}>
+                      Load more
+                    </Button>
+                  </div>
+                )}
               </CardContent>
             </Card>
           </TabsContent>
@@ -901,14 +941,14 @@ export default function AdminDashboard() {
                   <CardTitle className="flex items-center justify-between">
                     <span>Conversations</span>
                     <button 
-                      onClick={fetchConversations}
+                      onClick={() => fetchConversations()}
                       className="text-sm text-gray-600 hover:text-black"
                     >
                       Refresh
                     </button>
                   </CardTitle>
                   <CardDescription>
-                    {conversations.length} total, {totalUnread} unread
+                    {totalConversations || conversations.length} total, {totalUnread} unread
                   </CardDescription>
                 </CardHeader>
                 <CardContent className="p-0">
@@ -940,7 +980,7 @@ export default function AdminDashboard() {
                             <p className="text-xs text-gray-600 mb-2">{conv.customerPhone}</p>
                           )}
                           <p className="text-sm text-gray-700 truncate">
-                            {conv.messages[conv.messages.length - 1]?.message}
+                            {conv.lastMessage?.message}
                           </p>
                           <p className="text-xs text-gray-400 mt-1">
                             {new Date(conv.lastMessageAt).toLocaleString()}
@@ -948,6 +988,14 @@ export default function AdminDashboard() {
                         </button>
                       ))
                     )}
+                    {conversationsCursor && (
+                      <button
+                        onClick={() => fetchConversations(conversationsCursor)}
+                        className="w-full p-3 text-sm text-gray-600 hover:text-black hover:bg-gray-50"
+                      >
+                        Load more
+                      </button>
+                    )}
                   </div>
                 </CardContent>
               </Card>
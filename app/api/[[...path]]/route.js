@@ -1,11 +1,22 @@
 import { NextResponse } from 'next/server';
-import { getCollection } from '@/lib/mongodb';
-import { hashPassword, comparePassword, generateToken, getAuthUser, requireAuth } from '@/lib/auth';
+import { getCollection, poolStats } from '@/lib/mongodb';
+import {
+  hashPassword, comparePassword, generateToken, getAuthUser, requireAuth, authCacheStats
+} from '@/lib/auth';
 import { sendBrevoEmail } from '@/lib/brevo-service';
+import { createRouter } from '@/lib/router';
+import { parseLimit, encodeCursor, decodeCursor, descendingAfter } from '@/lib/pagination';
+import {
+  newMessage, findConversation, createConversation, appendMessage, loadMessages, withMessages,
+  markCustomerMessagesRead, storedSeq
+} from '@/lib/chat-store';
+import { subscribe, streamStats } from '@/lib/chat-events';
+import { SITE_COLLECTIONS, bumpVersion, getVersions, versionTag } from '@/lib/versions';
+import { PRIVATE_CACHE_CONTROL, isNotModified, setCacheHeaders } from '@/lib/http-cache';
+import { readCache } from '@/lib/cache';
+import { passwordPoolStats } from '@/lib/password-pool';
+import { saveUpload } from '@/lib/uploads';
 import { v4 as uuidv4 } from 'uuid';
-import formidable from 'formidable';
-import fs from 'fs';
-import path from 'path';
 
 function handleCORS(response) {
   response.headers.set('Access-Control-Allow-Origin', process.env.CORS_ORIGINS || '*');
@@ -19,878 +30,1104 @@ export async function OPTIONS() {
   return handleCORS(new NextResponse(null, { status: 200 }));
 }
 
-async function handleRoute(request, { params }) {
-  const { path: pathParams = [] } = params;
-  const route = `/${pathParams.join('/')}`;
-  const method = request.method;
+// Public read tagged with the version stamps of the collections it reads:
+// 304 without touching the data when the client already holds this version.
+// Stamps are read before the data, so the ETag can only understate freshness.
+// Cacheable reads keep the ETag and serialized body in readCache, so a hit needs
+// no MongoDB round-trip at all.
+async function versionedRead(request, collectionNames, prefix, build, cacheable = false) {
+  let etag;
+  let body;
+  if (cacheable) {
+    ({ etag, body } = await readCache.wrap(prefix, collectionNames, async () => {
+      const tag = versionTag(prefix, await getVersions(collectionNames));
+      return { etag: tag, body: JSON.stringify(await build()) };
+    }));
+  } else {
+    etag = versionTag(prefix, await getVersions(collectionNames));
+  }
 
-  try {
-    // Auth Routes
-    if (route === '/auth/login' && method === 'POST') {
-      const { username, password } = await request.json();
-      const admins = await getCollection('admins');
-      const admin = await admins.findOne({ username });
-
-      if (!admin || !comparePassword(password, admin.password)) {
-        return handleCORS(NextResponse.json({ error: 'Invalid credentials' }, { status: 401 }));
-      }
+  if (isNotModified(request, etag)) {
+    return handleCORS(setCacheHeaders(new NextResponse(null, { status: 304 }), etag));
+  }
+  if (body === undefined) {
+    body = JSON.stringify(await build());
+  }
+  return handleCORS(setCacheHeaders(
+    new NextResponse(body, { headers: { 'Content-Type': 'application/json' } }), etag
+  ));
+}
 
-      const token = generateToken({ 
-        id: admin.id, 
-        username: admin.username, 
-        role: admin.role,
-        permissions: admin.permissions || {
-          canManageAdmins: admin.role === 'super_admin',
-          canViewPrivateProjects: true,
-          canAccessPrivateStorage: true,
-          canAccessChat: true
-        }
-      });
-      return handleCORS(NextResponse.json({ 
-        token, 
-        admin: { 
-          id: admin.id, 
-          username: admin.username, 
-          role: admin.role,
-          permissions: admin.permissions || {
-            canManageAdmins: admin.role === 'super_admin',
-            canViewPrivateProjects: true,
-            canAccessPrivateStorage: true,
-            canAccessChat: true
-          }
-        } 
-      }));
-    }
+// Every write to a public collection: new ETag version, and drop this process's cached reads
+async function publicDataChanged(collectionName) {
+  await bumpVersion(collectionName);
+  readCache.invalidate(collectionName);
+}
 
-    if (route === '/auth/verify' && method === 'GET') {
-      const user = getAuthUser(request);
-      if (!user) {
-        return handleCORS(NextResponse.json({ error: 'Unauthorized' }, { status: 401 }));
-      }
-      return handleCORS(NextResponse.json({ user }));
-    }
+// Auth Routes
+async function login(request) {
+  const { username, password } = await request.json();
+  const admins = await getCollection('admins');
+  const admin = await admins.findOne({ username });
+
+  if (!admin || !(await comparePassword(password, admin.password))) {
+    return handleCORS(NextResponse.json({ error: 'Invalid credentials' }, { status: 401 }));
+  }
 
-    if (route === '/auth/init' && method === 'POST') {
-      const admins = await getCollection('admins');
-      const existingAdmin = await admins.findOne({ role: 'super_admin' });
-      
-      if (existingAdmin) {
-        return handleCORS(NextResponse.json({ error: 'Super admin already exists' }, { status: 400 }));
+  const token = generateToken({ 
+    id: admin.id, 
+    username: admin.username, 
+    role: admin.role,
+    permissions: admin.permissions || {
+      canManageAdmins: admin.role === 'super_admin',
+      canViewPrivateProjects: true,
+      canAccessPrivateStorage: true,
+      canAccessChat: true
+    }
+  });
+  return handleCORS(NextResponse.json({ 
+    token, 
+    admin: { 
+      id: admin.id, 
+      username: admin.username, 
+      role: admin.role,
+      permissions: admin.permissions || {
+        canManageAdmins: admin.role === 'super_admin',
+        canViewPrivateProjects: true,
+        canAccessPrivateStorage: true,
+        canAccessChat: true
       }
+    } 
+  }));
+}
 
-      const { username, password } = await request.json();
-      const hashedPassword = hashPassword(password);
-      const newAdmin = {
-        id: uuidv4(),
-        username,
-        password: hashedPassword,
-        role: 'super_admin',
-        permissions: {
-          canManageAdmins: true,
-          canViewPrivateProjects: true,
-          canAccessPrivateStorage: true,
-          canAccessChat: true
-        },
-        createdAt: new Date(),
-        createdBy: 'system'
-      };
+async function verifyAuth(request) {
+  const user = getAuthUser(request);
+  if (!user) {
+    return handleCORS(NextResponse.json({ error: 'Unauthorized' }, { status: 401 }));
+  }
+  return handleCORS(NextResponse.json({ user }));
+}
 
-      await admins.insertOne(newAdmin);
-      const token = generateToken({ 
-        id: newAdmin.id, 
-        username: newAdmin.username, 
-        role: newAdmin.role,
-        permissions: newAdmin.permissions
-      });
-      return handleCORS(NextResponse.json({ 
-        token, 
-        admin: { 
-          id: newAdmin.id, 
-          username: newAdmin.username, 
-          role: newAdmin.role,
-          permissions: newAdmin.permissions
-        } 
-      }));
-    }
+async function initSuperAdmin(request) {
+  const admins = await getCollection('admins');
+  const existingAdmin = await admins.findOne({ role: 'super_admin' });
+  
+  if (existingAdmin) {
+    return handleCORS(NextResponse.json({ error: 'Super admin already exists' }, { status: 400 }));
+  }
 
-    // Admin Management Routes (Super Admin Only)
-    if (route === '/admins' && method === 'GET') {
-      const authCheck = requireAuth(request, true);
-      if (authCheck.error) {
-        return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
-      }
+  const { username, password } = await request.json();
+  const hashedPassword = await hashPassword(password);
+  const newAdmin = {
+    id: uuidv4(),
+    username,
+    password: hashedPassword,
+    role: 'super_admin',
+    permissions: {
+      canManageAdmins: true,
+      canViewPrivateProjects: true,
+      canAccessPrivateStorage: true,
+      canAccessChat: true
+    },
+    createdAt: new Date(),
+    createdBy: 'system'
+  };
+
+  await admins.insertOne(newAdmin);
+  const token = generateToken({ 
+    id: newAdmin.id, 
+    username: newAdmin.username, 
+    role: newAdmin.role,
+    permissions: newAdmin.permissions
+  });
+  return handleCORS(NextResponse.json({ 
+    token, 
+    admin: { 
+      id: newAdmin.id, 
+      username: newAdmin.username, 
+      role: newAdmin.role,
+      permissions: newAdmin.permissions
+    } 
+  }));
+}
 
-      const admins = await getCollection('admins');
-      const allAdmins = await admins.find({}).toArray();
-      const sanitizedAdmins = allAdmins.map(a => ({ 
-        id: a.id, 
-        username: a.username, 
-        role: a.role, 
-        createdAt: a.createdAt, 
-        createdBy: a.createdBy,
-        permissions: a.permissions || {
-          canManageAdmins: a.role === 'super_admin',
-          canViewPrivateProjects: true,
-          canAccessPrivateStorage: true,
-          canAccessChat: true
-        }
-      }));
-      return handleCORS(NextResponse.json({ admins: sanitizedAdmins }));
+// Admin Management Routes (Super Admin Only)
+async function listAdmins(request) {
+  const authCheck = requireAuth(request, true);
+  if (authCheck.error) {
+    return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
+  }
+
+  const admins = await getCollection('admins');
+  const allAdmins = await admins.find({}).toArray();
+  const sanitizedAdmins = allAdmins.map(a => ({ 
+    id: a.id, 
+    username: a.username, 
+    role: a.role, 
+    createdAt: a.createdAt, 
+    createdBy: a.createdBy,
+    permissions: a.permissions || {
+      canManageAdmins: a.role === 'super_admin',
+      canViewPrivateProjects: true,
+      canAccessPrivateStorage: true,
+      canAccessChat: true
     }
+  }));
+  return handleCORS(NextResponse.json({ admins: sanitizedAdmins }));
+}
 
-    if (route === '/admins' && method === 'POST') {
-      const authCheck = requireAuth(request, true);
-      if (authCheck.error) {
-        return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
-      }
+async function createAdmin(request) {
+  const authCheck = requireAuth(request, true);
+  if (authCheck.error) {
+    return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
+  }
 
-      const { username, password, role, permissions } = await request.json();
-      const admins = await getCollection('admins');
-      const existing = await admins.findOne({ username });
+  const { username, password, role, permissions } = await request.json();
+  const admins = await getCollection('admins');
+  const existing = await admins.findOne({ username });
 
-      if (existing) {
-        return handleCORS(NextResponse.json({ error: 'Username already exists' }, { status: 400 }));
-      }
+  if (existing) {
+    return handleCORS(NextResponse.json({ error: 'Username already exists' }, { status: 400 }));
+  }
 
-      const hashedPassword = hashPassword(password);
-      const defaultPermissions = {
-        canManageAdmins: false,
-        canViewPrivateProjects: true,
-        canAccessPrivateStorage: true,
-        canAccessChat: true
-      };
+  const hashedPassword = await hashPassword(password);
+  const defaultPermissions = {
+    canManageAdmins: false,
+    canViewPrivateProjects: true,
+    canAccessPrivateStorage: true,
+    canAccessChat: true
+  };
+
+  const newAdmin = {
+    id: uuidv4(),
+    username,
+    password: hashedPassword,
+    role: role || 'admin',
+    permissions: role === 'super_admin' ? {
+      canManageAdmins: true,
+      canViewPrivateProjects: true,
+      canAccessPrivateStorage: true,
+      canAccessChat: true
+    } : (permissions || defaultPermissions),
+    createdAt: new Date(),
+    createdBy: authCheck.user.username
+  };
+
+  await admins.insertOne(newAdmin);
+  return handleCORS(NextResponse.json({ 
+    admin: { 
+      id: newAdmin.id, 
+      username: newAdmin.username, 
+      role: newAdmin.role,
+      permissions: newAdmin.permissions 
+    } 
+  }));
+}
 
-      const newAdmin = {
-        id: uuidv4(),
-        username,
-        password: hashedPassword,
-        role: role || 'admin',
-        permissions: role === 'super_admin' ? {
-          canManageAdmins: true,
-          canViewPrivateProjects: true,
-          canAccessPrivateStorage: true,
-          canAccessChat: true
-        } : (permissions || defaultPermissions),
-        createdAt: new Date(),
-        createdBy: authCheck.user.username
-      };
+async function updateAdmin(request, { params }) {
+  const authCheck = requireAuth(request, true);
+  if (authCheck.error) {
+    return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
+  }
 
-      await admins.insertOne(newAdmin);
-      return handleCORS(NextResponse.json({ 
-        admin: { 
-          id: newAdmin.id, 
-          username: newAdmin.username, 
-          role: newAdmin.role,
-          permissions: newAdmin.permissions 
-        } 
-      }));
-    }
+  const adminId = params.id;
+  const { username, password, permissions } = await request.json();
+  const admins = await getCollection('admins');
+  
+  const updateData = {};
+  if (username) updateData.username = username;
+  if (password) updateData.password = await hashPassword(password);
+  if (permissions) updateData.permissions = permissions;
+
+  await admins.updateOne({ id: adminId }, { $set: updateData });
+  return handleCORS(NextResponse.json({ success: true }));
+}
 
-    if (route.startsWith('/admins/') && method === 'PUT') {
-      const authCheck = requireAuth(request, true);
-      if (authCheck.error) {
-        return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
-      }
+async function deleteAdmin(request, { params }) {
+  const authCheck = requireAuth(request, true);
+  if (authCheck.error) {
+    return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
+  }
 
-      const adminId = route.split('/')[2];
-      const { username, password, permissions } = await request.json();
-      const admins = await getCollection('admins');
-      
-      const updateData = {};
-      if (username) updateData.username = username;
-      if (password) updateData.password = hashPassword(password);
-      if (permissions) updateData.permissions = permissions;
-
-      await admins.updateOne({ id: adminId }, { $set: updateData });
-      return handleCORS(NextResponse.json({ success: true }));
-    }
+  const adminId = params.id;
+  const admins = await getCollection('admins');
+  const admin = await admins.findOne({ id: adminId });
 
-    if (route.startsWith('/admins/') && method === 'DELETE') {
-      const authCheck = requireAuth(request, true);
-      if (authCheck.error) {
-        return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
-      }
+  if (admin && admin.role === 'super_admin') {
+    return handleCORS(NextResponse.json({ error: 'Cannot delete super admin' }, { status: 400 }));
+  }
 
-      const adminId = route.split('/')[2];
-      const admins = await getCollection('admins');
-      const admin = await admins.findOne({ id: adminId });
+  await admins.deleteOne({ id: adminId });
+  return handleCORS(NextResponse.json({ success: true }));
+}
 
-      if (admin && admin.role === 'super_admin') {
-        return handleCORS(NextResponse.json({ error: 'Cannot delete super admin' }, { status: 400 }));
-      }
+// Content Routes
+// Defaults are seeded once by lib/bootstrap.js, so reads never write
+async function readSiteContent() {
+  const content = await getCollection('site_content');
+  return content.findOne({});
+}
 
-      await admins.deleteOne({ id: adminId });
-      return handleCORS(NextResponse.json({ success: true }));
-    }
+async function getContent(request) {
+  return versionedRead(request, ['site_content'], 'content', async () => ({ content: await readSiteContent() }), true);
+}
 
-    // Content Routes
-    if (route === '/content' && method === 'GET') {
-      const content = await getCollection('site_content');
-      let siteContent = await content.findOne({});
-      
-      if (!siteContent) {
-        siteContent = {
-          id: uuidv4(),
-          hero: {
-            title: 'Prompt Forge',
-            tagline: 'Crafting AI Excellence with Cutting-Edge Technology',
-            description: 'We transform ideas into powerful AI solutions using modern technologies and intelligent prompt engineering.',
-            ctaButtons: [
-              { text: 'View Services', link: '#services' },
-              { text: 'Contact Us', link: '#contact' }
-            ]
-          },
-          about: {
-            title: 'About Prompt Forge',
-            description: 'Prompt Forge is a modern AI development company specializing in prompt engineering, AI-assisted development, and intelligent solutions. We combine cutting-edge AI technology with creative design to build exceptional digital experiences.'
-          },
-          footer: {
-            text: '© Prompt Forge — All Rights Reserved'
-          },
-          theme: {
-            mode: 'light',
-            accentColor: '#000000',
-            animationsEnabled: true
-          }
-        };
-        await content.insertOne(siteContent);
-      }
+async function updateContent(request) {
+  const authCheck = requireAuth(request);
+  if (authCheck.error) {
+    return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
+  }
 
-      return handleCORS(NextResponse.json({ content: siteContent }));
-    }
+  const updates = await request.json();
+  const content = await getCollection('site_content');
+  await content.updateOne({}, { $set: updates }, { upsert: true });
+  await publicDataChanged('site_content');
+  return handleCORS(NextResponse.json({ success: true }));
+}
 
-    if (route === '/content' && method === 'PUT') {
-      const authCheck = requireAuth(request);
-      if (authCheck.error) {
-        return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
-      }
+// Skills Routes
+async function readSkills() {
+  const skills = await getCollection('skills');
+  return skills.find({}).sort({ order: 1 }).toArray();
+}
 
-      const updates = await request.json();
-      const content = await getCollection('site_content');
-      await content.updateOne({}, { $set: updates }, { upsert: true });
-      return handleCORS(NextResponse.json({ success: true }));
-    }
+async function listSkills(request) {
+  return versionedRead(request, ['skills'], 'skills', async () => ({ skills: await readSkills() }), true);
+}
 
-    // Skills Routes
-    if (route === '/skills' && method === 'GET') {
-      const skills = await getCollection('skills');
-      const allSkills = await skills.find({}).sort({ order: 1 }).toArray();
-      
-      if (allSkills.length === 0) {
-        const defaultSkills = [
-          { id: uuidv4(), name: 'HTML', level: 90, icon: '🌐', order: 1 },
-          { id: uuidv4(), name: 'CSS', level: 85, icon: '🎨', order: 2 },
-          { id: uuidv4(), name: 'Python', level: 88, icon: '🐍', order: 3 },
-          { id: uuidv4(), name: 'JavaScript', level: 92, icon: '⚡', order: 4 },
-          { id: uuidv4(), name: 'React', level: 90, icon: '⚛️', order: 5 },
-          { id: uuidv4(), name: 'Node.js', level: 87, icon: '🟢', order: 6 }
-        ];
-        await skills.insertMany(defaultSkills);
-        return handleCORS(NextResponse.json({ skills: defaultSkills }));
-      }
+async function createSkill(request) {
+  const authCheck = requireAuth(request);
+  if (authCheck.error) {
+    return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
+  }
 
-      return handleCORS(NextResponse.json({ skills: allSkills }));
-    }
+  const skillData = await request.json();
+  const skills = await getCollection('skills');
+  const newSkill = {
+    id: uuidv4(),
+    ...skillData,
+    order: skillData.order || 999
+  };
+  await skills.insertOne(newSkill);
+  await publicDataChanged('skills');
+  return handleCORS(NextResponse.json({ skill: newSkill }));
+}
 
-    if (route === '/skills' && method === 'POST') {
-      const authCheck = requireAuth(request);
-      if (authCheck.error) {
-        return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
-      }
+async function updateSkill(request, { params }) {
+  const authCheck = requireAuth(request);
+  if (authCheck.error) {
+    return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
+  }
 
-      const skillData = await request.json();
-      const skills = await getCollection('skills');
-      const newSkill = {
-        id: uuidv4(),
-        ...skillData,
-        order: skillData.order || 999
-      };
-      await skills.insertOne(newSkill);
-      return handleCORS(NextResponse.json({ skill: newSkill }));
-    }
+  const skillId = params.id;
+  const updates = await request.json();
+  const skills = await getCollection('skills');
+  await skills.updateOne({ id: skillId }, { $set: updates });
+  await publicDataChanged('skills');
+  return handleCORS(NextResponse.json({ success: true }));
+}
 
-    if (route.startsWith('/skills/') && method === 'PUT') {
-      const authCheck = requireAuth(request);
-      if (authCheck.error) {
-        return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
-      }
+async function deleteSkill(request, { params }) {
+  const authCheck = requireAuth(request);
+  if (authCheck.error) {
+    return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
+  }
 
-      const skillId = route.split('/')[2];
-      const updates = await request.json();
-      const skills = await getCollection('skills');
-      await skills.updateOne({ id: skillId }, { $set: updates });
-      return handleCORS(NextResponse.json({ success: true }));
-    }
+  const skillId = params.id;
+  const skills = await getCollection('skills');
+  await skills.deleteOne({ id: skillId });
+  await publicDataChanged('skills');
+  return handleCORS(NextResponse.json({ success: true }));
+}
 
-    if (route.startsWith('/skills/') && method === 'DELETE') {
-      const authCheck = requireAuth(request);
-      if (authCheck.error) {
-        return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
-      }
+// Services Routes
+async function readServices() {
+  const services = await getCollection('services');
+  return services.find({}).sort({ order: 1 }).toArray();
+}
 
-      const skillId = route.split('/')[2];
-      const skills = await getCollection('skills');
-      await skills.deleteOne({ id: skillId });
-      return handleCORS(NextResponse.json({ success: true }));
-    }
+async function listServices(request) {
+  return versionedRead(request, ['services'], 'services', async () => ({ services: await readServices() }), true);
+}
 
-    // Services Routes
-    if (route === '/services' && method === 'GET') {
-      const services = await getCollection('services');
-      const allServices = await services.find({}).sort({ order: 1 }).toArray();
-      
-      if (allServices.length === 0) {
-        const defaultServices = [
-          { id: uuidv4(), title: 'Web Development', description: 'Custom websites built with modern technologies', icon: '🌐', order: 1 },
-          { id: uuidv4(), title: 'App Development', description: 'Mobile and web applications that scale', icon: '📱', order: 2 },
-          { id: uuidv4(), title: 'Bug Fixing', description: 'Quick and efficient problem solving', icon: '🐛', order: 3 },
-          { id: uuidv4(), title: 'Maintenance', description: 'Ongoing support and updates', icon: '🔧', order: 4 },
-          { id: uuidv4(), title: 'Business Websites', description: 'Professional sites for your business', icon: '💼', order: 5 },
-          { id: uuidv4(), title: 'Portfolio Websites', description: 'Showcase your work beautifully', icon: '🎨', order: 6 }
-        ];
-        await services.insertMany(defaultServices);
-        return handleCORS(NextResponse.json({ services: defaultServices }));
-      }
+async function createService(request) {
+  const authCheck = requireAuth(request);
+  if (authCheck.error) {
+    return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
+  }
 
-      return handleCORS(NextResponse.json({ services: allServices }));
-    }
+  const serviceData = await request.json();
+  const services = await getCollection('services');
+  const newService = {
+    id: uuidv4(),
+    ...serviceData,
+    order: serviceData.order || 999
+  };
+  await services.insertOne(newService);
+  await publicDataChanged('services');
+  return handleCORS(NextResponse.json({ service: newService }));
+}
 
-    if (route === '/services' && method === 'POST') {
-      const authCheck = requireAuth(request);
-      if (authCheck.error) {
-        return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
-      }
+async function updateService(request, { params }) {
+  const authCheck = requireAuth(request);
+  if (authCheck.error) {
+    return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
+  }
 
-      const serviceData = await request.json();
-      const services = await getCollection('services');
-      const newService = {
-        id: uuidv4(),
-        ...serviceData,
-        order: serviceData.order || 999
-      };
-      await services.insertOne(newService);
-      return handleCORS(NextResponse.json({ service: newService }));
-    }
+  const serviceId = params.id;
+  const updates = await request.json();
+  const services = await getCollection('services');
+  await services.updateOne({ id: serviceId }, { $set: updates });
+  await publicDataChanged('services');
+  return handleCORS(NextResponse.json({ success: true }));
+}
 
-    if (route.startsWith('/services/') && method === 'PUT') {
-      const authCheck = requireAuth(request);
-      if (authCheck.error) {
-        return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
-      }
+async function deleteService(request, { params }) {
+  const authCheck = requireAuth(request);
+  if (authCheck.error) {
+    return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
+  }
 
-      const serviceId = route.split('/')[2];
-      const updates = await request.json();
-      const services = await getCollection('services');
-      await services.updateOne({ id: serviceId }, { $set: updates });
-      return handleCORS(NextResponse.json({ success: true }));
-    }
+  const serviceId = params.id;
+  const services = await getCollection('services');
+  await services.deleteOne({ id: serviceId });
+  await publicDataChanged('services');
+  return handleCORS(NextResponse.json({ success: true }));
+}
 
-    if (route.startsWith('/services/') && method === 'DELETE') {
-      const authCheck = requireAuth(request);
-      if (authCheck.error) {
-        return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
-      }
+// Projects Routes
+// Public view - only non-private projects (isPrivate false or unset)
+const PUBLIC_PROJECTS_QUERY = { isPrivate: { $in: [false, null] } };
 
-      const serviceId = route.split('/')[2];
-      const services = await getCollection('services');
-      await services.deleteOne({ id: serviceId });
-      return handleCORS(NextResponse.json({ success: true }));
-    }
+async function readProjects(query, offset = 0, limit = 0) {
+  const projects = await getCollection('projects');
+  let cursor = projects.find(query, { projection: { _id: 0 } }).sort({ order: 1, id: 1 });
+  if (offset > 0) cursor = cursor.skip(offset);
+  if (limit > 0) cursor = cursor.limit(Math.min(limit, 500));
+  return cursor.toArray();
+}
 
-    // Projects Routes
-    if (route === '/projects' && method === 'GET') {
-      const projects = await getCollection('projects');
-      let allProjects = await projects.find({}).sort({ order: 1 }).toArray();
-      
-      // Check if request has auth (admin view) or public view
-      const authHeader = request.headers.get('authorization');
-      if (authHeader && authHeader.startsWith('Bearer ')) {
-        const authCheck = requireAuth(request);
-        if (!authCheck.error) {
-          // Admin is viewing - filter based on role
-          if (authCheck.user.role !== 'super_admin') {
-            // Regular admins only see their own projects
-            allProjects = allProjects.filter(p => p.createdBy === authCheck.user.username);
-          }
-          // Super admin sees all projects
-        } else {
-          // Auth failed, show only public projects
-          allProjects = allProjects.filter(p => !p.isPrivate);
-        }
-      } else {
-        // Public view - only show non-private projects
-        allProjects = allProjects.filter(p => !p.isPrivate);
-      }
-      
-      return handleCORS(NextResponse.json({ projects: allProjects }));
+async function listProjects(request) {
+  const { searchParams } = new URL(request.url);
+  const limit = parseInt(searchParams.get('limit'), 10);
+  const offset = parseInt(searchParams.get('offset'), 10);
+
+  let query = PUBLIC_PROJECTS_QUERY;
+
+  // Check if request has auth (admin view) or public view
+  const authHeader = request.headers.get('authorization');
+  if (authHeader && authHeader.startsWith('Bearer ')) {
+    // Auth failed keeps the public query
+    const authCheck = requireAuth(request);
+    if (!authCheck.error) {
+      // Super admin sees all projects, regular admins only their own
+      query = authCheck.user.role === 'super_admin' ? {} : { createdBy: authCheck.user.username };
     }
+  }
 
-    if (route === '/projects' && method === 'POST') {
-      const authCheck = requireAuth(request);
-      if (authCheck.error) {
-        return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
-      }
+  let response;
+  if (query === PUBLIC_PROJECTS_QUERY) {
+    response = await versionedRead(request, ['projects'], 'projects',
+      async () => ({ projects: await readProjects(query, offset, limit) }));
+  } else {
+    response = handleCORS(setCacheHeaders(
+      NextResponse.json({ projects: await readProjects(query, offset, limit) }), null, PRIVATE_CACHE_CONTROL
+    ));
+  }
+  // The same URL answers differently per token
+  response.headers.set('Vary', 'Authorization');
+  return response;
+}
 
-      const projectData = await request.json();
-      const projects = await getCollection('projects');
-      const newProject = {
-        id: uuidv4(),
-        ...projectData,
-        isPrivate: projectData.isPrivate || false,
-        createdBy: authCheck.user.username,
-        order: projectData.order || 999,
-        createdAt: new Date()
-      };
-      await projects.insertOne(newProject);
-      return handleCORS(NextResponse.json({ project: newProject }));
-    }
+async function createProject(request) {
+  const authCheck = requireAuth(request);
+  if (authCheck.error) {
+    return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
+  }
 
-    if (route.startsWith('/projects/') && method === 'PUT') {
-      const authCheck = requireAuth(request);
-      if (authCheck.error) {
-        return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
-      }
+  const projectData = await request.json();
+  const projects = await getCollection('projects');
+  const newProject = {
+    id: uuidv4(),
+    ...projectData,
+    isPrivate: projectData.isPrivate || false,
+    createdBy: authCheck.user.username,
+    order: projectData.order || 999,
+    createdAt: new Date()
+  };
+  await projects.insertOne(newProject);
+  await publicDataChanged('projects');
+  return handleCORS(NextResponse.json({ project: newProject }));
+}
 
-      const projectId = route.split('/')[2];
-      const updates = await request.json();
-      const projects = await getCollection('projects');
-      await projects.updateOne({ id: projectId }, { $set: updates });
-      return handleCORS(NextResponse.json({ success: true }));
-    }
+async function updateProject(request, { params }) {
+  const authCheck = requireAuth(request);
+  if (authCheck.error) {
+    return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
+  }
 
-    if (route.startsWith('/projects/') && method === 'DELETE') {
-      const authCheck = requireAuth(request);
-      if (authCheck.error) {
-        return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
-      }
+  const projectId = params.id;
+  const updates = await request.json();
+  const projects = await getCollection('projects');
+  await projects.updateOne({ id: projectId }, { $set: updates });
+  await publicDataChanged('projects');
+  return handleCORS(NextResponse.json({ success: true }));
+}
 
-      const projectId = route.split('/')[2];
-      const projects = await getCollection('projects');
-      await projects.deleteOne({ id: projectId });
-      return handleCORS(NextResponse.json({ success: true }));
-    }
+async function deleteProject(request, { params }) {
+  const authCheck = requireAuth(request);
+  if (authCheck.error) {
+    return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
+  }
 
-    // Contact Routes
-    if (route === '/contact/info' && method === 'GET') {
-      const contact = await getCollection('contact_info');
-      let contactInfo = await contact.findOne({});
-      
-      if (!contactInfo) {
-        contactInfo = {
-          id: uuidv4(),
-          email: 'promptfordge@gmail.com',
-          phone: '8328284501',
-          socialLinks: [
-            { name: 'Instagram', url: '', icon: 'instagram' },
-            { name: 'Twitter', url: '', icon: 'twitter' }
-          ],
-          formEnabled: true
-        };
-        await contact.insertOne(contactInfo);
-      }
+  const projectId = params.id;
+  const projects = await getCollection('projects');
+  await projects.deleteOne({ id: projectId });
+  await publicDataChanged('projects');
+  return handleCORS(NextResponse.json({ success: true }));
+}
 
-      return handleCORS(NextResponse.json({ contact: contactInfo }));
-    }
+// Contact Routes
+async function readContactInfo() {
+  const contact = await getCollection('contact_info');
+  return contact.findOne({});
+}
 
-    if (route === '/contact/info' && method === 'PUT') {
-      const authCheck = requireAuth(request);
-      if (authCheck.error) {
-        return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
-      }
+async function getContactInfo(request) {
+  return versionedRead(
+    request, ['contact_info'], 'contact', async () => ({ contact: await readContactInfo() }), true
+  );
+}
 
-      const updates = await request.json();
-      const contact = await getCollection('contact_info');
-      await contact.updateOne({}, { $set: updates }, { upsert: true });
-      return handleCORS(NextResponse.json({ success: true }));
-    }
+async function updateContactInfo(request) {
+  const authCheck = requireAuth(request);
+  if (authCheck.error) {
+    return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
+  }
 
-    if (route === '/contact/send' && method === 'POST') {
-      const { name, email, message } = await request.json();
-      
-      if (!name || !email || !message) {
-        return handleCORS(NextResponse.json({ error: 'Missing required fields' }, { status: 400 }));
-      }
+  const updates = await request.json();
+  const contact = await getCollection('contact_info');
+  await contact.updateOne({}, { $set: updates }, { upsert: true });
+  await publicDataChanged('contact_info');
+  return handleCORS(NextResponse.json({ success: true }));
+}
 
-      try {
-        const contact = await getCollection('contact_info');
-        const contactInfo = await contact.findOne({});
+async function sendContactMessage(request) {
+  const { name, email, message } = await request.json();
+  
+  if (!name || !email || !message) {
+    return handleCORS(NextResponse.json({ error: 'Missing required fields' }, { status: 400 }));
+  }
 
-        if (!contactInfo || !contactInfo.formEnabled) {
-          return handleCORS(NextResponse.json({ error: 'Contact form is currently disabled' }, { status: 400 }));
-        }
+  try {
+    const contact = await getCollection('contact_info');
+    const contactInfo = await contact.findOne({});
 
-        const adminEmailHtml = `
-          <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-            <h2 style="color: #000; border-bottom: 2px solid #000; padding-bottom: 10px;">New Contact Form Submission</h2>
-            <div style="margin: 20px 0;">
-              <p><strong>Name:</strong> ${name}</p>
-              <p><strong>Email:</strong> ${email}</p>
-              <p><strong>Message:</strong></p>
-              <p style="background: #f5f5f5; padding: 15px; border-radius: 5px;">${message.replace(/\n/g, '<br>')}</p>
-            </div>
-            <hr style="margin: 20px 0;">
-            <p style="color: #666; font-size: 12px;">This email was sent from the Prompt Forge contact form.</p>
-          </div>
-        `;
-
-        await sendBrevoEmail({
-          to: [{ email: contactInfo.email || process.env.ADMIN_EMAIL, name: 'Prompt Forge Admin' }],
-          subject: `New Contact Form: Message from ${name}`,
-          htmlContent: adminEmailHtml,
-          replyTo: { email, name }
-        });
-
-        return handleCORS(NextResponse.json({ success: true, message: 'Your message has been sent successfully!' }));
-      } catch (error) {
-        console.error('Error sending email:', error);
-        return handleCORS(NextResponse.json({ error: 'Failed to send message. Please try again later.' }, { status: 500 }));
-      }
+    if (!contactInfo || !contactInfo.formEnabled) {
+      return handleCORS(NextResponse.json({ error: 'Contact form is currently disabled' }, { status: 400 }));
     }
 
-    // Private Storage Routes
-    if (route === '/storage' && method === 'GET') {
-      const authCheck = requireAuth(request);
-      if (authCheck.error) {
-        return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
-      }
+    const adminEmailHtml = `
+      <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+        <h2 style="color: #000; border-bottom: 2px solid #000; padding-bottom: 10px;">New Contact Form Submission</h2>
+        <div style="margin: 20px 0;">
+          <p><strong>Name:</strong> ${name}</p>
+          <p><strong>Email:</strong> ${email}</p>
+          <p><strong>Message:</strong></p>
+          <p style="background: #f5f5f5; padding: 15px; border-radius: 5px;">${message.replace(/\n/g, '<br>')}</p>
+        </div>
+        <hr style="margin: 20px 0;">
+        <p style="color: #666; font-size: 12px;">This email was sent from the Prompt Forge contact form.</p>
+      </div>
+    `;
+
+    await sendBrevoEmail({
+      to: [{ email: contactInfo.email || process.env.ADMIN_EMAIL, name: 'Prompt Forge Admin' }],
+      subject: `New Contact Form: Message from ${name}`,
+      htmlContent: adminEmailHtml,
+      replyTo: { email, name }
+    });
+
+    return handleCORS(NextResponse.json({ success: true, message: 'Your message has been sent successfully!' }));
+  } catch (error) {
+    console.error('Error sending email:', error);
+    return handleCORS(NextResponse.json({ error: 'Failed to send message. Please try again later.' }, { status: 500 }));
+  }
+}
 
-      const storage = await getCollection('private_storage');
-      const allItems = await storage.find({}).sort({ createdAt: -1 }).toArray();
-      
-      // Filter based on permissions and visibility
-      const visibleItems = allItems.filter(item => {
-        // Creator can always see their items
-        if (item.createdBy === authCheck.user.username) return true;
-        // Check if user is in visibleTo list
-        if (item.visibleTo && item.visibleTo.includes(authCheck.user.username)) return true;
-        // Super admin can see all
-        if (authCheck.user.role === 'super_admin') return true;
-        return false;
-      });
-
-      return handleCORS(NextResponse.json({ items: visibleItems }));
-    }
+// Public site bundle: everything the homepage renders in one response
+async function getSite(request) {
+  return versionedRead(request, SITE_COLLECTIONS, 'site', async () => {
+    const [content, skills, services, projects, contact] = await Promise.all([
+      readSiteContent(),
+      readSkills(),
+      readServices(),
+      readProjects(PUBLIC_PROJECTS_QUERY),
+      readContactInfo()
+    ]);
+    return { content, skills, services, projects, contact };
+  });
+}
 
-    if (route === '/storage' && method === 'POST') {
-      const authCheck = requireAuth(request);
-      if (authCheck.error) {
-        return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
-      }
+// Private Storage Routes
+async function listStorageItems(request) {
+  const authCheck = requireAuth(request);
+  if (authCheck.error) {
+    return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
+  }
 
-      const itemData = await request.json();
-      const storage = await getCollection('private_storage');
-      const newItem = {
-        id: uuidv4(),
-        ...itemData,
-        createdBy: authCheck.user.username,
-        createdAt: new Date(),
-        updatedAt: new Date()
-      };
+  const { searchParams } = new URL(request.url);
+  const limit = parseLimit(searchParams.get('limit'), 100, 500);
+  let cursor;
+  try {
+    cursor = decodeCursor(searchParams.get('cursor'));
+  } catch (error) {
+    return handleCORS(NextResponse.json({ error: error.message }, { status: 400 }));
+  }
 
-      await storage.insertOne(newItem);
-      return handleCORS(NextResponse.json({ item: newItem }));
-    }
+  // Creator can always see their items, visibleTo grants access to others, super admin sees all
+  const { username, role } = authCheck.user;
+  const visibility = role === 'super_admin' ? {} : { $or: [{ createdBy: username }, { visibleTo: username }] };
+  const query = cursor ? { $and: [visibility, descendingAfter('createdAt', cursor)] } : visibility;
+
+  const storage = await getCollection('private_storage');
+  const page = await storage
+    .find(query, { projection: { _id: 0 } })
+    .sort({ createdAt: -1, id: -1 })
+    .limit(limit + 1)
+    .toArray();
+
+  const hasMore = page.length > limit;
+  const items = page.slice(0, limit);
+  const last = items[items.length - 1];
+
+  return handleCORS(NextResponse.json({
+    items,
+    nextCursor: hasMore ? encodeCursor(last.createdAt, last.id) : null
+  }));
+}
 
-    if (route.startsWith('/storage/') && method === 'PUT') {
-      const authCheck = requireAuth(request);
-      if (authCheck.error) {
-        return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
-      }
+async function createStorageItem(request) {
+  const authCheck = requireAuth(request);
+  if (authCheck.error) {
+    return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
+  }
 
-      const itemId = route.split('/')[2];
-      const updates = await request.json();
-      const storage = await getCollection('private_storage');
-      
-      // Verify ownership or super admin
-      const item = await storage.findOne({ id: itemId });
-      if (!item) {
-        return handleCORS(NextResponse.json({ error: 'Item not found' }, { status: 404 }));
-      }
-      
-      if (item.createdBy !== authCheck.user.username && authCheck.user.role !== 'super_admin') {
-        return handleCORS(NextResponse.json({ error: 'Unauthorized' }, { status: 403 }));
-      }
+  const itemData = await request.json();
+  const storage = await getCollection('private_storage');
+  const newItem = {
+    id: uuidv4(),
+    ...itemData,
+    createdBy: authCheck.user.username,
+    createdAt: new Date(),
+    updatedAt: new Date()
+  };
+
+  await storage.insertOne(newItem);
+  return handleCORS(NextResponse.json({ item: newItem }));
+}
 
-      await storage.updateOne({ id: itemId }, { $set: { ...updates, updatedAt: new Date() } });
-      return handleCORS(NextResponse.json({ success: true }));
-    }
+async function updateStorageItem(request, { params }) {
+  const authCheck = requireAuth(request);
+  if (authCheck.error) {
+    return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
+  }
 
-    if (route.startsWith('/storage/') && method === 'DELETE') {
-      const authCheck = requireAuth(request);
-      if (authCheck.error) {
-        return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
-      }
+  const itemId = params.id;
+  const updates = await request.json();
+  const storage = await getCollection('private_storage');
+  
+  // Verify ownership or super admin
+  const item = await storage.findOne({ id: itemId });
+  if (!item) {
+    return handleCORS(NextResponse.json({ error: 'Item not found' }, { status: 404 }));
+  }
+  
+  if (item.createdBy !== authCheck.user.username && authCheck.user.role !== 'super_admin') {
+    return handleCORS(NextResponse.json({ error: 'Unauthorized' }, { status: 403 }));
+  }
 
-      const itemId = route.split('/')[2];
-      const storage = await getCollection('private_storage');
-      
-      // Verify ownership or super admin
-      const item = await storage.findOne({ id: itemId });
-      if (!item) {
-        return handleCORS(NextResponse.json({ error: 'Item not found' }, { status: 404 }));
-      }
-      
-      if (item.createdBy !== authCheck.user.username && authCheck.user.role !== 'super_admin') {
-        return handleCORS(NextResponse.json({ error: 'Unauthorized' }, { status: 403 }));
-      }
+  await storage.updateOne({ id: itemId }, { $set: { ...updates, updatedAt: new Date() } });
+  return handleCORS(NextResponse.json({ success: true }));
+}
+
+async function deleteStorageItem(request, { params }) {
+  const authCheck = requireAuth(request);
+  if (authCheck.error) {
+    return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
+  }
+
+  const itemId = params.id;
+  const storage = await getCollection('private_storage');
+  
+  // Verify ownership or super admin
+  const item = await storage.findOne({ id: itemId });
+  if (!item) {
+    return handleCORS(NextResponse.json({ error: 'Item not found' }, { status: 404 }));
+  }
+  
+  if (item.createdBy !== authCheck.user.username && authCheck.user.role !== 'super_admin') {
+    return handleCORS(NextResponse.json({ error: 'Unauthorized' }, { status: 403 }));
+  }
+
+  await storage.deleteOne({ id: itemId });
+  return handleCORS(NextResponse.json({ success: true }));
+}
+
+// Upload Route
+async function uploadFile(request) {
+  const authCheck = requireAuth(request);
+  if (authCheck.error) {
+    return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
+  }
 
-      await storage.deleteOne({ id: itemId });
-      return handleCORS(NextResponse.json({ success: true }));
+  try {
+    const { url, duplicate } = await saveUpload(request);
+    return handleCORS(NextResponse.json({ url, duplicate }));
+  } catch (error) {
+    if (error.status) {
+      return handleCORS(NextResponse.json({ error: error.message }, { status: error.status }));
     }
+    console.error('Upload error:', error);
+    return handleCORS(NextResponse.json({ error: 'Upload failed' }, { status: 500 }));
+  }
+}
 
-    // Upload Route
-    if (route === '/upload' && method === 'POST') {
-      const authCheck = requireAuth(request);
-      if (authCheck.error) {
-        return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
-      }
+// ============================================
+// CHAT SYSTEM APIs
+// ============================================
 
-      try {
-        const formData = await request.formData();
-        const file = formData.get('file');
-        
-        if (!file) {
-          return handleCORS(NextResponse.json({ error: 'No file uploaded' }, { status: 400 }));
-        }
+// Customer sends a message
+async function sendChatMessage(request) {
+  const { customerName, customerEmail, customerPhone, message } = await request.json();
+  
+  if (!customerName || !customerEmail || !message) {
+    return handleCORS(NextResponse.json({ error: 'Name, email and message are required' }, { status: 400 }));
+  }
 
-        const bytes = await file.arrayBuffer();
-        const buffer = Buffer.from(bytes);
-        
-        const uploadDir = path.join(process.cwd(), 'public', 'uploads');
-        if (!fs.existsSync(uploadDir)) {
-          fs.mkdirSync(uploadDir, { recursive: true });
-        }
+  // Find existing conversation by email or phone
+  const existingChat = await findConversation({ 
+    $or: [
+      { customerEmail },
+      { customerPhone: customerPhone || null }
+    ]
+  });
+
+  const customerMessage = newMessage('customer', message);
+
+  if (existingChat) {
+    // Update existing conversation
+    const updatedChat = await appendMessage(existingChat.id, customerMessage, {
+      set: {
+        customerName, // Update name in case it changed
+        customerPhone: customerPhone || existingChat.customerPhone
+      },
+      inc: { unreadCount: 1 }
+    });
+    
+    return handleCORS(NextResponse.json({ 
+      success: true, 
+      chatId: existingChat.id,
+      conversation: await withMessages(updatedChat)
+    }));
+  } else {
+    // Create new conversation
+    const newChat = await createConversation({
+      customerName,
+      customerEmail,
+      customerPhone: customerPhone || ''
+    }, customerMessage);
+
+    return handleCORS(NextResponse.json({ 
+      success: true, 
+      chatId: newChat.id,
+      conversation: { ...newChat, messages: [newChat.lastMessage] }
+    }));
+  }
+}
+
+function customerQuery(email, phone) {
+  if (email && phone) {
+    return { $or: [{ customerEmail: email }, { customerPhone: phone }] };
+  }
+  return email ? { customerEmail: email } : { customerPhone: phone };
+}
 
-        const fileName = `${Date.now()}-${file.name.replace(/\s/g, '-')}`;
-        const filePath = path.join(uploadDir, fileName);
-        fs.writeFileSync(filePath, buffer);
+// Get chat history by email/phone (for cross-device sync)
+async function getChatHistory(request) {
+  const { searchParams } = new URL(request.url);
+  const email = searchParams.get('email');
+  const phone = searchParams.get('phone');
+  // Highest message seq the client already has; enables incremental sync
+  const since = parseInt(searchParams.get('since'), 10);
 
-        const fileUrl = `/uploads/${fileName}`;
-        return handleCORS(NextResponse.json({ url: fileUrl }));
-      } catch (error) {
-        console.error('Upload error:', error);
-        return handleCORS(NextResponse.json({ error: 'Upload failed' }, { status: 500 }));
-      }
+  if (!email && !phone) {
+    return handleCORS(NextResponse.json({ error: 'Email or phone required' }, { status: 400 }));
+  }
+
+  const chat = await findConversation(customerQuery(email, phone));
+
+  if (since >= 0) {
+    // Nothing new: one summary read and an empty response. storedSeq, not
+    // messageCount, so a message still being written is never skipped over
+    const upTo = chat ? storedSeq(chat) : 0;
+    if (upTo <= since) {
+      return handleCORS(new NextResponse(null, { status: 204 }));
     }
 
-    // ============================================
-    // CHAT SYSTEM APIs
-    // ============================================
-    
-    // Customer sends a message
-    if (route === '/chat/send' && method === 'POST') {
-      const { customerName, customerEmail, customerPhone, message } = await request.json();
-      
-      if (!customerName || !customerEmail || !message) {
-        return handleCORS(NextResponse.json({ error: 'Name, email and message are required' }, { status: 400 }));
-      }
+    return handleCORS(NextResponse.json({
+      success: true,
+      chatId: chat.id,
+      messages: await loadMessages(chat.id, since, upTo),
+      messageCount: upTo,
+      unreadCount: chat.unreadCount,
+      lastMessageAt: chat.lastMessageAt
+    }));
+  }
+  
+  if (!chat) {
+    return handleCORS(NextResponse.json({ 
+      success: true, 
+      conversation: null 
+    }));
+  }
+
+  return handleCORS(NextResponse.json({ 
+    success: true, 
+    conversation: await withMessages(chat)
+  }));
+}
+
+const STREAM_HEARTBEAT_MS = parseInt(process.env.CHAT_STREAM_HEARTBEAT_MS || '25000', 10);
+
+// Push new messages for a customer's conversation as Server-Sent Events.
+// Each event's id is the message seq, so EventSource reconnects resume from
+// Last-Event-ID; messages stored between history load and subscribe are replayed.
+// Events go out strictly in seq order: a gap in what is published is filled from
+// the store before anything after it is sent.
+async function streamChat(request) {
+  const { searchParams } = new URL(request.url);
+  const email = searchParams.get('email');
+  const phone = searchParams.get('phone');
+  const since = parseInt(request.headers.get('last-event-id') || searchParams.get('since') || '0', 10) || 0;
+
+  if (!email && !phone) {
+    return handleCORS(NextResponse.json({ error: 'Email or phone required' }, { status: 400 }));
+  }
+
+  const chats = await getCollection('chats');
+  const chat = await chats.findOne(
+    customerQuery(email, phone),
+    { projection: { _id: 0, id: 1, messageCount: 1, storedSeq: 1 } }
+  );
+
+  if (!chat) {
+    return handleCORS(NextResponse.json({ error: 'Conversation not found' }, { status: 404 }));
+  }
 
-      const chats = await getCollection('chats');
-      
-      // Find existing conversation by email or phone
-      const existingChat = await chats.findOne({ 
-        $or: [
-          { customerEmail },
-          { customerPhone: customerPhone || null }
-        ]
-      });
-
-      const newMessage = {
-        id: uuidv4(),
-        sender: 'customer',
-        message,
-        timestamp: new Date(),
-        read: false
+  const encoder = new TextEncoder();
+  let cleanup = () => {};
+
+  const stream = new ReadableStream({
+    async start(controller) {
+      let lastSeq = since;
+      const send = (message) => {
+        lastSeq = message.seq;
+        try {
+          controller.enqueue(encoder.encode(`id: ${message.seq}\nevent: message\ndata: ${JSON.stringify(message)}\n\n`));
+        } catch (error) {
+          cleanup();
+        }
       };
 
-      if (existingChat) {
-        // Update existing conversation
-        await chats.updateOne(
-          { id: existingChat.id },
-          { 
-            $push: { messages: newMessage },
-            $set: { 
-              lastMessageAt: new Date(),
-              customerName, // Update name in case it changed
-              customerPhone: customerPhone || existingChat.customerPhone
-            },
-            $inc: { unreadCount: 1 }
-          }
-        );
-        
-        const updatedChat = await chats.findOne({ id: existingChat.id });
-        return handleCORS(NextResponse.json({ 
-          success: true, 
-          chatId: existingChat.id,
-          conversation: updatedChat
-        }));
-      } else {
-        // Create new conversation
-        const newChat = {
-          id: uuidv4(),
-          customerName,
-          customerEmail,
-          customerPhone: customerPhone || '',
-          messages: [newMessage],
-          unreadCount: 1,
-          createdAt: new Date(),
-          lastMessageAt: new Date()
-        };
-
-        await chats.insertOne(newChat);
-        return handleCORS(NextResponse.json({ 
-          success: true, 
-          chatId: newChat.id,
-          conversation: newChat
-        }));
+      // Live messages that arrive while the store is being read are held and replayed after it
+      let pending = [];
+      const receive = (message) => {
+        if (pending) {
+          pending.push(message);
+        } else if (message.seq === lastSeq + 1) {
+          send(message);
+        } else if (message.seq > lastSeq) {
+          // Concurrent appends can publish out of order; fetch the gap instead of skipping it
+          catchUp(message.seq);
+        }
+      };
+      const unsubscribe = subscribe(chat.id, receive);
+      if (!unsubscribe) {
+        controller.enqueue(encoder.encode('event: busy\ndata: {}\n\n'));
+        controller.close();
+        return;
       }
+
+      const heartbeat = setInterval(() => {
+        try {
+          controller.enqueue(encoder.encode(': ping\n\n'));
+        } catch (error) {
+          cleanup();
+        }
+      }, STREAM_HEARTBEAT_MS);
+
+      cleanup = () => {
+        clearInterval(heartbeat);
+        unsubscribe();
+      };
+      request.signal.addEventListener('abort', () => cleanup());
+
+      // Send the stored messages in (lastSeq, upTo], then whatever was held meanwhile
+      const catchUp = async (upTo) => {
+        pending = pending || [];
+        try {
+          const stored = upTo > lastSeq ? await loadMessages(chat.id, lastSeq, upTo) : [];
+          const held = pending.sort((a, b) => a.seq - b.seq);
+          pending = null;
+          for (const message of stored) {
+            if (message.seq > lastSeq) send(message);
+          }
+          for (const message of held) receive(message);
+        } catch (error) {
+          // cancel() does not run for a stream that errors, so release the slot here
+          cleanup();
+          controller.error(error);
+        }
+      };
+
+      controller.enqueue(encoder.encode('retry: 5000\n\n'));
+      await catchUp(storedSeq(chat));
+    },
+    cancel() {
+      cleanup();
+    }
+  });
+
+  return handleCORS(new NextResponse(stream, {
+    headers: {
+      'Content-Type': 'text/event-stream',
+      'Cache-Control': 'no-cache, no-transform',
+      'Connection': 'keep-alive',
+      'X-Accel-Buffering': 'no'
     }
+  }));
+}
 
-    // Get chat history by email/phone (for cross-device sync)
-    if (route === '/chat/history' && method === 'GET') {
-      const { searchParams } = new URL(request.url);
-      const email = searchParams.get('email');
-      const phone = searchParams.get('phone');
+// Admin: Get all conversations
+async function listConversations(request) {
+  const authCheck = requireAuth(request);
+  if (authCheck.error) {
+    return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
+  }
 
-      if (!email && !phone) {
-        return handleCORS(NextResponse.json({ error: 'Email or phone required' }, { status: 400 }));
-      }
+  // Check chat access permission
+  if (authCheck.user.role !== 'super_admin' && !authCheck.user.permissions?.canAccessChat) {
+    return handleCORS(NextResponse.json({ error: 'Forbidden: Chat access not permitted' }, { status: 403 }));
+  }
 
-      const chats = await getCollection('chats');
-      const query = {};
-      
-      if (email && phone) {
-        query.$or = [{ customerEmail: email }, { customerPhone: phone }];
-      } else if (email) {
-        query.customerEmail = email;
-      } else {
-        query.customerPhone = phone;
-      }
+  const { searchParams } = new URL(request.url);
+  const limit = parseLimit(searchParams.get('limit'), 50, 200);
+  let cursor;
+  try {
+    cursor = decodeCursor(searchParams.get('cursor'));
+  } catch (error) {
+    return handleCORS(NextResponse.json({ error: error.message }, { status: 400 }));
+  }
 
-      const chat = await chats.findOne(query);
-      
-      if (!chat) {
-        return handleCORS(NextResponse.json({ 
-          success: true, 
-          conversation: null 
-        }));
-      }
+  const chats = await getCollection('chats');
+  // Summaries only: messages are fetched per conversation via GET /chat/:id
+  const page = await chats
+    .find(descendingAfter('lastMessageAt', cursor), { projection: { messages: { $slice: -1 } } })
+    .sort({ lastMessageAt: -1, id: -1 })
+    .limit(limit + 1)
+    .toArray();
+
+  const hasMore = page.length > limit;
+  // Conversations not yet moved to message buckets still carry an embedded messages array
+  const conversations = page.slice(0, limit).map(({ messages, ...chat }) => ({
+    ...chat,
+    lastMessage: chat.lastMessage || messages?.[0] || null
+  }));
+  const last = conversations[conversations.length - 1];
+
+  const [unread] = await chats.aggregate([
+    { $match: { unreadCount: { $gt: 0 } } },
+    { $group: { _id: null, total: { $sum: '$unreadCount' } } }
+  ]).toArray();
+
+  return handleCORS(NextResponse.json({ 
+    success: true, 
+    conversations,
+    totalUnread: unread?.total || 0,
+    totalConversations: await chats.estimatedDocumentCount(),
+    nextCursor: hasMore ? encodeCursor(last.lastMessageAt, last.id) : null
+  }));
+}
 
-      return handleCORS(NextResponse.json({ 
-        success: true, 
-        conversation: chat
-      }));
-    }
+// Admin: Get one conversation with its full message history
+async function getConversation(request, { params }) {
+  const authCheck = requireAuth(request);
+  if (authCheck.error) {
+    return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
+  }
 
-    // Admin: Get all conversations
-    if (route === '/chat/conversations' && method === 'GET') {
-      const authCheck = requireAuth(request);
-      if (authCheck.error) {
-        return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
-      }
+  // Check chat access permission
+  if (authCheck.user.role !== 'super_admin' && !authCheck.user.permissions?.canAccessChat) {
+    return handleCORS(NextResponse.json({ error: 'Forbidden: Chat access not permitted' }, { status: 403 }));
+  }
 
-      // Check chat access permission
-      if (authCheck.user.role !== 'super_admin' && !authCheck.user.permissions?.canAccessChat) {
-        return handleCORS(NextResponse.json({ error: 'Forbidden: Chat access not permitted' }, { status: 403 }));
-      }
+  const chat = await findConversation({ id: params.id });
 
-      const chats = await getCollection('chats');
-      const conversations = await chats.find({}).sort({ lastMessageAt: -1 }).toArray();
-      
-      const totalUnread = conversations.reduce((sum, chat) => sum + (chat.unreadCount || 0), 0);
+  if (!chat) {
+    return handleCORS(NextResponse.json({ error: 'Conversation not found' }, { status: 404 }));
+  }
 
-      return handleCORS(NextResponse.json({ 
-        success: true, 
-        conversations,
-        totalUnread
-      }));
-    }
+  return handleCORS(NextResponse.json({ 
+    success: true, 
+    conversation: await withMessages(chat)
+  }));
+}
 
-    // Admin: Reply to conversation
-    if (route.startsWith('/chat/') && route.endsWith('/reply') && method === 'POST') {
-      const authCheck = requireAuth(request);
-      if (authCheck.error) {
-        return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
-      }
+// Admin: Reply to conversation
+async function replyToConversation(request, { params }) {
+  const authCheck = requireAuth(request);
+  if (authCheck.error) {
+    return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
+  }
 
-      // Check chat access permission
-      if (authCheck.user.role !== 'super_admin' && !authCheck.user.permissions?.canAccessChat) {
-        return handleCORS(NextResponse.json({ error: 'Forbidden: Chat access not permitted' }, { status: 403 }));
-      }
+  // Check chat access permission
+  if (authCheck.user.role !== 'super_admin' && !authCheck.user.permissions?.canAccessChat) {
+    return handleCORS(NextResponse.json({ error: 'Forbidden: Chat access not permitted' }, { status: 403 }));
+  }
 
-      const chatId = pathParams[1]; // Extract ID from /chat/:id/reply
-      const { message } = await request.json();
+  const chatId = params.id;
+  const { message } = await request.json();
 
-      if (!message) {
-        return handleCORS(NextResponse.json({ error: 'Message is required' }, { status: 400 }));
-      }
+  if (!message) {
+    return handleCORS(NextResponse.json({ error: 'Message is required' }, { status: 400 }));
+  }
 
-      const chats = await getCollection('chats');
-      const chat = await chats.findOne({ id: chatId });
+  const chats = await getCollection('chats');
+  const chat = await chats.findOne({ id: chatId }, { projection: { id: 1 } });
 
-      if (!chat) {
-        return handleCORS(NextResponse.json({ error: 'Conversation not found' }, { status: 404 }));
-      }
+  if (!chat) {
+    return handleCORS(NextResponse.json({ error: 'Conversation not found' }, { status: 404 }));
+  }
 
-      const adminMessage = {
-        id: uuidv4(),
-        sender: 'admin',
-        message,
-        timestamp: new Date(),
-        read: false
-      };
+  const updatedChat = await appendMessage(chatId, newMessage('admin', message));
+  return handleCORS(NextResponse.json({ 
+    success: true, 
+    conversation: await withMessages(updatedChat)
+  }));
+}
 
-      await chats.updateOne(
-        { id: chatId },
-        { 
-          $push: { messages: adminMessage },
-          $set: { lastMessageAt: new Date() }
-        }
-      );
+// Admin: Mark conversation as read
+async function markConversationRead(request, { params }) {
+  const authCheck = requireAuth(request);
+  if (authCheck.error) {
+    return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
+  }
 
-      const updatedChat = await chats.findOne({ id: chatId });
-      return handleCORS(NextResponse.json({ 
-        success: true, 
-        conversation: updatedChat
-      }));
-    }
+  // Check chat access permission
+  if (authCheck.user.role !== 'super_admin' && !authCheck.user.permissions?.canAccessChat) {
+    return handleCORS(NextResponse.json({ error: 'Forbidden: Chat access not permitted' }, { status: 403 }));
+  }
 
-    // Admin: Mark conversation as read
-    if (route.startsWith('/chat/') && route.endsWith('/read') && method === 'PUT') {
-      const authCheck = requireAuth(request);
-      if (authCheck.error) {
-        return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
-      }
+  const chatId = params.id;
+  await markCustomerMessagesRead(chatId);
 
-      // Check chat access permission
-      if (authCheck.user.role !== 'super_admin' && !authCheck.user.permissions?.canAccessChat) {
-        return handleCORS(NextResponse.json({ error: 'Forbidden: Chat access not permitted' }, { status: 403 }));
-      }
+  return handleCORS(NextResponse.json({ success: true }));
+}
 
-      const chatId = pathParams[1]; // Extract ID from /chat/:id/read
-      const chats = await getCollection('chats');
+// Super admin: process-level counters for capacity tuning
+async function getMetrics(request) {
+  const authCheck = requireAuth(request, true);
+  if (authCheck.error) {
+    return handleCORS(NextResponse.json({ error: authCheck.error }, { status: authCheck.status }));
+  }
 
-      await chats.updateOne(
-        { id: chatId },
-        { 
-          $set: { 
-            unreadCount: 0,
-            'messages.$[elem].read': true 
-          }
-        },
-        {
-          arrayFilters: [{ 'elem.sender': 'customer', 'elem.read': false }]
-        }
-      );
+  return handleCORS(NextResponse.json({
+    success: true,
+    uptime: process.uptime(),
+    memory: process.memoryUsage(),
+    chatStreams: streamStats(),
+    readCache: readCache.stats(),
+    passwordPool: passwordPoolStats(),
+    authCache: authCacheStats(),
+    mongoPool: poolStats()
+  }));
+}
 
-      return handleCORS(NextResponse.json({ success: true }));
-    }
+const router = createRouter([
+  ['POST', '/auth/login', login],
+  ['GET', '/auth/verify', verifyAuth],
+  ['POST', '/auth/init', initSuperAdmin],
+
+  ['GET', '/admins', listAdmins],
+  ['POST', '/admins', createAdmin],
+  ['PUT', '/admins/:id', updateAdmin],
+  ['DELETE', '/admins/:id', deleteAdmin],
 
-    return handleCORS(NextResponse.json({ error: 'Route not found' }, { status: 404 }));
+  ['GET', '/content', getContent],
+  ['PUT', '/content', updateContent],
+
+  ['GET', '/skills', listSkills],
+  ['POST', '/skills', createSkill],
+  ['PUT', '/skills/:id', updateSkill],
+  ['DELETE', '/skills/:id', deleteSkill],
+
+  ['GET', '/services', listServices],
+  ['POST', '/services', createService],
+  ['PUT', '/services/:id', updateService],
+  ['DELETE', '/services/:id', deleteService],
+
+  ['GET', '/projects', listProjects],
+  ['POST', '/projects', createProject],
+  ['PUT', '/projects/:id', updateProject],
+  ['DELETE', '/projects/:id', deleteProject],
+
+  ['GET', '/contact/info', getContactInfo],
+  ['PUT', '/contact/info', updateContactInfo],
+  ['POST', '/contact/send', sendContactMessage],
+
+  ['GET', '/site', getSite],
+
+  ['GET', '/storage', listStorageItems],
+  ['POST', '/storage', createStorageItem],
+  ['PUT', '/storage/:id', updateStorageItem],
+  ['DELETE', '/storage/:id', deleteStorageItem],
+
+  ['POST', '/upload', uploadFile],
+
+  ['POST', '/chat/send', sendChatMessage],
+  ['GET', '/chat/history', getChatHistory],
+  ['GET', '/chat/stream', streamChat],
+  ['GET', '/chat/conversations', listConversations],
+  ['GET', '/chat/:id', getConversation],
+  ['POST', '/chat/:id/reply', replyToConversation],
+  ['PUT', '/chat/:id/read', markConversationRead],
+
+  ['GET', '/metrics', getMetrics]
+]);
+
+async function handleRoute(request, { params }) {
+  const { path: pathParams = [] } = params;
+  const dispatchStart = performance.now();
+  const match = router.match(request.method, pathParams);
+  const dispatchMs = performance.now() - dispatchStart;
+
+  let response;
+  try {
+    response = match
+      ? await match.handler(request, { params: match.params })
+      : handleCORS(NextResponse.json({ error: 'Route not found' }, { status: 404 }));
   } catch (error) {
     console.error('API Error:', error);
-    return handleCORS(NextResponse.json({ error: error.message }, { status: 500 }));
+    response = handleCORS(NextResponse.json({ error: error.message }, { status: error.status || 500 }));
   }
+
+  response.headers.set(
+    'Server-Timing',
+    `dispatch;dur=${dispatchMs.toFixed(3)}, total;dur=${(performance.now() - dispatchStart).toFixed(3)}`
+  );
+  return response;
 }
 
 export const GET = handleRoute;
@@ -27,25 +27,15 @@ export default function App() {
 
   const fetchData = async () => {
     try {
-      const [contentRes, skillsRes, servicesRes, projectsRes, contactRes] = await Promise.all([
-        fetch('/api/content'),
-        fetch('/api/skills'),
-        fetch('/api/services'),
-        fetch('/api/projects'),
-        fetch('/api/contact/info')
-      ]);
-
-      const contentData = await contentRes.json();
-      const skillsData = await skillsRes.json();
-      const servicesData = await servicesRes.json();
-      const projectsData = await projectsRes.json();
-      const contactData = await contactRes.json();
-
-      setContent(contentData.content);
-      setSkills(skillsData.skills);
-      setServices(servicesData.services);
-      setProjects(projectsData.projects);
-      setContactInfo(contactData.contact);
+      // One bundled request; the browser revalidates it with If-None-Match
+      const res = await fetch('/api/site');
+      const data = await res.json();
+
+      setContent(data.content);
+      setSkills(data.skills);
+      setServices(data.services);
+      setProjects(data.projects);
+      setContactInfo(data.contact);
       setLoading(false);
     } catch (error) {
       console.error('Error fetching data:', error);
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Auth overhead benchmark for the verified-token cache in lib/auth.js
+Replays the authenticated calls the admin dashboard makes on load with one
+token and reports, per route, client latency and server handler time
+(Server-Timing total), plus the authCache counters from GET /api/metrics:
+- hit vs miss cost of verifyToken in microseconds (the per-request saving)
+- hit rate over the run
+
+For an end-to-end comparison, save a run against a server started with
+AUTH_CACHE_SIZE=0 using --out and pass it to a cached run with --compare.
+
+Usage:
+    python auth_cache_benchmark.py --iterations 300
+    python auth_cache_benchmark.py --iterations 300 --out auth-off.json
+    python auth_cache_benchmark.py --iterations 300 --compare auth-off.json
+"""
+
+import argparse
+
+from route_benchmark import RouteBenchmark, add_benchmark_arguments, run_benchmark
+
+
+class AuthCacheBenchmark(RouteBenchmark):
+    title = "🔑 AUTH CACHE BENCHMARK"
+    # Authenticated, read-only calls from the dashboard's initial load
+    routes = ["/auth/verify", "/projects", "/admins", "/storage?limit=20", "/chat/conversations?limit=20"]
+    counters = "authCache"
+    authenticated = True
+
+    def print_counters(self, before, after):
+        print(self.hit_summary(before, after))
+        print(f"verifyToken: {after['avgHitUs']:.1f} µs on a hit vs {after['avgMissUs']:.1f} µs on a miss "
+              f"(full jwt.verify)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure per-request auth overhead with and without the token cache")
+    add_benchmark_arguments(parser)
+    args = parser.parse_args()
+
+    exit(0 if run_benchmark(AuthCacheBenchmark(args.base_url), args, login_required=True) else 1)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+MSPN DEV Backend Load Generator
+Replays the MSPNBackendTester scenarios from N concurrent virtual users:
+- Auth (login + token verification)
+- Skills CRUD
+- Projects (public and admin views)
+- Private Storage CRUD
+- Chat (customer send, history sync, admin conversations and reply)
+Reports per-endpoint throughput and p50/p95/p99 latency.
+
+Usage:
+    python backend_load.py --users 20 --duration 60
+    python backend_load.py --users 50 --iterations 10 --scenarios skills,projects
+"""
+
+import argparse
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Any, Dict
+
+from api_client import get_client
+from backend_test import MSPNBackendTester
+from perf_baseline import DEFAULT_THRESHOLD, add_baseline_arguments, check_against_baseline
+
+SCENARIOS = ["auth", "skills", "projects", "storage", "chat"]
+
+
+class VirtualUser(MSPNBackendTester):
+    """One simulated admin/customer replaying the backend test scenarios"""
+
+    def __init__(self, base_url: str, index: int):
+        super().__init__(base_url)
+        self.index = index
+        self.run_id = uuid.uuid4().hex[:8]
+
+    def login(self) -> bool:
+        response = self.make_request("POST", "/auth/login", {"username": "admin", "password": "admin123"})
+        if response.get("success") and response.get("data", {}).get("token"):
+            self.auth_token = response["data"]["token"]
+            self.admin_user = response["data"].get("admin")
+            return True
+        return False
+
+    def scenario_auth(self):
+        self.login()
+        self.make_request("GET", "/auth/verify")
+
+    def scenario_skills(self):
+        self.make_request("GET", "/skills")
+        created = self.make_request("POST", "/skills", {"name": f"Load Skill {self.run_id}", "icon": "⚡"})
+        skill_id = created.get("data", {}).get("skill", {}).get("id") if created.get("success") else None
+        if skill_id:
+            self.make_request("PUT", f"/skills/{skill_id}", {"name": f"Load Skill {self.run_id} (updated)"})
+            self.make_request("DELETE", f"/skills/{skill_id}")
+
+    def scenario_projects(self):
+        temp_token = self.auth_token
+        self.auth_token = None
+        self.make_request("GET", "/projects")
+        self.auth_token = temp_token
+
+        created = self.make_request("POST", "/projects", {
+            "title": f"Load Project {self.run_id}",
+            "description": "Created by backend_load.py",
+            "isPrivate": True,
+            "techStack": ["React", "Node.js"]
+        })
+        self.make_request("GET", "/projects")
+        project_id = created.get("data", {}).get("project", {}).get("id") if created.get("success") else None
+        if project_id:
+            self.make_request("DELETE", f"/projects/{project_id}")
+
+    def scenario_storage(self):
+        created = self.make_request("POST", "/storage", {
+            "title": f"Load Note {self.run_id}",
+            "content": "Sample content for load testing",
+            "type": "note",
+            "tags": ["load"],
+            "visibleTo": []
+        })
+        self.make_request("GET", "/storage")
+        item_id = created.get("data", {}).get("item", {}).get("id") if created.get("success") else None
+        if item_id:
+            self.make_request("PUT", f"/storage/{item_id}", {"content": "Updated content"})
+            self.make_request("DELETE", f"/storage/{item_id}")
+
+    def scenario_chat(self):
+        email = f"load-vu{self.index}@example.com"
+        temp_token = self.auth_token
+        self.auth_token = None
+        sent = self.make_request("POST", "/chat/send", {
+            "customerName": f"Load User {self.index}",
+            "customerEmail": email,
+            "customerPhone": "",
+            "message": "Hello from the load generator"
+        })
+        self.make_request("GET", f"/chat/history?email={email}")
+        self.auth_token = temp_token
+
+        self.make_request("GET", "/chat/conversations")
+        chat_id = sent.get("data", {}).get("chatId") if sent.get("success") else None
+        if chat_id:
+            self.make_request("POST", f"/chat/{chat_id}/reply", {"message": "Thanks, we'll be in touch."})
+            self.make_request("PUT", f"/chat/{chat_id}/read")
+
+
+def run_virtual_user(user: VirtualUser, scenarios: List[str], iterations: int, deadline: float) -> int:
+    """Run the scenario mix until the iteration budget or deadline is exhausted"""
+    if not user.login():
+        return 0
+    completed = 0
+    while (iterations and completed < iterations) or (not iterations and time.time() < deadline):
+        for name in scenarios:
+            getattr(user, f"scenario_{name}")()
+        completed += 1
+    return completed
+
+
+def print_report(rows: List[Dict[str, Any]], wall_seconds: float, users: int, iterations: int):
+    print("\n" + "=" * 100)
+    print("📊 LOAD TEST SUMMARY")
+    print("=" * 100)
+    print(f"Virtual users: {users}    Scenario iterations: {iterations}    Wall time: {wall_seconds:.1f}s")
+    print()
+    print(f"{'Route':<32} {'Count':>7} {'Errors':>7} {'Req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    print("-" * 100)
+    for row in rows:
+        rps = row["count"] / wall_seconds if wall_seconds else 0.0
+        print(f"{row['route']:<32} {row['count']:>7} {row['errors']:>7} {rps:>8.1f} "
+              f"{row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f} {row['max_ms']:>9.1f}")
+    print("=" * 100)
+
+
+def run_load(base_url: str, users: int, duration: float, iterations: int, scenarios: List[str],
+             latency_out: str = None, baseline: str = None, max_regression: float = DEFAULT_THRESHOLD,
+             accept_baseline: bool = False) -> bool:
+    # Size the shared keep-alive pool so every virtual user can hold a connection;
+    # its recorder collects the per-route histograms for every virtual user
+    client = get_client(f"{base_url}/api", pool_size=users)
+    client.recorder.reset()
+    virtual_users = [VirtualUser(base_url, i) for i in range(users)]
+
+    print("🚀 Starting MSPN DEV Backend Load Test")
+    print(f"Base URL: {base_url}")
+    print(f"Scenarios: {', '.join(scenarios)}")
+
+    start = time.time()
+    deadline = start + duration
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        completed = list(pool.map(lambda u: run_virtual_user(u, scenarios, iterations, deadline), virtual_users))
+    wall_seconds = time.time() - start
+
+    rows = client.recorder.rows()
+    print_report(rows, wall_seconds, users, sum(completed))
+    client.print_connection_stats()
+    if latency_out:
+        client.recorder.dump(latency_out)
+        print(f"⏱️  Per-endpoint latency written to {latency_out}")
+
+    success = all(row["errors"] == 0 for row in rows)
+    if baseline:
+        success = check_against_baseline(rows, baseline, max_regression, accept=accept_baseline) and success
+    return success
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent load generator for the MSPN DEV backend")
+    parser.add_argument("--users", type=int, default=10, help="number of concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="seconds to run when --iterations is not set")
+    parser.add_argument("--iterations", type=int, default=0, help="scenario iterations per virtual user")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated subset of: " + ", ".join(SCENARIOS))
+    parser.add_argument("--latency-out", help="write per-endpoint latency histograms to this .json or .csv file")
+    add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    selected = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = [s for s in selected if s not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    base_url = os.getenv("NEXT_PUBLIC_BASE_URL", "http://localhost:3000")
+    success = run_load(base_url, args.users, args.duration, args.iterations, selected, args.latency_out,
+                       args.baseline, args.max_regression, args.accept_baseline)
+    exit(0 if success else 1)
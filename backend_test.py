@@ -7,22 +7,40 @@ Tests all backend APIs including new features:
 - Private Storage API
 - Projects Visibility
 - Skills API (without level)
-- File Upload
+- File Upload (content-addressed dedup, size/type limits, concurrent multi-MB uploads)
+- Chat conversation pagination (optionally seeded with thousands of chats)
+- Chat message buckets (threads longer than one bucket)
+- Site bundle (GET /site with ETag revalidation)
+- Conditional GET and Cache-Control on public reads
 """
 
 import requests
 import json
 import os
+import argparse
+import hashlib
 import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, Optional
 
+from api_client import get_client
+from perf_baseline import add_baseline_arguments, check_against_baseline
+
 class MSPNBackendTester:
-    def __init__(self, base_url: str = "http://localhost:3000"):
+    def __init__(self, base_url: str = "http://localhost:3000", latency_out: Optional[str] = None,
+                 chat_scale: int = 0):
         self.base_url = base_url
         self.api_base = f"{base_url}/api"
+        self.client = get_client(self.api_base)
+        self.latency_out = latency_out
+        self.chat_scale = chat_scale
         self.auth_token = None
         self.admin_user = None
         self.test_results = []
+        self.db = None
         
     def log_test(self, test_name: str, success: bool, message: str = "", data: Any = None):
         """Log test results"""
@@ -41,10 +59,22 @@ class MSPNBackendTester:
             print(f"   Response: {data}")
         print()
 
+    def database(self):
+        """The server's MongoDB (MONGO_URL / DB_NAME, as migrations.py), or None when unreachable"""
+        if self.db is None:
+            try:
+                from pymongo.errors import PyMongoError
+                from migrations import connect
+                _, db = connect()
+                db.command("ping")
+                self.db = db
+            except (ImportError, PyMongoError) as e:
+                print(f"   MongoDB not reachable ({e}), skipping direct-database checks")
+                self.db = False
+        return self.db or None
+
     def make_request(self, method: str, endpoint: str, data: Dict = None, files: Dict = None, headers: Dict = None) -> Dict:
         """Make HTTP request with proper error handling"""
-        url = f"{self.api_base}{endpoint}"
-        
         # Default headers
         req_headers = {"Content-Type": "application/json"}
         if self.auth_token:
@@ -60,16 +90,16 @@ class MSPNBackendTester:
         
         try:
             if method.upper() == "GET":
-                response = requests.get(url, headers=req_headers, timeout=30)
+                response = self.client.request("GET", endpoint, headers=req_headers)
             elif method.upper() == "POST":
                 if files:
-                    response = requests.post(url, files=files, headers=req_headers, timeout=30)
+                    response = self.client.request("POST", endpoint, files=files, headers=req_headers)
                 else:
-                    response = requests.post(url, json=data, headers=req_headers, timeout=30)
+                    response = self.client.request("POST", endpoint, json=data, headers=req_headers)
             elif method.upper() == "PUT":
-                response = requests.put(url, json=data, headers=req_headers, timeout=30)
+                response = self.client.request("PUT", endpoint, json=data, headers=req_headers)
             elif method.upper() == "DELETE":
-                response = requests.delete(url, headers=req_headers, timeout=30)
+                response = self.client.request("DELETE", endpoint, headers=req_headers)
             else:
                 return {"error": f"Unsupported method: {method}", "status_code": 400}
             
@@ -370,6 +400,8 @@ class MSPNBackendTester:
                         visible_response.get("data")
                     )
                     
+                self.verify_storage_pages()
+                    
                 # Test DELETE /api/storage/:id - delete the note
                 delete_response = self.make_request("DELETE", f"/storage/{item_id}")
                 
@@ -402,6 +434,34 @@ class MSPNBackendTester:
                 create_response.get("data")
             )
 
+    def verify_storage_pages(self, page_size: int = 5, pages: int = 4):
+        """Walking GET /storage with cursors must return the same items as one larger page"""
+        reference_response = self.make_request("GET", f"/storage?limit={page_size * pages}")
+        if not reference_response.get("success"):
+            self.log_test("Storage Pagination", False, "Failed to retrieve storage items", reference_response.get("data"))
+            return
+        reference_ids = [item.get("id") for item in reference_response.get("data", {}).get("items", [])]
+
+        walked_ids = []
+        cursor = None
+        for _ in range(pages):
+            endpoint = f"/storage?limit={page_size}" + (f"&cursor={cursor}" if cursor else "")
+            response = self.make_request("GET", endpoint)
+            if not response.get("success"):
+                self.log_test("Storage Pagination", False, "Failed to retrieve storage page", response.get("data"))
+                return
+            walked_ids += [item.get("id") for item in response.get("data", {}).get("items", [])]
+            cursor = response.get("data", {}).get("nextCursor")
+            if not cursor:
+                break
+
+        self.log_test(
+            "Storage Pagination",
+            walked_ids == reference_ids,
+            f"{len(walked_ids)} items over pages of {page_size} match a single page of {page_size * pages}",
+            None if walked_ids == reference_ids else {"walked": walked_ids, "reference": reference_ids}
+        )
+
     def test_projects_visibility(self):
         """Test 4: Projects Visibility"""
         print("=== Testing Projects Visibility ===")
@@ -510,6 +570,8 @@ class MSPNBackendTester:
                 # Restore auth token
                 self.auth_token = temp_token
                 
+                self.verify_project_views()
+                
                 # Clean up - delete test project
                 delete_response = self.make_request("DELETE", f"/projects/{project_id}")
                 if delete_response.get("success"):
@@ -530,6 +592,53 @@ class MSPNBackendTester:
                 create_response.get("data")
             )
 
+    def verify_project_views(self):
+        """Check the server-side filtered project views match filtering the full list client-side"""
+        admin_response = self.make_request("GET", "/projects")
+        temp_token = self.auth_token
+        self.auth_token = None
+        public_response = self.make_request("GET", "/projects")
+        paged_response = self.make_request("GET", "/projects?limit=2&offset=1")
+        self.auth_token = temp_token
+
+        if not all(r.get("success") for r in (admin_response, public_response, paged_response)):
+            self.log_test("Projects Query Views", False, "Failed to retrieve project views",
+                          [r.get("data") for r in (admin_response, public_response, paged_response)])
+            return
+
+        admin_projects = admin_response.get("data", {}).get("projects", [])
+        public_ids = [p.get("id") for p in public_response.get("data", {}).get("projects", [])]
+        paged_ids = [p.get("id") for p in paged_response.get("data", {}).get("projects", [])]
+
+        if (self.admin_user or {}).get("role") == "super_admin":
+            expected_ids = [p.get("id") for p in admin_projects if not p.get("isPrivate")]
+            self.log_test(
+                "Projects Query - Public View Matches Filtered List",
+                public_ids == expected_ids,
+                f"{len(public_ids)} public of {len(admin_projects)} total projects",
+                None if public_ids == expected_ids else {"public": public_ids, "expected": expected_ids}
+            )
+        else:
+            username = (self.admin_user or {}).get("username")
+            own_only = all(p.get("createdBy") == username for p in admin_projects)
+            self.log_test(
+                "Projects Query - Admin View Only Own Projects",
+                own_only,
+                f"{len(admin_projects)} projects created by {username}"
+            )
+
+        self.log_test(
+            "Projects Query - Limit/Offset",
+            paged_ids == public_ids[1:3],
+            f"limit=2&offset=1 returned {paged_ids}",
+            None if paged_ids == public_ids[1:3] else {"expected": public_ids[1:3]}
+        )
+        self.log_test(
+            "Projects Query - Projection",
+            all("_id" not in p for p in admin_projects),
+            "Projects returned without Mongo _id"
+        )
+
     def test_skills_api(self):
         """Test 5: Skills API (without level requirement)"""
         print("=== Testing Skills API ===")
@@ -647,9 +756,13 @@ class MSPNBackendTester:
             return False
             
         # Create a temporary test file
+        content = "This is a test file for upload testing."
         with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as temp_file:
-            temp_file.write("This is a test file for upload testing.")
+            temp_file.write(content)
             temp_file_path = temp_file.name
+        # Uploads are stored by content hash: /uploads/ab/cd/<sha256>.<ext>
+        digest = hashlib.sha256(content.encode()).hexdigest()
+        expected_url = f"/uploads/{digest[:2]}/{digest[2:4]}/{digest}.txt"
             
         try:
             # Test POST /api/upload - test file upload functionality
@@ -660,7 +773,7 @@ class MSPNBackendTester:
                 
                 if upload_response.get("success"):
                     file_url = upload_response.get("data", {}).get("url")
-                    if file_url and file_url.startswith("/uploads/"):
+                    if file_url == expected_url:
                         self.log_test(
                             "File Upload",
                             True,
@@ -668,9 +781,7 @@ class MSPNBackendTester:
                         )
                         
                         # Verify file exists in uploads directory
-                        upload_dir = "/app/public/uploads"
-                        file_name = file_url.split("/")[-1]
-                        full_path = os.path.join(upload_dir, file_name)
+                        full_path = self.upload_path(file_url)
                         
                         if os.path.exists(full_path):
                             self.log_test(
@@ -696,7 +807,7 @@ class MSPNBackendTester:
                         self.log_test(
                             "File Upload",
                             False,
-                            "Invalid file URL returned",
+                            f"Expected content-addressed URL {expected_url}",
                             upload_response.get("data")
                         )
                 else:
@@ -714,6 +825,156 @@ class MSPNBackendTester:
             except:
                 pass
 
+        self.test_upload_limits()
+        self.test_upload_dedup()
+        self.test_concurrent_uploads()
+
+    def upload_path(self, url: str) -> str:
+        """Local path of an uploaded file when the server runs from /app"""
+        return os.path.join("/app/public", *url.split("/")[1:])
+
+    def server_rss(self) -> Optional[int]:
+        """Resident memory of the server process from GET /metrics (super admin only)"""
+        response = self.client.request("GET", "/metrics", headers={"Authorization": f"Bearer {self.auth_token}"})
+        return response.json().get("memory", {}).get("rss") if response.status_code == 200 else None
+
+    def test_upload_limits(self, max_bytes: int = 10 * 1024 * 1024):
+        """Test 6b: Oversized and disallowed uploads are refused (server default UPLOAD_MAX_BYTES)"""
+        print("=== Testing Upload Limits ===")
+
+        oversized = self.make_request("POST", "/upload",
+                                      files={"file": ("too-big.png", b"\0" * (max_bytes + 1024 * 1024), "image/png")})
+        self.log_test(
+            "Upload Limit - Oversized File",
+            oversized.get("status_code") == 413,
+            f"{max_bytes + 1024 * 1024} byte upload returned {oversized.get('status_code')}",
+            oversized.get("data")
+        )
+
+        disallowed = self.make_request("POST", "/upload",
+                                       files={"file": ("tool.exe", b"MZ" + os.urandom(1024), "application/x-msdownload")})
+        self.log_test(
+            "Upload Limit - Content Type",
+            disallowed.get("status_code") == 415,
+            f"application/x-msdownload upload returned {disallowed.get('status_code')}",
+            disallowed.get("data")
+        )
+
+        svg = self.make_request("POST", "/upload",
+                                files={"file": ("logo.svg", b"<svg xmlns='http://www.w3.org/2000/svg'/>", "image/svg+xml")})
+        self.log_test(
+            "Upload Limit - SVG Refused",
+            svg.get("status_code") == 415,
+            f"image/svg+xml upload returned {svg.get('status_code')}",
+            svg.get("data")
+        )
+
+        # The stored extension follows the declared type, never the client's filename
+        disguised = self.make_request("POST", "/upload",
+                                      files={"file": ("x.html", b"<script>alert(1)</script>", "image/png")})
+        disguised_url = disguised.get("data", {}).get("url") or ""
+        self.log_test(
+            "Upload Limit - Extension From Type",
+            disguised_url.endswith(".png"),
+            f"x.html declared as image/png stored at {disguised_url or disguised.get('status_code')}"
+        )
+        if disguised_url and os.path.exists(self.upload_path(disguised_url)):
+            os.remove(self.upload_path(disguised_url))
+
+    def test_upload_dedup(self):
+        """Test 6c: Identical uploads share one stored file served as immutable"""
+        print("=== Testing Upload Deduplication ===")
+
+        payload = os.urandom(64 * 1024)
+        first = self.make_request("POST", "/upload", files={"file": ("photo.png", payload, "image/png")})
+        second = self.make_request("POST", "/upload", files={"file": ("photo-copy.png", payload, "image/png")})
+        first_url = first.get("data", {}).get("url")
+        second_data = second.get("data", {})
+        self.log_test(
+            "Upload Dedup - Same URL",
+            bool(first_url) and second_data.get("url") == first_url and second_data.get("duplicate") is True,
+            f"First {first_url}, re-upload {second_data.get('url')} (duplicate={second_data.get('duplicate')})"
+        )
+        if not first_url:
+            return
+
+        response = requests.get(f"{self.base_url}{first_url}", timeout=30)
+        if response.status_code == 200:
+            cache_control = response.headers.get("Cache-Control", "")
+            self.log_test(
+                "Upload Dedup - Immutable Caching",
+                "immutable" in cache_control and "max-age=31536000" in cache_control,
+                f"Cache-Control '{cache_control}'"
+            )
+        else:
+            print(f"   GET {first_url} returned {response.status_code} (uploads added after build are not served "
+                  "by next start), skipping Cache-Control check")
+
+        full_path = self.upload_path(first_url)
+        if os.path.exists(full_path):
+            os.remove(full_path)
+
+    def test_concurrent_uploads(self, count: int = 6, size_mb: int = 4):
+        """Test 6d: Concurrent multi-megabyte uploads land intact without growing server memory"""
+        print("=== Testing Concurrent Uploads ===")
+
+        payloads = [os.urandom(size_mb * 1024 * 1024) for _ in range(count)]
+        total_bytes = sum(len(payload) for payload in payloads)
+        rss_before = self.server_rss()
+
+        # Sample server RSS while the uploads are in flight; buffered uploads peak here
+        samples = []
+        done = False
+
+        def sample():
+            while not done:
+                rss = self.server_rss()
+                if rss:
+                    samples.append(rss)
+                time.sleep(0.1)
+
+        def upload(index: int) -> Dict:
+            return self.make_request("POST", "/upload",
+                                     files={"file": (f"concurrent-{index}.png", payloads[index], "image/png")})
+
+        with ThreadPoolExecutor(max_workers=count + 1) as pool:
+            sampler = pool.submit(sample)
+            results = list(pool.map(upload, range(count)))
+            done = True
+            sampler.result()
+
+        urls = [result.get("data", {}).get("url") for result in results if result.get("success")]
+        self.log_test(
+            "Concurrent Uploads",
+            len(urls) == count and len(set(urls)) == count,
+            f"{len(urls)}/{count} uploads of {size_mb} MB succeeded with distinct URLs"
+        )
+
+        if os.path.isdir("/app/public/uploads"):
+            intact = 0
+            for url, payload in zip(urls, payloads):
+                full_path = self.upload_path(url)
+                if os.path.exists(full_path):
+                    with open(full_path, "rb") as handle:
+                        intact += handle.read() == payload
+                    os.remove(full_path)
+            self.log_test(
+                "Concurrent Uploads - Files Intact",
+                intact == len(urls),
+                f"{intact}/{len(urls)} files on disk match the bytes sent"
+            )
+
+        if rss_before and samples:
+            growth = max(samples) - rss_before
+            # Buffering holds every body in memory at least twice; streaming stays well under one copy
+            self.log_test(
+                "Concurrent Uploads - Flat Memory",
+                growth < total_bytes,
+                f"Server RSS grew {growth / 1048576:.1f} MB while receiving {total_bytes / 1048576:.0f} MB"
+            )
+        else:
+            print("   Server memory unavailable (GET /api/metrics needs a super admin), skipping RSS check")
+
     def test_chat_system(self):
         """Test 7: Chat System APIs"""
         print("=== Testing Chat System APIs ===")
@@ -900,6 +1161,298 @@ class MSPNBackendTester:
             # Restore auth token
             self.auth_token = temp_token
 
+        if self.auth_token:
+            self.test_chat_pagination()
+        self.test_chat_message_buckets()
+        self.test_chat_concurrent_appends()
+        self.test_chat_lost_append()
+        if self.auth_token:
+            self.test_chat_since_sync()
+
+    def test_chat_message_buckets(self, count: int = 60):
+        """Test 7c: A thread longer than one message bucket (50) comes back complete and in order"""
+        print("=== Testing Chat Message Buckets ===")
+        email = f"buckets-{uuid.uuid4().hex[:8]}@example.com"
+
+        temp_token = self.auth_token
+        self.auth_token = None
+        sent = 0
+        for index in range(count):
+            response = self.make_request("POST", "/chat/send", {
+                "customerName": "Bucket Tester",
+                "customerEmail": email,
+                "message": f"Bucket message {index}"
+            })
+            sent += 1 if response.get("success") else 0
+        history_response = self.make_request("GET", f"/chat/history?email={email}")
+        self.auth_token = temp_token
+
+        conversation = history_response.get("data", {}).get("conversation") or {}
+        messages = conversation.get("messages", [])
+        texts = [m.get("message") for m in messages]
+        expected = [f"Bucket message {index}" for index in range(count)]
+        self.log_test(
+            "Chat Message Buckets - Complete History",
+            sent == count and texts == expected,
+            f"Sent {sent}/{count}, history returned {len(messages)} messages in order" if texts == expected
+            else f"Sent {sent}/{count}, history returned {len(messages)} messages out of order or incomplete"
+        )
+        self.log_test(
+            "Chat Message Buckets - Summary",
+            conversation.get("messageCount") == count and (conversation.get("lastMessage") or {}).get("seq") == count,
+            f"messageCount {conversation.get('messageCount')}, lastMessage seq "
+            f"{(conversation.get('lastMessage') or {}).get('seq')}"
+        )
+
+    def test_chat_concurrent_appends(self, count: int = 20):
+        """Test 7e: Concurrent sends to one conversation sync without gaps (storedSeq never skips a message)"""
+        print("=== Testing Concurrent Chat Appends ===")
+        email = f"appends-{uuid.uuid4().hex[:8]}@example.com"
+
+        temp_token = self.auth_token
+        self.auth_token = None
+        self.make_request("POST", "/chat/send", {
+            "customerName": "Append Tester",
+            "customerEmail": email,
+            "message": "Opening message"
+        })
+
+        def send(index: int) -> Dict:
+            return self.make_request("POST", "/chat/send", {
+                "customerName": "Append Tester",
+                "customerEmail": email,
+                "message": f"Concurrent message {index}"
+            }).get("data", {}).get("conversation") or {}
+
+        with ThreadPoolExecutor(max_workers=min(count, self.client.pool_size)) as pool:
+            responses = list(pool.map(send, range(count)))
+        delta_response = self.make_request("GET", f"/chat/history?email={email}&since=1")
+        self.auth_token = temp_token
+
+        # Every send response is a gap-free prefix of the conversation
+        prefixes = sum(
+            [m.get("seq") for m in conversation.get("messages", [])]
+            == list(range(1, len(conversation.get("messages", [])) + 1))
+            for conversation in responses
+        )
+        data = delta_response.get("data", {})
+        seqs = [m.get("seq") for m in data.get("messages", [])]
+        self.log_test(
+            "Concurrent Chat Appends - Gap-Free Sync",
+            prefixes == count and seqs == list(range(2, count + 2)) and data.get("messageCount") == count + 1,
+            f"{prefixes}/{count} send responses gap-free, since=1 returned seqs {seqs[:3]}...{seqs[-3:]}, "
+            f"messageCount {data.get('messageCount')}"
+        )
+
+    def test_chat_lost_append(self):
+        """Test 7f: An append that died between its seq $inc and bucket write does not hide later messages"""
+        print("=== Testing Lost Chat Append ===")
+        db = self.database()
+        if db is None:
+            return
+        email = f"lost-{uuid.uuid4().hex[:8]}@example.com"
+
+        temp_token = self.auth_token
+        self.auth_token = None
+        first = self.make_request("POST", "/chat/send", {
+            "customerName": "Lost Append Tester",
+            "customerEmail": email,
+            "message": "First message"
+        }).get("data", {}).get("conversation") or {}
+        chat_id = first.get("id")
+        if not chat_id:
+            self.auth_token = temp_token
+            self.log_test("Lost Chat Append", False, "Could not start a conversation")
+            return
+
+        # Seq 2 is allocated and never stored, as if the process died before its bucket write
+        db["chats"].update_one({"id": chat_id}, {"$inc": {"messageCount": 1}})
+        self.make_request("POST", "/chat/send", {
+            "customerName": "Lost Append Tester",
+            "customerEmail": email,
+            "message": "After the gap"
+        })
+        held = self.make_request("GET", f"/chat/history?email={email}&since=1")
+
+        # Age seq 3 past the grace period (CHAT_LOST_APPEND_GRACE_MS, default 30 s)
+        db["chat_messages"].update_one(
+            {"chatId": chat_id, "messages.seq": 3},
+            {"$set": {"messages.$.timestamp": datetime.now(timezone.utc) - timedelta(minutes=10)}}
+        )
+        released = self.make_request("GET", f"/chat/history?email={email}&since=1")
+        self.make_request("POST", "/chat/send", {
+            "customerName": "Lost Append Tester",
+            "customerEmail": email,
+            "message": "Later message"
+        })
+        later = self.make_request("GET", f"/chat/history?email={email}&since=3")
+        self.auth_token = temp_token
+
+        self.log_test(
+            "Lost Chat Append - Held Within Grace",
+            held.get("status_code") == 204,
+            f"since=1 right after the gap returned {held.get('status_code')}"
+        )
+        released_texts = [m.get("message") for m in released.get("data", {}).get("messages", [])]
+        later_texts = [m.get("message") for m in later.get("data", {}).get("messages", [])]
+        self.log_test(
+            "Lost Chat Append - Later Messages Delivered",
+            released_texts == ["After the gap"] and later_texts == ["Later message"]
+            and later.get("data", {}).get("messageCount") == 4,
+            f"After the grace period since=1 returned {released_texts}, since=3 returned {later_texts} "
+            f"(cursor {later.get('data', {}).get('messageCount')})"
+        )
+
+    def test_chat_since_sync(self):
+        """Test 7d: GET /chat/history?since=<seq> returns 204 when idle and only newer messages otherwise"""
+        print("=== Testing Chat Incremental Sync ===")
+        email = f"since-{uuid.uuid4().hex[:8]}@example.com"
+
+        temp_token = self.auth_token
+        self.auth_token = None
+        send_response = self.make_request("POST", "/chat/send", {
+            "customerName": "Since Tester",
+            "customerEmail": email,
+            "message": "First message"
+        })
+        conversation = send_response.get("data", {}).get("conversation") or {}
+        chat_id = conversation.get("id")
+        since = conversation.get("messageCount", 1)
+        idle_response = self.make_request("GET", f"/chat/history?email={email}&since={since}")
+        self.auth_token = temp_token
+
+        self.log_test(
+            "Chat Since Sync - No Change",
+            idle_response.get("status_code") == 204,
+            f"Status {idle_response.get('status_code')} with {len(idle_response.get('data') or {})} body fields"
+        )
+        if not chat_id:
+            return
+
+        self.make_request("POST", f"/chat/{chat_id}/reply", {"message": "Admin reply"})
+
+        self.auth_token = None
+        delta_response = self.make_request("GET", f"/chat/history?email={email}&since={since}")
+        self.auth_token = temp_token
+
+        data = delta_response.get("data", {})
+        messages = data.get("messages", [])
+        self.log_test(
+            "Chat Since Sync - New Messages Only",
+            delta_response.get("status_code") == 200 and [m.get("message") for m in messages] == ["Admin reply"]
+            and data.get("messageCount") == since + 1,
+            f"Returned {len(messages)} messages, messageCount {data.get('messageCount')}, "
+            f"unreadCount {data.get('unreadCount')}",
+            data if delta_response.get("status_code") != 200 else None
+        )
+
+    def seed_conversations(self, count: int) -> int:
+        """Create `count` new conversations through POST /chat/send; returns how many succeeded"""
+        run_id = uuid.uuid4().hex[:8]
+
+        def send(index: int) -> bool:
+            return self.make_request("POST", "/chat/send", {
+                "customerName": f"Scale Customer {index}",
+                "customerEmail": f"scale-{run_id}-{index}@example.com",
+                "message": f"Scale test message {index}"
+            }).get("success", False)
+
+        with ThreadPoolExecutor(max_workers=self.client.pool_size) as pool:
+            return sum(pool.map(send, range(count)))
+
+    def test_chat_pagination(self, page_size: int = 100):
+        """Test 7b: Walk GET /chat/conversations page by page with keyset cursors"""
+        print("=== Testing Chat Conversation Pagination ===")
+
+        if self.chat_scale:
+            seeded = self.seed_conversations(self.chat_scale)
+            self.log_test(
+                "Seed Conversations",
+                seeded == self.chat_scale,
+                f"Created {seeded}/{self.chat_scale} conversations through /chat/send"
+            )
+
+        seen = set()
+        walked = 0
+        pages = 0
+        # Page latency comes from the client's recorder: the requests made by this walk
+        requests_before, latency_before_us = self.client.recorder.totals("GET", "/chat/conversations")
+        previous_key = None
+        ordered = True
+        summaries_only = True
+        first_page = None
+        cursor = None
+
+        while True:
+            endpoint = f"/chat/conversations?limit={page_size}" + (f"&cursor={cursor}" if cursor else "")
+            response = self.make_request("GET", endpoint)
+            if not response.get("success"):
+                self.log_test("Conversations Pagination", False, f"Page {pages + 1} failed", response.get("data"))
+                return
+
+            data = response.get("data", {})
+            first_page = first_page or data
+            pages += 1
+
+            for conversation in data.get("conversations", []):
+                key = (conversation.get("lastMessageAt"), conversation.get("id"))
+                if previous_key and key > previous_key:
+                    ordered = False
+                previous_key = key
+                if "messages" in conversation or "lastMessage" not in conversation:
+                    summaries_only = False
+                seen.add(conversation.get("id"))
+                walked += 1
+
+            cursor = data.get("nextCursor")
+            if not cursor:
+                break
+
+        requests_after, latency_after_us = self.client.recorder.totals("GET", "/chat/conversations")
+        page_ms = (latency_after_us - latency_before_us) / 1000 / max(1, requests_after - requests_before)
+        expected = first_page.get("totalConversations", walked)
+        self.log_test(
+            "Conversations Pagination - Complete Walk",
+            walked == len(seen) and walked == expected,
+            f"Walked {walked} conversations ({len(seen)} unique, {expected} expected) in {pages} pages, "
+            f"avg {page_ms:.1f} ms/page"
+        )
+        self.log_test(
+            "Conversations Pagination - Order",
+            ordered,
+            "Pages are ordered by lastMessageAt, id descending" if ordered else "Pages out of order"
+        )
+        self.log_test(
+            "Conversations Pagination - Summary Projection",
+            summaries_only,
+            "Summaries carry lastMessage and no messages array" if summaries_only else "Full messages returned in list"
+        )
+
+        unread = first_page.get("totalUnread")
+        self.log_test(
+            "Conversations Pagination - Total Unread",
+            isinstance(unread, int) and unread >= 0,
+            f"totalUnread: {unread}"
+        )
+
+        invalid_response = self.make_request("GET", "/chat/conversations?cursor=not-a-cursor")
+        self.log_test(
+            "Conversations Pagination - Invalid Cursor",
+            invalid_response.get("status_code") == 400,
+            f"Invalid cursor returned status {invalid_response.get('status_code')}"
+        )
+
+        if first_page.get("conversations"):
+            chat_id = first_page["conversations"][0]["id"]
+            detail_response = self.make_request("GET", f"/chat/{chat_id}")
+            conversation = detail_response.get("data", {}).get("conversation") or {}
+            self.log_test(
+                "Get Conversation Detail",
+                detail_response.get("success") and isinstance(conversation.get("messages"), list),
+                f"Loaded {len(conversation.get('messages', []))} messages for conversation {chat_id}",
+                detail_response.get("data") if not detail_response.get("success") else None
+            )
+
     def test_admin_chat_permissions(self):
         """Test 8: Admin Chat Access Permissions"""
         print("=== Testing Admin Chat Access Permissions ===")
@@ -1267,6 +1820,74 @@ class MSPNBackendTester:
                     update_content_response.get("data")
                 )
 
+    def test_site_bundle(self):
+        """Test 11: GET /site returns every homepage section with an ETag that follows admin writes"""
+        print("=== Testing Site Bundle ===")
+
+        # Anonymous requests straight through the client, so response headers are visible
+        site_response = self.client.request("GET", "/site")
+        data = site_response.json() if site_response.status_code == 200 else {}
+        etag = site_response.headers.get("ETag")
+        cached_response = self.client.request("GET", "/site", headers={"If-None-Match": etag or ""})
+
+        sections = ["content", "skills", "services", "projects", "contact"]
+        missing = [section for section in sections if data.get(section) is None]
+        self.log_test(
+            "Site Bundle - Sections",
+            site_response.status_code == 200 and not missing,
+            f"Bundle has {len(sections) - len(missing)}/{len(sections)} sections"
+            + (f", missing {', '.join(missing)}" if missing else ""),
+            data if missing else None
+        )
+        self.log_test(
+            "Site Bundle - Conditional GET",
+            bool(etag) and cached_response.status_code == 304 and not cached_response.content,
+            f"ETag {etag}, If-None-Match answered with {cached_response.status_code}"
+        )
+
+        if not self.auth_token or not etag:
+            return
+
+        create_response = self.make_request("POST", "/skills", {"name": "Bundle Skill", "icon": "🧪"})
+        skill_id = (create_response.get("data", {}).get("skill") or {}).get("id")
+        changed_response = self.client.request("GET", "/site", headers={"If-None-Match": etag})
+        skills = changed_response.json().get("skills", []) if changed_response.status_code == 200 else []
+        if skill_id:
+            self.make_request("DELETE", f"/skills/{skill_id}")
+
+        self.log_test(
+            "Site Bundle - Invalidated By Writes",
+            changed_response.status_code == 200 and changed_response.headers.get("ETag") != etag
+            and any(skill.get("id") == skill_id for skill in skills),
+            f"After creating a skill: status {changed_response.status_code}, "
+            f"ETag {etag} -> {changed_response.headers.get('ETag')}"
+        )
+
+    def test_public_read_caching(self):
+        """Test 12: Public GETs carry a version ETag and Cache-Control, and answer If-None-Match with 304"""
+        print("=== Testing Public Read Caching ===")
+
+        for endpoint in ["/content", "/skills", "/services", "/projects", "/contact/info"]:
+            response = self.client.request("GET", endpoint)
+            etag = response.headers.get("ETag")
+            cache_control = response.headers.get("Cache-Control", "")
+            revalidated = self.client.request("GET", endpoint, headers={"If-None-Match": f"W/{etag}, \"other\""})
+            self.log_test(
+                f"Conditional GET {endpoint}",
+                response.status_code == 200 and bool(etag) and "stale-while-revalidate" in cache_control
+                and revalidated.status_code == 304 and revalidated.headers.get("ETag") == etag,
+                f"ETag {etag}, Cache-Control '{cache_control}', revalidation {revalidated.status_code}"
+            )
+
+        if self.auth_token:
+            response = self.client.request("GET", "/projects", headers={"Authorization": f"Bearer {self.auth_token}"})
+            self.log_test(
+                "Conditional GET /projects - Admin View Not Shared",
+                response.status_code == 200 and "private" in response.headers.get("Cache-Control", "")
+                and "Authorization" in response.headers.get("Vary", ""),
+                f"Cache-Control '{response.headers.get('Cache-Control')}', Vary '{response.headers.get('Vary')}'"
+            )
+
     def run_all_tests(self):
         """Run all backend tests"""
         print("🚀 Starting MSPN DEV Backend API Tests")
@@ -1283,6 +1904,8 @@ class MSPNBackendTester:
             self.test_admin_chat_permissions()
             self.test_contact_form()
             self.test_services_and_content_apis()
+            self.test_site_bundle()
+            self.test_public_read_caching()
         else:
             print("❌ Authentication failed - skipping other tests")
             
@@ -1299,6 +1922,11 @@ class MSPNBackendTester:
         print(f"✅ Passed: {passed_tests}")
         print(f"❌ Failed: {failed_tests}")
         print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
+        self.client.print_connection_stats()
+        self.client.recorder.print_summary()
+        if self.latency_out:
+            self.client.recorder.dump(self.latency_out)
+            print(f"\n⏱️  Per-endpoint latency written to {self.latency_out}")
         
         if failed_tests > 0:
             print("\n🔍 FAILED TESTS:")
@@ -1310,12 +1938,24 @@ class MSPNBackendTester:
         return failed_tests == 0
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MSPN DEV backend API tests")
+    parser.add_argument("--latency-out", help="write per-endpoint latency histograms to this .json or .csv file")
+    parser.add_argument("--chat-scale", type=int, default=0,
+                        help="seed this many extra conversations before the pagination walk")
+    add_baseline_arguments(parser)
+    args = parser.parse_args()
+    
     # Use environment variable or default to localhost
     base_url = os.getenv("NEXT_PUBLIC_BASE_URL", "http://localhost:3000")
     
-    tester = MSPNBackendTester(base_url)
+    tester = MSPNBackendTester(base_url, latency_out=args.latency_out, chat_scale=args.chat_scale)
     success = tester.run_all_tests()
     
+    if args.baseline:
+        perf_ok = check_against_baseline(tester.client.recorder.rows(), args.baseline,
+                                         args.max_regression, accept=args.accept_baseline)
+        success = success and perf_ok
+    
     if success:
         print("🎉 All tests passed!")
         exit(0)
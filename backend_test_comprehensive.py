@@ -9,16 +9,26 @@ import requests
 import json
 import time
 import os
+import argparse
+import threading
 from datetime import datetime
 
+from api_client import get_client
+from suite_scheduler import SuiteTask, run_suite
+from perf_baseline import add_baseline_arguments, check_against_baseline
+
 # Configuration
 BASE_URL = "https://444f32b8-1755-4acb-96cc-914adbafc47f.preview.emergentagent.com/api"
 SUPER_ADMIN_USERNAME = "admin"
 SUPER_ADMIN_PASSWORD = "admin123"
 
 class PromptForgeAPITester:
-    def __init__(self):
+    def __init__(self, workers=4, latency_out=None):
         self.base_url = BASE_URL
+        self.client = get_client(BASE_URL)
+        self.workers = workers
+        self.latency_out = latency_out
+        self.log_lock = threading.Lock()
         self.super_admin_token = None
         self.regular_admin_token = None
         self.test_results = []
@@ -27,28 +37,28 @@ class PromptForgeAPITester:
         
     def log_test(self, test_name, success, message=""):
         """Log test result"""
-        self.total_tests += 1
-        if success:
-            self.passed_tests += 1
-            status = "✅ PASS"
-        else:
-            status = "❌ FAIL"
-        
-        result = f"{status}: {test_name}"
-        if message:
-            result += f" - {message}"
-        
-        print(result)
-        self.test_results.append({
-            'test': test_name,
-            'success': success,
-            'message': message,
-            'timestamp': datetime.now().isoformat()
-        })
+        with self.log_lock:
+            self.total_tests += 1
+            if success:
+                self.passed_tests += 1
+                status = "✅ PASS"
+            else:
+                status = "❌ FAIL"
+            
+            result = f"{status}: {test_name}"
+            if message:
+                result += f" - {message}"
+            
+            print(result)
+            self.test_results.append({
+                'test': test_name,
+                'success': success,
+                'message': message,
+                'timestamp': datetime.now().isoformat()
+            })
         
     def make_request(self, method, endpoint, data=None, token=None, params=None):
         """Make HTTP request with proper headers"""
-        url = f"{self.base_url}{endpoint}"
         headers = {'Content-Type': 'application/json'}
         
         if token:
@@ -56,13 +66,13 @@ class PromptForgeAPITester:
             
         try:
             if method == 'GET':
-                response = requests.get(url, headers=headers, params=params, timeout=30)
+                response = self.client.request('GET', endpoint, headers=headers, params=params)
             elif method == 'POST':
-                response = requests.post(url, headers=headers, json=data, timeout=30)
+                response = self.client.request('POST', endpoint, headers=headers, json=data)
             elif method == 'PUT':
-                response = requests.put(url, headers=headers, json=data, timeout=30)
+                response = self.client.request('PUT', endpoint, headers=headers, json=data)
             elif method == 'DELETE':
-                response = requests.delete(url, headers=headers, timeout=30)
+                response = self.client.request('DELETE', endpoint, headers=headers)
             else:
                 raise ValueError(f"Unsupported method: {method}")
                 
@@ -783,17 +793,20 @@ class PromptForgeAPITester:
         print(f"Test started at: {datetime.now().isoformat()}")
         print("=" * 60)
 
-        # Run all test suites
-        self.test_authentication()
-        self.test_admin_management()
-        self.test_content_management()
-        self.test_skills_management()
-        self.test_services_management()
-        self.test_projects_management()
-        self.test_private_storage()
-        self.test_contact_management()
-        self.test_chat_system()
-        self.cleanup_test_data()
+        # Run all test suites - everything needs the super admin token; projects,
+        # storage and chat also need the regular admin from admin management.
+        # Independent suites run concurrently and cleanup always runs last.
+        run_suite([
+            SuiteTask("authentication", self.test_authentication),
+            SuiteTask("admin_management", self.test_admin_management, requires=["authentication"]),
+            SuiteTask("content", self.test_content_management, requires=["authentication"]),
+            SuiteTask("skills", self.test_skills_management, requires=["authentication"]),
+            SuiteTask("services", self.test_services_management, requires=["authentication"]),
+            SuiteTask("projects", self.test_projects_management, requires=["admin_management"]),
+            SuiteTask("private_storage", self.test_private_storage, requires=["admin_management"]),
+            SuiteTask("contact", self.test_contact_management, requires=["authentication"]),
+            SuiteTask("chat", self.test_chat_system, requires=["admin_management"]),
+        ], cleanup=self.cleanup_test_data, workers=self.workers)
 
         # Print final summary
         print("\n" + "=" * 60)
@@ -803,6 +816,11 @@ class PromptForgeAPITester:
         print(f"Passed: {self.passed_tests}")
         print(f"Failed: {self.total_tests - self.passed_tests}")
         print(f"Success Rate: {(self.passed_tests / self.total_tests * 100):.1f}%")
+        self.client.print_connection_stats()
+        self.client.recorder.print_summary()
+        if self.latency_out:
+            self.client.recorder.dump(self.latency_out)
+            print(f"\n⏱️  Per-endpoint latency written to {self.latency_out}")
         
         if self.passed_tests == self.total_tests:
             print("\n🎉 ALL TESTS PASSED! Backend is fully functional.")
@@ -810,7 +828,21 @@ class PromptForgeAPITester:
             print(f"\n⚠️  {self.total_tests - self.passed_tests} tests failed. Check the details above.")
             
         print("=" * 60)
+        return self.passed_tests == self.total_tests
 
 if __name__ == "__main__":
-    tester = PromptForgeAPITester()
-    tester.run_all_tests()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Comprehensive Prompt Forge backend API tests")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent test suites (1 runs strictly in sequence)")
+    parser.add_argument("--latency-out", help="write per-endpoint latency histograms to this .json or .csv file")
+    add_baseline_arguments(parser)
+    args = parser.parse_args()
+    
+    tester = PromptForgeAPITester(workers=args.workers, latency_out=args.latency_out)
+    success = tester.run_all_tests()
+    
+    if args.baseline:
+        perf_ok = check_against_baseline(tester.client.recorder.rows(), args.baseline,
+                                         args.max_regression, accept=args.accept_baseline)
+        success = success and perf_ok
+    
+    exit(0 if success else 1)
\ No newline at end of file
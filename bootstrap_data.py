@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Default data bootstrap for a fresh database
+Seeds the records in lib/defaults.json with the same rules lib/bootstrap.js
+applies at server start (instrumentation.js):
+- a marker in the bootstrap collection means a collection was handled; skip it
+- a collection that already has documents only gets the marker
+- otherwise defaults are upserted by their fixed ids with $setOnInsert
+--force restores missing defaults by id, except in the singleton collections
+(site_content, contact_info), which the API reads and writes with an empty
+filter; there it only seeds an empty collection, so it never adds a second
+document next to one an admin created under another id.
+Seeded collections get their version stamp bumped so public ETags change;
+running servers pick the new data up once their read cache TTL expires.
+
+Usage:
+    python bootstrap_data.py status
+    python bootstrap_data.py run [--collection skills] [--force]
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from manage_indexes import create_indexes, load_definitions
+from migrations import bump_version, connect
+
+DEFAULTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lib", "defaults.json")
+MARKERS_COLLECTION = "bootstrap"
+# One document each, found with findOne({}) / updateOne({}) rather than by id
+SINGLETON_COLLECTIONS = {"site_content", "contact_info"}
+
+
+def load_defaults(path: str = DEFAULTS_FILE) -> Dict[str, List[Dict[str, Any]]]:
+    with open(path) as handle:
+        return json.load(handle)
+
+
+def bootstrap_collection(db, collection_name: str, records: List[Dict[str, Any]], force: bool = False) -> str:
+    """Seed one collection; force ignores the marker and restores any missing default by id"""
+    markers = db[MARKERS_COLLECTION]
+    if not force and markers.find_one({"id": collection_name}):
+        return "skipped"
+
+    collection = db[collection_name]
+    inserted = 0
+    empty = collection.find_one({}, {"_id": 1}) is None
+    if empty or (force and collection_name not in SINGLETON_COLLECTIONS):
+        ops = [UpdateOne({"id": record["id"]}, {"$setOnInsert": record}, upsert=True) for record in records]
+        try:
+            inserted = collection.bulk_write(ops, ordered=False).upserted_count
+        except BulkWriteError as e:
+            # A concurrent run upserted the same ids first; its copies stand
+            if any(error["code"] != 11000 for error in e.details["writeErrors"]):
+                raise
+            inserted = e.details.get("nUpserted", 0)
+
+    try:
+        markers.update_one(
+            {"id": collection_name},
+            {"$setOnInsert": {"id": collection_name, "seededAt": datetime.now(timezone.utc), "inserted": inserted}},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        pass
+    if inserted:
+        bump_version(db, collection_name)
+    return f"seeded {inserted}" if inserted else "existing"
+
+
+def run_bootstrap(db, defaults, only: Optional[str] = None, force: bool = False) -> bool:
+    indexes = load_definitions()
+    # The id_unique indexes are what make concurrent seeding safe
+    if not create_indexes(db, {name: indexes.get(name, []) for name in list(defaults) + [MARKERS_COLLECTION]}):
+        print("❌ Could not create the unique indexes bootstrap relies on")
+        return False
+
+    print()
+    for collection_name, records in defaults.items():
+        if only and collection_name != only:
+            continue
+        status = bootstrap_collection(db, collection_name, records, force)
+        icon = "🌱" if status.startswith("seeded") else "⏭️ "
+        print(f"{icon} {collection_name}: {status}")
+    return True
+
+
+def print_status(db, defaults):
+    markers = {marker["id"]: marker for marker in db[MARKERS_COLLECTION].find({}, {"_id": 0})}
+    print(f"{'Collection':<16} {'Documents':>10} {'Defaults':>9}  Bootstrapped")
+    print("-" * 64)
+    for collection_name, records in defaults.items():
+        present = db[collection_name].count_documents({"id": {"$in": [record["id"] for record in records]}})
+        marker = markers.get(collection_name)
+        seeded = f"{str(marker['seededAt'])[:19]} ({marker.get('inserted', 0)} inserted)" if marker else "no"
+        print(f"{collection_name:<16} {db[collection_name].estimated_document_count():>10} "
+              f"{present:>4}/{len(records):<4}  {seeded}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed the default records in lib/defaults.json")
+    parser.add_argument("command", choices=["status", "run"])
+    parser.add_argument("--collection", help="only bootstrap this collection")
+    parser.add_argument("--force", action="store_true",
+                        help="ignore bootstrap markers and restore missing defaults by id "
+                             "(singleton collections are only seeded when empty)")
+    args = parser.parse_args()
+
+    defaults = load_defaults()
+    if args.collection and args.collection not in defaults:
+        print(f"❌ No defaults for {args.collection}; choose from {', '.join(defaults)}")
+        exit(1)
+
+    client, db = connect()
+    success = True
+    try:
+        if args.command == "status":
+            print_status(db, defaults)
+        else:
+            success = run_bootstrap(db, defaults, args.collection, args.force)
+    finally:
+        client.close()
+    exit(0 if success else 1)
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Soak test for the GET /api/chat/stream Server-Sent Events channel
+Holds thousands of idle customer streams open against a running server and
+samples GET /api/metrics (super admin) to show per-connection cost stays bounded:
+- Seeds customer conversations through POST /chat/send
+- Opens N concurrent streams spread across those conversations (asyncio, raw HTTP/1.1)
+- Holds them idle, sampling server RSS/heap and the open-stream count
+- Sends an admin reply and measures push latency to every stream on that conversation
+- Closes everything and checks the server released every stream
+
+Usage:
+    python chat_stream_soak.py --streams 2000 --hold 120
+    python chat_stream_soak.py --base-url http://localhost:3000 --streams 5000 --max-kb-per-stream 32
+"""
+
+import argparse
+import asyncio
+import resource
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlencode, urlsplit
+
+from api_client import get_client
+
+MB = 1024 * 1024
+
+
+class SSEStream:
+    """One raw HTTP/1.1 GET /api/chat/stream connection and the events read from it"""
+
+    def __init__(self, host: str, port: int, path: str, chat_id: str):
+        self.host = host
+        self.port = port
+        self.path = path
+        self.chat_id = chat_id
+        self.status: Optional[int] = None
+        self.messages: List[float] = []
+        self.bytes_read = 0
+        self.error: Optional[str] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.task: Optional[asyncio.Task] = None
+
+    async def open(self, timeout: float) -> bool:
+        try:
+            reader, self.writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), timeout)
+            self.writer.write((f"GET {self.path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                               "Accept: text/event-stream\r\nCache-Control: no-cache\r\n\r\n").encode())
+            await self.writer.drain()
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+            self.error = type(e).__name__
+            return False
+
+        self.status = int(head.split(b" ", 2)[1])
+        if self.status != 200 or b"text/event-stream" not in head.lower():
+            self.error = f"HTTP {self.status}"
+            return False
+        self.task = asyncio.create_task(self.consume(reader))
+        return True
+
+    async def consume(self, reader: asyncio.StreamReader):
+        try:
+            while True:
+                chunk = await reader.read(4096)
+                if not chunk:
+                    break
+                self.bytes_read += len(chunk)
+                for _ in range(chunk.count(b"event: message")):
+                    self.messages.append(time.perf_counter())
+        except (OSError, asyncio.CancelledError):
+            pass
+
+    async def close(self):
+        if self.task:
+            self.task.cancel()
+        if self.writer:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+
+
+class ChatStreamSoak:
+    def __init__(self, base_url: str, username: str, password: str):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.client = get_client(f"{base_url.rstrip('/')}/api")
+        self.username = username
+        self.password = password
+        self.token: Optional[str] = None
+        self.samples: List[Dict[str, Any]] = []
+
+    def request(self, method: str, endpoint: str, data: Dict = None) -> Dict:
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        response = self.client.request(method, endpoint, json=data, headers=headers)
+        try:
+            return response.json()
+        except ValueError:
+            return {"status_code": response.status_code}
+
+    def login(self) -> bool:
+        data = self.request("POST", "/auth/login", {"username": self.username, "password": self.password})
+        self.token = data.get("token")
+        return bool(self.token)
+
+    def seed(self, count: int) -> List[Dict[str, Any]]:
+        run_id = uuid.uuid4().hex[:8]
+        conversations = []
+        for index in range(count):
+            email = f"soak-{run_id}-{index}@example.com"
+            data = self.request("POST", "/chat/send", {
+                "customerName": f"Soak Customer {index}",
+                "customerEmail": email,
+                "message": "Soak test message"
+            })
+            if data.get("success"):
+                conversations.append({"id": data["chatId"], "email": email,
+                                      "since": data["conversation"].get("messageCount", 1)})
+        return conversations
+
+    async def sample(self, label: str) -> Dict[str, Any]:
+        data = await asyncio.to_thread(self.request, "GET", "/metrics")
+        memory = data.get("memory", {})
+        sample = {
+            "label": label,
+            "time": time.perf_counter(),
+            "rss": memory.get("rss", 0),
+            "heapUsed": memory.get("heapUsed", 0),
+            "open": data.get("chatStreams", {}).get("open", 0)
+        }
+        self.samples.append(sample)
+        print(f"  {label:<14} open={sample['open']:<6} rss={sample['rss'] / MB:7.1f}MB "
+              f"heap={sample['heapUsed'] / MB:7.1f}MB")
+        return sample
+
+    async def open_streams(self, conversations: List[Dict[str, Any]], count: int, concurrency: int,
+                           timeout: float) -> List[SSEStream]:
+        streams = []
+        for index in range(count):
+            conversation = conversations[index % len(conversations)]
+            query = urlencode({"email": conversation["email"], "since": conversation["since"]})
+            streams.append(SSEStream(self.host, self.port, f"/api/chat/stream?{query}", conversation["id"]))
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def open_one(stream: SSEStream):
+            async with semaphore:
+                await stream.open(timeout)
+
+        await asyncio.gather(*(open_one(stream) for stream in streams))
+        return streams
+
+    async def check_delivery(self, streams: List[SSEStream], chat_id: str, timeout: float) -> Dict[str, Any]:
+        targets = [s for s in streams if s.chat_id == chat_id and s.task]
+        before = {id(s): len(s.messages) for s in targets}
+        sent_at = time.perf_counter()
+        await asyncio.to_thread(self.request, "POST", f"/chat/{chat_id}/reply", {"message": "Soak reply"})
+
+        deadline = sent_at + timeout
+        while time.perf_counter() < deadline:
+            if all(len(s.messages) > before[id(s)] for s in targets):
+                break
+            await asyncio.sleep(0.05)
+
+        delays = sorted((s.messages[before[id(s)]] - sent_at) * 1000 for s in targets if len(s.messages) > before[id(s)])
+        return {
+            "targets": len(targets),
+            "delivered": len(delays),
+            "p50_ms": delays[len(delays) // 2] if delays else None,
+            "max_ms": delays[-1] if delays else None
+        }
+
+    async def run(self, streams: int, conversations: int, hold: float, interval: float, concurrency: int,
+                  timeout: float, max_kb_per_stream: float, max_idle_growth_mb: float) -> bool:
+        print("🔐 Logging in for /metrics")
+        if not await asyncio.to_thread(self.login):
+            print("❌ Login failed - /metrics needs a super admin account")
+            return False
+
+        print(f"💬 Seeding {conversations} conversations")
+        seeded = await asyncio.to_thread(self.seed, conversations)
+        if not seeded:
+            print("❌ Could not create any conversations")
+            return False
+
+        print(f"\n📡 Opening {streams} streams ({concurrency} at a time)")
+        baseline = await self.sample("baseline")
+        opened_start = time.perf_counter()
+        open_streams = await self.open_streams(seeded, streams, concurrency, timeout)
+        connected = [s for s in open_streams if s.task]
+        print(f"  opened {len(connected)}/{streams} in {time.perf_counter() - opened_start:.1f}s")
+        errors: Dict[str, int] = {}
+        for s in open_streams:
+            if s.error:
+                errors[s.error] = errors.get(s.error, 0) + 1
+        for error, count in sorted(errors.items()):
+            print(f"  ⚠️  {count} streams failed: {error}")
+
+        loaded = await self.sample("opened")
+        print(f"\n⏳ Holding idle for {hold:.0f}s")
+        hold_end = time.perf_counter() + hold
+        idle = [loaded]
+        while time.perf_counter() < hold_end:
+            await asyncio.sleep(min(interval, max(0.0, hold_end - time.perf_counter())))
+            idle.append(await self.sample("idle"))
+
+        print("\n📨 Admin reply push")
+        delivery = await self.check_delivery(open_streams, seeded[0]["id"], timeout)
+
+        print("\n🔌 Closing streams")
+        await asyncio.gather(*(s.close() for s in open_streams))
+        await asyncio.sleep(1)
+        closed = await self.sample("closed")
+
+        per_stream_heap = (loaded["heapUsed"] - baseline["heapUsed"]) / max(1, len(connected))
+        per_stream_rss = (loaded["rss"] - baseline["rss"]) / max(1, len(connected))
+        idle_growth = max(s["rss"] for s in idle) - loaded["rss"]
+
+        print("\n📊 CHAT STREAM SOAK SUMMARY")
+        print("=" * 50)
+        print(f"Streams held:         {len(connected)}/{streams} over {len(seeded)} conversations")
+        print(f"Server open streams:  {loaded['open'] - baseline['open']} while held, {closed['open']} after close")
+        print(f"Per-stream heap:      {per_stream_heap / 1024:.1f} KB")
+        print(f"Per-stream RSS:       {per_stream_rss / 1024:.1f} KB")
+        print(f"Idle RSS growth:      {idle_growth / MB:.1f} MB over {hold:.0f}s")
+        print(f"Push delivery:        {delivery['delivered']}/{delivery['targets']} streams, "
+              f"p50 {delivery['p50_ms'] or 0:.1f}ms, max {delivery['max_ms'] or 0:.1f}ms")
+
+        checks = [
+            ("all streams opened", len(connected) == streams),
+            (f"heap per stream <= {max_kb_per_stream:g} KB", per_stream_heap <= max_kb_per_stream * 1024),
+            (f"idle RSS growth <= {max_idle_growth_mb:g} MB", idle_growth <= max_idle_growth_mb * MB),
+            ("reply pushed to every stream", delivery["delivered"] == delivery["targets"]),
+            ("server released every stream", closed["open"] <= baseline["open"])
+        ]
+        print()
+        for name, passed in checks:
+            print(f"{'✅' if passed else '❌'} {name}")
+        return all(passed for _, passed in checks)
+
+
+def raise_file_limit(needed: int):
+    """Each stream is one socket; lift the soft descriptor limit up to the hard limit"""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    target = hard if hard == resource.RLIM_INFINITY else min(hard, max(soft, needed))
+    if target > soft:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+    if target != resource.RLIM_INFINITY and target < needed:
+        print(f"⚠️  File descriptor limit {target} is below the {needed} streams requested")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hold many idle chat SSE streams and check server memory stays bounded")
+    parser.add_argument("--base-url", default="http://localhost:3000")
+    parser.add_argument("--username", default="admin", help="super admin used to read /api/metrics")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--streams", type=int, default=2000)
+    parser.add_argument("--conversations", type=int, default=20, help="streams are spread across this many chats")
+    parser.add_argument("--hold", type=float, default=60, help="seconds to hold the streams idle")
+    parser.add_argument("--interval", type=float, default=10, help="seconds between metrics samples while idle")
+    parser.add_argument("--concurrency", type=int, default=200, help="streams opened at a time")
+    parser.add_argument("--timeout", type=float, default=15)
+    parser.add_argument("--max-kb-per-stream", type=float, default=64)
+    parser.add_argument("--max-idle-growth-mb", type=float, default=32)
+    args = parser.parse_args()
+
+    raise_file_limit(args.streams + 64)
+    soak = ChatStreamSoak(args.base_url, args.username, args.password)
+    success = asyncio.run(soak.run(args.streams, args.conversations, args.hold, args.interval, args.concurrency,
+                                   args.timeout, args.max_kb_per_stream, args.max_idle_growth_mb))
+    exit(0 if success else 1)
@@ -3,6 +3,13 @@
 import { useState, useEffect, useRef } from 'react';
 import { X, Send, MessageCircle, Loader2 } from 'lucide-react';
 
+const highestSeq = (msgs) => msgs.reduce((max, m) => Math.max(max, m.seq || 0), 0);
+
+// Polling interval on its own, and the slower catch-up poll kept next to an open
+// stream: the stream only carries messages written on the server instance holding it
+const POLL_INTERVAL_MS = 10000;
+const STREAM_CATCH_UP_MS = 60000;
+
 export default function ChatWidget() {
   const [isOpen, setIsOpen] = useState(false);
   const [hasSession, setHasSession] = useState(false);
@@ -27,6 +34,9 @@ export default function ChatWidget() {
   
   const messagesEndRef = useRef(null);
   const pollInterval = useRef(null);
+  const eventSource = useRef(null);
+  // Highest message seq received, sent as ?since= so polls only return new messages
+  const lastSeq = useRef(0);
 
   // Load session from localStorage on mount
   useEffect(() => {
@@ -42,7 +52,7 @@ export default function ChatWidget() {
         setHasSession(true);
         
         // Start polling for admin replies
-        startPolling(session.chatId, session.customerEmail, session.customerPhone);
+        startSync(session.chatId, session.customerEmail, session.customerPhone, session.messages || []);
       } catch (error) {
         console.error('Error loading session:', error);
         localStorage.removeItem('chatSession');
@@ -53,19 +63,68 @@ export default function ChatWidget() {
   // Auto-scroll to bottom
   useEffect(() => {
     messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
+    lastSeq.current = highestSeq(messages);
   }, [messages]);
 
-  // Cleanup polling on unmount
+  // Cleanup stream and polling on unmount
   useEffect(() => {
-    return () => {
-      if (pollInterval.current) {
-        clearInterval(pollInterval.current);
+    return () => stopSync();
+  }, []);
+
+  const stopSync = () => {
+    if (eventSource.current) {
+      eventSource.current.close();
+      eventSource.current = null;
+    }
+    if (pollInterval.current) {
+      clearInterval(pollInterval.current);
+      pollInterval.current = null;
+    }
+  };
+
+  // Receive new messages over GET /api/chat/stream with a slow ?since= poll next to it
+  // (replies written on another server instance never reach this stream); fall back
+  // to normal polling when EventSource is unavailable or the server refuses or drops
+  // the stream for good
+  const startSync = (id, email, phone, knownMessages = []) => {
+    stopSync();
+    lastSeq.current = Math.max(lastSeq.current, highestSeq(knownMessages));
+    if (typeof window === 'undefined' || !window.EventSource) {
+      startPolling(id, email, phone);
+      return;
+    }
+
+    const params = new URLSearchParams();
+    if (email) params.append('email', email);
+    if (phone) params.append('phone', phone);
+    if (lastSeq.current > 0) params.append('since', lastSeq.current);
+
+    const source = new EventSource(`/api/chat/stream?${params.toString()}`);
+    eventSource.current = source;
+    startPolling(id, email, phone, STREAM_CATCH_UP_MS);
+
+    source.addEventListener('message', (event) => {
+      try {
+        appendMessages(id, email, phone, [JSON.parse(event.data)]);
+      } catch (error) {
+        console.error('Error reading chat stream:', error);
       }
+    });
+
+    const fallBack = () => {
+      if (eventSource.current !== source) return;
+      source.close();
+      eventSource.current = null;
+      startPolling(id, email, phone);
     };
-  }, []);
+    source.addEventListener('busy', fallBack);
+    source.onerror = () => {
+      // CONNECTING means EventSource is retrying on its own
+      if (source.readyState === EventSource.CLOSED) fallBack();
+    };
+  };
 
-  const startPolling = (id, email, phone) => {
-    // Poll every 10 seconds for new messages
+  const startPolling = (id, email, phone, intervalMs = POLL_INTERVAL_MS) => {
     if (pollInterval.current) {
       clearInterval(pollInterval.current);
     }
@@ -75,11 +134,17 @@ export default function ChatWidget() {
         const params = new URLSearchParams();
         if (email) params.append('email', email);
         if (phone) params.append('phone', phone);
+        const since = lastSeq.current;
+        if (since > 0) params.append('since', since);
         
         const response = await fetch(`/api/chat/history?${params.toString()}`);
+        // 204: nothing new since the last poll
+        if (response.status === 204) return;
         const data = await response.json();
         
-        if (data.success && data.conversation) {
+        if (data.success && since > 0) {
+          appendMessages(id, email, phone, data.messages || []);
+        } else if (data.success && data.conversation) {
           const newMessages = data.conversation.messages || [];
           setMessages(newMessages);
           
@@ -98,7 +163,26 @@ export default function ChatWidget() {
       } catch (error) {
         console.error('Error polling messages:', error);
       }
-    }, 10000); // 10 seconds
+    }, intervalMs);
+  };
+
+  const appendMessages = (id, email, phone, incoming) => {
+    // The stream and the send response can both deliver a message; seq decides what is new
+    const fresh = incoming.filter(m => !(m.seq <= lastSeq.current));
+    if (fresh.length === 0) return;
+    lastSeq.current = Math.max(lastSeq.current, highestSeq(fresh));
+
+    setMessages(prev => {
+      const known = new Set(prev.map(m => m.id));
+      const merged = [...prev, ...fresh.filter(m => !known.has(m.id))];
+      saveSession(id, email, phone, merged);
+      return merged;
+    });
+
+    const adminReplies = fresh.filter(m => m.sender === 'admin').length;
+    if (adminReplies > 0) {
+      setUnreadCount(prev => prev + adminReplies);
+    }
   };
 
   const saveSession = (id, email, phone, msgs) => {
@@ -143,7 +227,7 @@ export default function ChatWidget() {
         saveSession(data.chatId, customerEmail.trim(), customerPhone.trim(), data.conversation.messages);
         
         // Start polling for replies
-        startPolling(data.chatId, customerEmail.trim(), customerPhone.trim());
+        startSync(data.chatId, customerEmail.trim(), customerPhone.trim(), data.conversation.messages);
       } else {
         alert('Failed to send message. Please try again.');
       }
@@ -221,10 +305,11 @@ export default function ChatWidget() {
         );
         
         // Start polling
-        startPolling(
+        startSync(
           data.conversation.id,
           data.conversation.customerEmail,
-          data.conversation.customerPhone
+          data.conversation.customerPhone,
+          data.conversation.messages
         );
       } else {
         alert('No conversation found with that email/phone. Start a new chat!');
@@ -241,9 +326,7 @@ export default function ChatWidget() {
   const handleNewChat = () => {
     if (confirm('Start a new conversation? Your current chat will remain saved.')) {
       localStorage.removeItem('chatSession');
-      if (pollInterval.current) {
-        clearInterval(pollInterval.current);
-      }
+      stopSync();
       setChatId('');
       setCustomerName('');
       setCustomerEmail('');
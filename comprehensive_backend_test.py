@@ -10,17 +10,24 @@ Tests all critical features as specified in the review request:
 6. Services & Contact CRUD
 """
 
-import requests
-import json
-import os
-from typing import Dict, Any, Optional
+import argparse
+import threading
+from typing import Dict, Optional
+
+from api_client import get_client
+from suite_scheduler import SuiteTask, run_suite
+from perf_baseline import add_baseline_arguments, check_against_baseline
 
 # Configuration
 BASE_URL = "http://localhost:3000/api"
 HEADERS = {"Content-Type": "application/json"}
 
 class ComprehensiveMSPNTester:
-    def __init__(self):
+    def __init__(self, workers: int = 4, latency_out: Optional[str] = None):
+        self.client = get_client(BASE_URL)
+        self.workers = workers
+        self.latency_out = latency_out
+        self.log_lock = threading.Lock()
         self.super_admin_token = None
         self.regular_admin_token = None
         self.regular_admin_id = None
@@ -34,19 +41,19 @@ class ComprehensiveMSPNTester:
     def log_test(self, test_name: str, success: bool, details: str = ""):
         """Log test results"""
         status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status} {test_name}")
-        if details:
-            print(f"   Details: {details}")
-        print()
-        
-        if success:
-            self.passed_tests.append(test_name)
-        else:
-            self.failed_tests.append(f"{test_name}: {details}")
+        with self.log_lock:
+            print(f"{status} {test_name}")
+            if details:
+                print(f"   Details: {details}")
+            print()
+            
+            if success:
+                self.passed_tests.append(test_name)
+            else:
+                self.failed_tests.append(f"{test_name}: {details}")
         
     def make_request(self, method: str, endpoint: str, data: Dict = None, token: str = None) -> Dict:
         """Make HTTP request with optional authentication"""
-        url = f"{BASE_URL}{endpoint}"
         headers = HEADERS.copy()
         
         if token:
@@ -54,13 +61,13 @@ class ComprehensiveMSPNTester:
             
         try:
             if method == "GET":
-                response = requests.get(url, headers=headers, timeout=30)
+                response = self.client.request("GET", endpoint, headers=headers)
             elif method == "POST":
-                response = requests.post(url, headers=headers, json=data, timeout=30)
+                response = self.client.request("POST", endpoint, headers=headers, json=data)
             elif method == "PUT":
-                response = requests.put(url, headers=headers, json=data, timeout=30)
+                response = self.client.request("PUT", endpoint, headers=headers, json=data)
             elif method == "DELETE":
-                response = requests.delete(url, headers=headers, timeout=30)
+                response = self.client.request("DELETE", endpoint, headers=headers)
             else:
                 return {"error": "Invalid method", "status_code": 400}
                 
@@ -634,17 +641,17 @@ class ComprehensiveMSPNTester:
         print("=" * 80)
         print()
         
-        # Run all tests
-        test_results = []
-        test_results.append(self.test_1_admin_authentication_permissions())
-        test_results.append(self.test_2_projects_visibility_system())
-        test_results.append(self.test_3_admin_management_super_only())
-        test_results.append(self.test_4_private_storage_code_vault())
-        test_results.append(self.test_5_skills_crud_no_percentages())
-        test_results.append(self.test_6_services_contact_crud())
-        
-        # Cleanup
-        self.cleanup_test_data()
+        # Run all tests - everything needs the super admin token from test 1,
+        # test 2 also needs the regular admin created there; the rest touch
+        # disjoint collections and run concurrently. Cleanup always runs last.
+        test_results = run_suite([
+            SuiteTask("auth", self.test_1_admin_authentication_permissions),
+            SuiteTask("projects", self.test_2_projects_visibility_system, requires=["auth"]),
+            SuiteTask("admins", self.test_3_admin_management_super_only, requires=["auth"]),
+            SuiteTask("storage", self.test_4_private_storage_code_vault, requires=["auth"]),
+            SuiteTask("skills", self.test_5_skills_crud_no_percentages, requires=["auth"]),
+            SuiteTask("services_contact", self.test_6_services_contact_crud, requires=["auth"]),
+        ], cleanup=self.cleanup_test_data, workers=self.workers)
         
         # Final Summary
         print("🏁 COMPREHENSIVE TEST SUMMARY")
@@ -658,6 +665,11 @@ class ComprehensiveMSPNTester:
         print(f"✅ Passed: {total_passed}")
         print(f"❌ Failed: {total_failed}")
         print(f"Success Rate: {(total_passed/total_tests)*100:.1f}%")
+        self.client.print_connection_stats()
+        self.client.recorder.print_summary()
+        if self.latency_out:
+            self.client.recorder.dump(self.latency_out)
+            print(f"\n⏱️  Per-endpoint latency written to {self.latency_out}")
         print()
         
         if total_failed > 0:
@@ -682,6 +694,17 @@ class ComprehensiveMSPNTester:
         return suite_passed == suite_total and total_failed == 0
 
 if __name__ == "__main__":
-    tester = ComprehensiveMSPNTester()
+    parser = argparse.ArgumentParser(description="Comprehensive MSPN DEV backend tests")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent test groups (1 runs strictly in sequence)")
+    parser.add_argument("--latency-out", help="write per-endpoint latency histograms to this .json or .csv file")
+    add_baseline_arguments(parser)
+    args = parser.parse_args()
+    
+    tester = ComprehensiveMSPNTester(workers=args.workers, latency_out=args.latency_out)
     success = tester.run_comprehensive_tests()
+    
+    if args.baseline:
+        perf_ok = check_against_baseline(tester.client.recorder.rows(), args.baseline,
+                                         args.max_regression, accept=args.accept_baseline)
+        success = success and perf_ok
     exit(0 if success else 1)
\ No newline at end of file
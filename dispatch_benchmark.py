@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Route dispatch benchmark for app/api/[[...path]]/route.js
+Sends side-effect-free probes to every API route and reads the Server-Timing
+header the catch-all handler adds to each response:
+- dispatch: time spent resolving method + path to a handler
+- total: dispatch plus handler time
+Protected routes are probed without a token so they return 401 before touching
+MongoDB; public GETs and an unknown path (404) cover the remaining cases.
+Reports dispatch p50/p99 in microseconds per route, so routes registered last
+(chat) can be compared with routes registered first (auth).
+
+Usage:
+    python dispatch_benchmark.py --iterations 500
+    python dispatch_benchmark.py --base-url http://localhost:3000 --out dispatch.json
+"""
+
+import argparse
+import json
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from api_client import get_client
+from latency_stats import Histogram
+from perf_baseline import add_baseline_arguments, check_against_baseline
+
+SAMPLE_ID = "00000000-0000-4000-8000-000000000000"
+
+# (method, path) in the order route.js registers them; none of these change data
+PROBES: List[Tuple[str, str]] = [
+    ("GET", "/auth/verify"),
+    ("GET", "/admins"),
+    ("POST", "/admins"),
+    ("PUT", f"/admins/{SAMPLE_ID}"),
+    ("DELETE", f"/admins/{SAMPLE_ID}"),
+    ("GET", "/content"),
+    ("PUT", "/content"),
+    ("GET", "/skills"),
+    ("POST", "/skills"),
+    ("PUT", f"/skills/{SAMPLE_ID}"),
+    ("DELETE", f"/skills/{SAMPLE_ID}"),
+    ("GET", "/services"),
+    ("POST", "/services"),
+    ("PUT", f"/services/{SAMPLE_ID}"),
+    ("DELETE", f"/services/{SAMPLE_ID}"),
+    ("GET", "/projects"),
+    ("POST", "/projects"),
+    ("PUT", f"/projects/{SAMPLE_ID}"),
+    ("DELETE", f"/projects/{SAMPLE_ID}"),
+    ("GET", "/contact/info"),
+    ("PUT", "/contact/info"),
+    ("GET", "/site"),
+    ("GET", "/storage"),
+    ("POST", "/storage"),
+    ("PUT", f"/storage/{SAMPLE_ID}"),
+    ("DELETE", f"/storage/{SAMPLE_ID}"),
+    ("POST", "/upload"),
+    ("GET", "/chat/history"),
+    ("GET", "/chat/stream"),
+    ("GET", "/chat/conversations"),
+    ("GET", f"/chat/{SAMPLE_ID}"),
+    ("POST", f"/chat/{SAMPLE_ID}/reply"),
+    ("PUT", f"/chat/{SAMPLE_ID}/read"),
+    ("GET", "/metrics"),
+    ("GET", "/no/such/route"),
+]
+
+SERVER_TIMING_ENTRY = re.compile(r"([\w-]+);dur=([\d.]+)")
+
+
+def parse_server_timing(header: Optional[str]) -> Dict[str, float]:
+    """'dispatch;dur=0.012, total;dur=1.5' -> {'dispatch': 0.012, 'total': 1.5} (milliseconds)"""
+    return {name: float(value) for name, value in SERVER_TIMING_ENTRY.findall(header or "")}
+
+
+class DispatchBenchmark:
+    def __init__(self, base_url: str = "http://localhost:3000"):
+        self.client = get_client(f"{base_url}/api")
+        self.dispatch_us: Dict[str, Histogram] = {}
+        self.total_us: Dict[str, Histogram] = {}
+        self.missing_header = 0
+
+    def probe(self, method: str, path: str):
+        try:
+            response = self.client.request(method, path, headers={"Content-Type": "application/json"})
+        except requests.exceptions.RequestException as e:
+            print(f"❌ {method} {path}: {e}")
+            return
+
+        timings = parse_server_timing(response.headers.get("Server-Timing"))
+        if "dispatch" not in timings:
+            self.missing_header += 1
+            return
+        key = f"{method} {path.replace(SAMPLE_ID, ':id')}"
+        self.dispatch_us.setdefault(key, Histogram()).record(int(timings["dispatch"] * 1000))
+        self.total_us.setdefault(key, Histogram()).record(int(timings.get("total", 0) * 1000))
+
+    def run(self, iterations: int, warmup: int = 20):
+        print(f"🚀 Probing {len(PROBES)} routes × {iterations} iterations at {self.client.api_base}")
+        for _ in range(warmup):
+            for method, path in PROBES:
+                self.probe(method, path)
+        self.dispatch_us.clear()
+        self.total_us.clear()
+        self.client.recorder.reset()
+
+        start = time.time()
+        for _ in range(iterations):
+            for method, path in PROBES:
+                self.probe(method, path)
+        return time.time() - start
+
+    def rows(self) -> List[Dict[str, float]]:
+        rows = []
+        for method, path in PROBES:
+            key = f"{method} {path.replace(SAMPLE_ID, ':id')}"
+            dispatch = self.dispatch_us.get(key)
+            if not dispatch:
+                continue
+            total = self.total_us[key]
+            rows.append({
+                "route": key,
+                "count": dispatch.total,
+                "dispatch_p50_us": dispatch.percentile(50),
+                "dispatch_p99_us": dispatch.percentile(99),
+                "dispatch_max_us": dispatch.max,
+                "total_p50_us": total.percentile(50),
+                "total_p99_us": total.percentile(99)
+            })
+        return rows
+
+    def print_report(self, elapsed: float):
+        rows = self.rows()
+        print("\n" + "=" * 80)
+        print("🧭 ROUTE DISPATCH BENCHMARK")
+        print("=" * 80)
+        if self.missing_header:
+            print(f"⚠️  {self.missing_header} responses had no Server-Timing dispatch entry")
+        if not rows:
+            print("❌ No dispatch timings collected")
+            return
+        print(f"{'Route':<32} {'Count':>6} {'disp p50 µs':>12} {'disp p99 µs':>12} {'disp max µs':>12} {'total p50 µs':>13}")
+        print("-" * 92)
+        for row in rows:
+            print(f"{row['route']:<32} {row['count']:>6} {row['dispatch_p50_us']:>12} {row['dispatch_p99_us']:>12} "
+                  f"{row['dispatch_max_us']:>12} {row['total_p50_us']:>13}")
+
+        first, last = rows[0], rows[-1]
+        print(f"\nFirst route ({first['route']}) p50: {first['dispatch_p50_us']} µs; "
+              f"last route ({last['route']}) p50: {last['dispatch_p50_us']} µs")
+        print(f"Elapsed: {elapsed:.1f}s")
+        self.client.print_connection_stats()
+        self.client.recorder.print_summary()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure per-route dispatch overhead of the API catch-all route")
+    parser.add_argument("--base-url", default="http://localhost:3000")
+    parser.add_argument("--iterations", type=int, default=200, help="probes per route")
+    parser.add_argument("--warmup", type=int, default=20, help="unrecorded probes per route before measuring")
+    parser.add_argument("--out", help="write the per-route dispatch rows to this JSON file")
+    add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    benchmark = DispatchBenchmark(args.base_url)
+    elapsed = benchmark.run(args.iterations, args.warmup)
+    benchmark.print_report(elapsed)
+
+    if args.out:
+        with open(args.out, "w") as handle:
+            json.dump({"routes": benchmark.rows()}, handle, indent=2)
+        print(f"📝 Dispatch timings written to {args.out}")
+
+    success = bool(benchmark.rows())
+    if args.baseline:
+        success = check_against_baseline(benchmark.client.recorder.rows(), args.baseline,
+                                         args.max_regression, args.accept_baseline) and success
+    exit(0 if success else 1)
@@ -3,15 +3,10 @@
 Fix skills by removing level field directly from MongoDB
 """
 
-from pymongo import MongoClient
-import os
+from migrations import bump_version, connect, sample_matching
 
-# Connect to MongoDB
-mongo_url = os.getenv('MONGO_URL', 'mongodb://localhost:27017')
-db_name = os.getenv('DB_NAME', 'mspndev')
-
-client = MongoClient(mongo_url)
-db = client[db_name]
+# Connect to MongoDB (same MONGO_URL / DB_NAME defaults as migrations.py)
+client, db = connect()
 skills_collection = db['skills']
 
 # Remove level field from all skills
@@ -21,15 +16,19 @@ result = skills_collection.update_many(
 )
 
 print(f"Updated {result.modified_count} skills to remove level field")
+if result.modified_count:
+    # Public ETags are built from version stamps; without this clients keep the old skills
+    bump_version(db, 'skills')
 
-# Verify the fix
-skills = list(skills_collection.find({}))
-has_level = any("level" in skill for skill in skills)
-print(f"Skills still have level field: {has_level}")
+# Verify the fix server-side instead of loading every skill into memory
+remaining = skills_collection.count_documents({"level": {"$exists": True}})
+print(f"Skills still with level field: {remaining}")
 
-if not has_level:
+if remaining == 0:
     print("✅ All skills fixed - no level fields remaining")
 else:
     print("❌ Some skills still have level fields")
+    for skill in sample_matching(skills_collection, {"level": {"$exists": True}}, {"_id": 0, "id": 1, "name": 1}):
+        print(f"  • {skill.get('name')} ({skill.get('id')})")
 
 client.close()
\ No newline at end of file
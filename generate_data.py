@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Synthetic data generator for realistic-scale load and benchmark runs
+Bulk-inserts documents straight into MongoDB using the same shapes route.js writes:
+- chats: conversation summaries plus long message histories in chat_messages buckets
+- projects: public and private projects spread across admins
+- private_storage: notes and files with realistic visibleTo lists
+
+Every generated document carries synthetic: true so it can be removed with --purge.
+Inserting or purging projects bumps their version stamp so public ETags change.
+
+Usage:
+    python generate_data.py --chats 5000 --messages 80 --projects 20000 --storage 20000
+    python generate_data.py --purge
+"""
+
+import argparse
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List
+
+from migrations import CHAT_BUCKET_SIZE, bump_version, connect
+
+DEFAULT_BATCH_SIZE = 1000
+
+FIRST_NAMES = ["John", "Priya", "Mei", "Carlos", "Amara", "Lukas", "Sofia", "Omar", "Hana", "Daniel"]
+LAST_NAMES = ["Doe", "Sharma", "Chen", "Garcia", "Okafor", "Muller", "Rossi", "Haddad", "Sato", "Smith"]
+TECHNOLOGIES = ["React", "Next.js", "Node.js", "MongoDB", "Python", "Vue.js", "Tailwind", "Docker", "AWS", "GraphQL"]
+TAGS = ["client", "invoice", "draft", "design", "contract", "notes", "research", "internal", "archive"]
+WORDS = ("hello we would like a quote for a website redesign with booking and payments can you share "
+         "timeline pricing and examples of similar projects thanks for the quick reply").split()
+
+SYNTHETIC_COLLECTIONS = ["chats", "chat_messages", "projects", "private_storage"]
+
+
+def sentence(rng: random.Random, low: int = 4, high: int = 30) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high))).capitalize() + "."
+
+
+def message_count(rng: random.Random, mean: int) -> int:
+    """Long-tailed message counts: most conversations are short, a few are very long"""
+    return max(1, int(rng.expovariate(1.0 / mean)))
+
+
+def build_chat(rng: random.Random, index: int, mean_messages: int, now: datetime) -> List[Dict[str, Any]]:
+    """One conversation summary followed by its message buckets, as lib/chat-store.js writes them"""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    created_at = now - timedelta(days=rng.uniform(0, 365))
+    timestamp = created_at
+    messages = []
+    sender = "customer"
+    for seq in range(1, message_count(rng, mean_messages) + 1):
+        timestamp = min(timestamp + timedelta(minutes=rng.uniform(1, 600)), now)
+        messages.append({
+            "id": str(uuid.uuid4()),
+            "sender": sender,
+            "message": sentence(rng),
+            "timestamp": timestamp,
+            "read": True,
+            "seq": seq
+        })
+        if rng.random() < 0.6:
+            sender = "admin" if sender == "customer" else "customer"
+
+    # Trailing customer messages the admin has not opened yet
+    unread = 0
+    for message in reversed(messages):
+        if message["sender"] != "customer" or rng.random() < 0.5:
+            break
+        message["read"] = False
+        unread += 1
+
+    chat_id = str(uuid.uuid4())
+    summary = {
+        "id": chat_id,
+        "customerName": name,
+        "customerEmail": f"synthetic-{index}@example.com",
+        "customerPhone": f"+1555{index:07d}" if rng.random() < 0.7 else "",
+        "unreadCount": unread,
+        "messageCount": len(messages),
+        "storedSeq": len(messages),
+        "lastMessage": messages[-1],
+        "createdAt": created_at,
+        "lastMessageAt": timestamp,
+        "synthetic": True
+    }
+    buckets = [
+        {
+            "chatId": chat_id,
+            "bucket": start // CHAT_BUCKET_SIZE,
+            "count": len(messages[start:start + CHAT_BUCKET_SIZE]),
+            "messages": messages[start:start + CHAT_BUCKET_SIZE],
+            "synthetic": True
+        }
+        for start in range(0, len(messages), CHAT_BUCKET_SIZE)
+    ]
+    return [summary] + buckets
+
+
+def build_project(rng: random.Random, index: int, admins: List[str], now: datetime) -> Dict[str, Any]:
+    return {
+        "id": str(uuid.uuid4()),
+        "title": f"Synthetic Project {index}",
+        "description": sentence(rng, 10, 60),
+        "image": "",
+        "techStack": rng.sample(TECHNOLOGIES, rng.randint(1, 5)),
+        "githubLink": f"https://github.com/example/project-{index}" if rng.random() < 0.5 else "",
+        "demoLink": f"https://project-{index}.example.com" if rng.random() < 0.3 else "",
+        "isPrivate": rng.random() < 0.4,
+        "createdBy": rng.choice(admins),
+        "order": rng.randint(1, 999),
+        "createdAt": now - timedelta(days=rng.uniform(0, 730)),
+        "synthetic": True
+    }
+
+
+def build_storage_item(rng: random.Random, index: int, admins: List[str], now: datetime) -> Dict[str, Any]:
+    created_by = rng.choice(admins)
+    others = [admin for admin in admins if admin != created_by]
+    # Most items are private to the creator; some are shared with a handful of admins
+    shared = rng.sample(others, min(len(others), rng.choice([0, 0, 0, 1, 2, 3, 5])))
+    is_file = rng.random() < 0.3
+    created_at = now - timedelta(days=rng.uniform(0, 730))
+    return {
+        "id": str(uuid.uuid4()),
+        "title": f"Synthetic Item {index}",
+        "content": sentence(rng, 20, 200),
+        "type": "file" if is_file else "note",
+        "fileUrl": f"/uploads/synthetic-{index}.pdf" if is_file else "",
+        "fileName": f"synthetic-{index}.pdf" if is_file else "",
+        "tags": rng.sample(TAGS, rng.randint(0, 3)),
+        "visibleTo": shared,
+        "createdBy": created_by,
+        "createdAt": created_at,
+        "updatedAt": created_at + timedelta(days=rng.uniform(0, 30)),
+        "synthetic": True
+    }
+
+
+def chunked(docs: Iterator[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch = []
+    for doc in docs:
+        batch.append(doc)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def insert_generated(collection, docs: Iterator[Dict[str, Any]], total: int, batch_size: int) -> int:
+    inserted = 0
+    start = time.time()
+    for batch in chunked(docs, batch_size):
+        collection.insert_many(batch, ordered=False)
+        inserted += len(batch)
+        print(f"  {collection.name}: {inserted}/{total}", end="\r")
+    elapsed = time.time() - start
+    print(f"✅ {collection.name}: inserted {inserted} documents in {elapsed:.1f}s")
+    return inserted
+
+
+def insert_chats(db, rng: random.Random, count: int, offset: int, mean_messages: int, now: datetime,
+                 batch_size: int) -> int:
+    """Insert summaries into chats and their buckets into chat_messages, batch by batch"""
+    inserted = 0
+    start = time.time()
+    for first in range(0, count, batch_size):
+        summaries, buckets = [], []
+        for i in range(first, min(first + batch_size, count)):
+            summary, *chat_buckets = build_chat(rng, offset + i, mean_messages, now)
+            summaries.append(summary)
+            buckets.extend(chat_buckets)
+        db["chat_messages"].insert_many(buckets, ordered=False)
+        db["chats"].insert_many(summaries, ordered=False)
+        inserted += len(summaries)
+        print(f"  chats: {inserted}/{count}", end="\r")
+    print(f"✅ chats: inserted {inserted} conversations in {time.time() - start:.1f}s")
+    return inserted
+
+
+def admin_usernames(db, count: int) -> List[str]:
+    """Real admin usernames plus synthetic ones, so ACL filters see both"""
+    usernames = [admin["username"] for admin in db["admins"].find({}, {"_id": 0, "username": 1})]
+    usernames += [f"synthetic-admin-{i}" for i in range(max(0, count - len(usernames)))]
+    return usernames
+
+
+def purge(db):
+    for name in SYNTHETIC_COLLECTIONS:
+        result = db[name].delete_many({"synthetic": True})
+        print(f"🗑️  {name}: removed {result.deleted_count} synthetic documents")
+        if name == "projects" and result.deleted_count:
+            bump_version(db, name)
+
+
+def generate(db, chats: int, mean_messages: int, projects: int, storage: int, admins: int,
+             batch_size: int = DEFAULT_BATCH_SIZE, seed: int = 42):
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    usernames = admin_usernames(db, admins)
+    # Continue numbering after existing synthetic chats so customerEmail stays unique
+    offset = db["chats"].count_documents({"synthetic": True})
+
+    print(f"🏭 Generating data with {len(usernames)} admin usernames (seed {seed})")
+    if chats:
+        insert_chats(db, rng, chats, offset, mean_messages, now, max(1, batch_size // 10))
+    if projects:
+        insert_generated(db["projects"], (build_project(rng, i, usernames, now) for i in range(projects)),
+                         projects, batch_size)
+        bump_version(db, "projects")
+    if storage:
+        insert_generated(db["private_storage"], (build_storage_item(rng, i, usernames, now) for i in range(storage)),
+                         storage, batch_size)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-insert synthetic chats, projects and storage items")
+    parser.add_argument("--chats", type=int, default=1000, help="number of conversations")
+    parser.add_argument("--messages", type=int, default=50, help="mean messages per conversation")
+    parser.add_argument("--projects", type=int, default=10000)
+    parser.add_argument("--storage", type=int, default=10000)
+    parser.add_argument("--admins", type=int, default=20, help="admin usernames to spread ownership over")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--purge", action="store_true", help="remove all synthetic documents and exit")
+    args = parser.parse_args()
+
+    client, db = connect()
+    try:
+        if args.purge:
+            purge(db)
+        else:
+            generate(db, args.chats, args.messages, args.projects, args.storage, args.admins,
+                     args.batch_size, args.seed)
+    finally:
+        client.close()
@@ -0,0 +1,34 @@
+// Next.js calls register() once when a server instance starts
+export async function register() {
+  if (process.env.NEXT_RUNTIME !== 'nodejs') {
+    return;
+  }
+
+  const { warmUp } = await import('./lib/mongodb');
+  if (process.env.MONGO_WARMUP !== 'false') {
+    try {
+      const warmup = process.env.MONGO_WARMUP_CONNECTIONS;
+      const { connections, ms } = await warmUp(warmup ? parseInt(warmup, 10) : undefined);
+      console.log(`MongoDB pool warmed: ${connections} connections in ${ms.toFixed(0)}ms`);
+    } catch (error) {
+      // Requests will connect on demand
+      console.error('MongoDB warm-up failed:', error.message);
+    }
+  }
+
+  if (process.env.BOOTSTRAP_ON_START === 'false') {
+    return;
+  }
+
+  const { bootstrap } = await import('./lib/bootstrap');
+  try {
+    for (const { collection, status, inserted } of await bootstrap()) {
+      if (status === 'seeded') {
+        console.log(`Bootstrap: seeded ${inserted} default ${collection} records`);
+      }
+    }
+  } catch (error) {
+    // The API still serves; run bootstrap_data.py once the database is reachable
+    console.error('Bootstrap failed:', error.message);
+  }
+}
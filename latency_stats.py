@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Per-endpoint latency histograms for the backend test harnesses
+Every request sent through api_client.ApiClient is recorded here with its
+wall time, response size and status, keyed by method and route template
+(e.g. "GET /projects", "POST /chat/{id}/reply"), and can be dumped as
+JSON or CSV at the end of a run.
+"""
+
+import csv
+import json
+import math
+import re
+import threading
+from typing import Any, Dict, List, Tuple
+
+UUID_SEGMENT = re.compile(r"/[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE)
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def route_key(method: str, endpoint: str) -> str:
+    """Collapse an endpoint to its route template, e.g. PUT /skills/{id}"""
+    path = endpoint.split("?", 1)[0]
+    path = UUID_SEGMENT.sub("/{id}", path)
+    return f"{method.upper()} {path}"
+
+
+class Histogram:
+    """Log-linear (HDR-style) histogram of non-negative integer values.
+
+    Values below 2**sub_bucket_bits are counted exactly; above that each
+    power-of-two range is split into 2**(sub_bucket_bits - 1) linear buckets,
+    so the relative error stays under 1 / 2**(sub_bucket_bits - 1) at any
+    magnitude while memory stays proportional to the number of distinct buckets.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 8):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.half_count = self.sub_bucket_count >> 1
+        self.counts: Dict[int, int] = {}
+        self.total = 0
+        self.min = None
+        self.max = 0
+        self.sum = 0
+
+    def _index(self, value: int) -> int:
+        if value < self.sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits
+        return shift * self.half_count + (value >> shift)
+
+    def _highest_equivalent(self, index: int) -> int:
+        if index < self.sub_bucket_count:
+            return index
+        shift = index // self.half_count - 1
+        mantissa = index - shift * self.half_count
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, value: int, count: int = 1):
+        value = max(int(value), 0)
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.total += count
+        self.sum += value * count
+        self.max = max(self.max, value)
+        self.min = value if self.min is None else min(self.min, value)
+
+    def merge(self, other: "Histogram"):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total += other.total
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+
+    def percentile(self, pct: float) -> int:
+        if not self.total:
+            return 0
+        target = max(1, math.ceil(pct / 100.0 * self.total))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._highest_equivalent(index), self.max)
+        return self.max
+
+    def mean(self) -> float:
+        return self.sum / self.total if self.total else 0.0
+
+    def buckets(self) -> List[List[int]]:
+        """[highest equivalent value, count] pairs in ascending order"""
+        return [[self._highest_equivalent(index), self.counts[index]] for index in sorted(self.counts)]
+
+
+class RouteStats:
+    def __init__(self):
+        self.latency_us = Histogram()
+        self.bytes_total = 0
+        self.bytes_max = 0
+        self.statuses: Dict[int, int] = {}
+
+    @property
+    def count(self) -> int:
+        return self.latency_us.total
+
+    @property
+    def errors(self) -> int:
+        # status 0 means the request never got a response (timeout, refused, ...)
+        return sum(n for status, n in self.statuses.items() if status == 0 or status >= 400)
+
+
+class LatencyRecorder:
+    """Thread-safe per-route latency, size and status collection"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes: Dict[str, RouteStats] = {}
+
+    def record(self, method: str, endpoint: str, elapsed_ms: float, size: int, status: int):
+        key = route_key(method, endpoint)
+        with self.lock:
+            stats = self.routes.get(key)
+            if stats is None:
+                stats = self.routes[key] = RouteStats()
+            stats.latency_us.record(int(elapsed_ms * 1000))
+            stats.bytes_total += size
+            stats.bytes_max = max(stats.bytes_max, size)
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+
+    def totals(self, method: str, endpoint: str) -> Tuple[int, int]:
+        """(requests, summed latency in µs) recorded so far for the endpoint's route"""
+        with self.lock:
+            stats = self.routes.get(route_key(method, endpoint))
+            return (stats.count, stats.latency_us.sum) if stats else (0, 0)
+
+    def reset(self):
+        with self.lock:
+            self.routes = {}
+
+    def rows(self) -> List[Dict[str, Any]]:
+        rows = []
+        with self.lock:
+            for key in sorted(self.routes):
+                stats = self.routes[key]
+                hist = stats.latency_us
+                row = {
+                    "route": key,
+                    "count": stats.count,
+                    "errors": stats.errors,
+                    "mean_ms": round(hist.mean() / 1000, 3),
+                    "min_ms": round((hist.min or 0) / 1000, 3),
+                    "max_ms": round(hist.max / 1000, 3),
+                    "bytes_mean": round(stats.bytes_total / stats.count) if stats.count else 0,
+                    "bytes_max": stats.bytes_max,
+                    "statuses": {str(status): n for status, n in sorted(stats.statuses.items())}
+                }
+                for pct in PERCENTILES:
+                    row[f"p{pct}_ms"] = round(hist.percentile(pct) / 1000, 3)
+                rows.append(row)
+        return rows
+
+    def to_dict(self) -> Dict[str, Any]:
+        rows = self.rows()
+        with self.lock:
+            for row in rows:
+                row["histogram_us"] = self.routes[row["route"]].latency_us.buckets()
+        return {"routes": rows}
+
+    def dump(self, path: str):
+        """Write the collected stats as CSV when path ends in .csv, JSON otherwise"""
+        if path.lower().endswith(".csv"):
+            rows = self.rows()
+            fields = ["route", "count", "errors", "mean_ms", "min_ms"] + \
+                     [f"p{pct}_ms" for pct in PERCENTILES] + ["max_ms", "bytes_mean", "bytes_max", "statuses"]
+            with open(path, "w", newline="") as handle:
+                writer = csv.DictWriter(handle, fieldnames=fields)
+                writer.writeheader()
+                for row in rows:
+                    row["statuses"] = " ".join(f"{status}:{n}" for status, n in row["statuses"].items())
+                    writer.writerow(row)
+        else:
+            with open(path, "w") as handle:
+                json.dump(self.to_dict(), handle, indent=2)
+
+    def print_summary(self):
+        rows = self.rows()
+        if not rows:
+            return
+        print(f"\n{'Route':<32} {'Count':>6} {'Err':>4} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'avg KB':>7}")
+        print("-" * 88)
+        for row in rows:
+            print(f"{row['route']:<32} {row['count']:>6} {row['errors']:>4} {row['p50_ms']:>8.1f} "
+                  f"{row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['max_ms']:>8.1f} {row['bytes_mean'] / 1024:>7.1f}")
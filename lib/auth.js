@@ -1,14 +1,28 @@
 import jwt from 'jsonwebtoken';
-import bcrypt from 'bcryptjs';
+import { createHash } from 'crypto';
+import { createCache } from './cache';
+import { hashInPool, compareInPool } from './password-pool';
 
 const JWT_SECRET = process.env.JWT_SECRET || 'promptforge_secret_key';
 
+// Recently verified tokens, keyed by their SHA-256 so raw tokens are never held
+// as keys. Entries expire at the token's exp (or AUTH_CACHE_TTL_MS, if sooner),
+// so a hit never accepts a token jwt.verify would now reject as expired.
+// AUTH_CACHE_SIZE=0 disables the cache.
+const tokenCache = createCache({
+  maxEntries: parseInt(process.env.AUTH_CACHE_SIZE || '1000', 10),
+  ttlMs: parseInt(process.env.AUTH_CACHE_TTL_MS || '600000', 10)
+});
+
+const authStats = { hits: 0, misses: 0, invalid: 0, hitUs: 0, missUs: 0 };
+
+// bcrypt runs on the lib/password-pool.js worker threads, never on the event loop
 export function hashPassword(password) {
-  return bcrypt.hashSync(password, 10);
+  return hashInPool(password, 10);
 }
 
 export function comparePassword(password, hash) {
-  return bcrypt.compareSync(password, hash);
+  return compareInPool(password, hash);
 }
 
 export function generateToken(payload) {
@@ -16,11 +30,44 @@ export function generateToken(payload) {
 }
 
 export function verifyToken(token) {
+  const start = performance.now();
+  const key = createHash('sha256').update(token).digest('base64');
+  const cached = tokenCache.get(key);
+  if (cached) {
+    authStats.hits++;
+    authStats.hitUs += (performance.now() - start) * 1000;
+    return cached;
+  }
+
+  let decoded;
   try {
-    return jwt.verify(token, JWT_SECRET);
+    decoded = Object.freeze(jwt.verify(token, JWT_SECRET));
   } catch (error) {
+    authStats.invalid++;
     return null;
   }
+  tokenCache.set(key, decoded, [], decoded.exp ? decoded.exp * 1000 : Infinity);
+  authStats.misses++;
+  authStats.missUs += (performance.now() - start) * 1000;
+  return decoded;
+}
+
+export function authCacheStats() {
+  const { hits, misses, invalid, hitUs, missUs } = authStats;
+  const { size, maxEntries, ttlMs, evictions, expirations } = tokenCache.stats();
+  return {
+    hits,
+    misses,
+    invalid,
+    hitRate: hits + misses ? hits / (hits + misses) : 0,
+    avgHitUs: hits ? hitUs / hits : 0,
+    avgMissUs: misses ? missUs / misses : 0,
+    size,
+    maxEntries,
+    ttlMs,
+    evictions,
+    expirations
+  };
 }
 
 export function getAuthUser(request) {
@@ -0,0 +1,62 @@
+import defaults from './defaults.json';
+import { connectToDatabase, ensureIndexes } from './mongodb';
+import { bumpVersion } from './versions';
+
+// One-time seeding of the default records in lib/defaults.json, run at server
+// start (instrumentation.js) or via bootstrap_data.py. Per collection:
+// - a marker in bootstrap ({ id: collectionName }) means it was handled; skip
+// - a collection that already has documents only gets the marker
+// - otherwise defaults are upserted by their fixed ids with $setOnInsert
+// Fixed ids plus the id_unique indexes make concurrent runs converge on one
+// copy of each default, and the marker stops a default an admin deleted from
+// coming back on the next start.
+export async function bootstrapCollection(db, collectionName, records) {
+  const markers = db.collection('bootstrap');
+  if (await markers.findOne({ id: collectionName })) {
+    return { collection: collectionName, status: 'skipped', inserted: 0 };
+  }
+
+  const collection = db.collection(collectionName);
+  let inserted = 0;
+  if (!(await collection.findOne({}, { projection: { _id: 1 } }))) {
+    try {
+      const result = await collection.bulkWrite(
+        records.map(record => ({
+          updateOne: { filter: { id: record.id }, update: { $setOnInsert: record }, upsert: true }
+        })),
+        { ordered: false }
+      );
+      inserted = result.upsertedCount;
+    } catch (error) {
+      // A concurrent run upserted the same ids first; its copies stand
+      if (error.code !== 11000) throw error;
+      inserted = error.result?.upsertedCount || 0;
+    }
+  }
+
+  try {
+    await markers.updateOne(
+      { id: collectionName },
+      { $setOnInsert: { id: collectionName, seededAt: new Date(), inserted } },
+      { upsert: true }
+    );
+  } catch (error) {
+    if (error.code !== 11000) throw error;
+  }
+  if (inserted > 0) {
+    await bumpVersion(collectionName);
+  }
+  return { collection: collectionName, status: inserted > 0 ? 'seeded' : 'existing', inserted };
+}
+
+export async function bootstrap() {
+  const { db } = await connectToDatabase();
+  // The unique indexes must exist before seeding relies on them
+  await ensureIndexes(db);
+
+  const results = [];
+  for (const [collectionName, records] of Object.entries(defaults)) {
+    results.push(await bootstrapCollection(db, collectionName, records));
+  }
+  return results;
+}
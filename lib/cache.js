@@ -0,0 +1,94 @@
+// Bounded in-process read-through cache. Entries expire after ttlMs and the least
+// recently used entry is evicted beyond maxEntries (a Map iterates in insertion
+// order, so re-inserting on every hit keeps the oldest key first). Each entry is
+// tagged with the collections it was built from; writes call invalidate(tag).
+// Invalidation is per process: other instances converge within ttlMs.
+export function createCache({ maxEntries = 100, ttlMs = 30000 } = {}) {
+  const entries = new Map();
+  const inflight = new Map();
+  const stats = { hits: 0, misses: 0, evictions: 0, expirations: 0, invalidations: 0 };
+  // Bumped by every invalidation; a load that started before one is not stored
+  let generation = 0;
+
+  function get(key) {
+    const entry = entries.get(key);
+    if (!entry) return undefined;
+    if (entry.expiresAt <= Date.now()) {
+      entries.delete(key);
+      stats.expirations++;
+      return undefined;
+    }
+    entries.delete(key);
+    entries.set(key, entry);
+    return entry.value;
+  }
+
+  // expiresAt (ms since epoch) can shorten an entry's life below ttlMs
+  function set(key, value, tags = [], expiresAt = Infinity) {
+    if (ttlMs <= 0 || maxEntries <= 0) return;
+    entries.delete(key);
+    entries.set(key, { value, tags, expiresAt: Math.min(Date.now() + ttlMs, expiresAt) });
+    while (entries.size > maxEntries) {
+      entries.delete(entries.keys().next().value);
+      stats.evictions++;
+    }
+  }
+
+  // Cached value for key, or load() once for all concurrent callers on a miss
+  async function wrap(key, tags, load) {
+    const cached = get(key);
+    if (cached !== undefined) {
+      stats.hits++;
+      return cached;
+    }
+    stats.misses++;
+    if (inflight.has(key)) return inflight.get(key);
+
+    const startedAt = generation;
+    const pending = load()
+      .then(value => {
+        if (generation === startedAt) set(key, value, tags);
+        return value;
+      })
+      .finally(() => {
+        if (inflight.get(key) === pending) inflight.delete(key);
+      });
+    inflight.set(key, pending);
+    return pending;
+  }
+
+  function invalidate(tag) {
+    generation++;
+    stats.invalidations++;
+    inflight.clear();
+    for (const [key, entry] of entries) {
+      if (entry.tags.includes(tag)) entries.delete(key);
+    }
+  }
+
+  function clear() {
+    generation++;
+    inflight.clear();
+    entries.clear();
+  }
+
+  function getStats() {
+    const lookups = stats.hits + stats.misses;
+    return {
+      ...stats,
+      hitRate: lookups ? stats.hits / lookups : 0,
+      size: entries.size,
+      maxEntries,
+      ttlMs
+    };
+  }
+
+  return { get, set, wrap, invalidate, clear, stats: getStats };
+}
+
+// Shared cache for small public collections (site content, contact info, skills, services).
+// READ_CACHE_TTL_MS=0 disables it.
+export const readCache = createCache({
+  maxEntries: parseInt(process.env.READ_CACHE_MAX_ENTRIES || '100', 10),
+  ttlMs: parseInt(process.env.READ_CACHE_TTL_MS || '30000', 10)
+});
@@ -0,0 +1,47 @@
+import { EventEmitter } from 'events';
+
+// In-process fan-out of stored chat messages to open GET /chat/stream connections.
+// Listeners are keyed by conversation id, so a publish costs one Map lookup no
+// matter how many streams are idle. This only reaches streams held by the same
+// server process: with several instances, a reply written on one never reaches a
+// stream held open on another. ChatWidget therefore keeps a slow ?since= poll
+// running next to its stream, which bounds that delay to the poll interval.
+const emitter = new EventEmitter();
+emitter.setMaxListeners(0);
+
+const MAX_STREAMS = parseInt(process.env.CHAT_STREAM_MAX || '10000', 10);
+
+const stats = {
+  open: 0,
+  opened: 0,
+  rejected: 0,
+  published: 0
+};
+
+export function publishMessage(chatId, message) {
+  stats.published++;
+  emitter.emit(chatId, message);
+}
+
+// Register a stream for chatId; returns an unsubscribe function, or null when at capacity
+export function subscribe(chatId, listener) {
+  if (stats.open >= MAX_STREAMS) {
+    stats.rejected++;
+    return null;
+  }
+  stats.open++;
+  stats.opened++;
+  emitter.on(chatId, listener);
+
+  let active = true;
+  return () => {
+    if (!active) return;
+    active = false;
+    stats.open--;
+    emitter.off(chatId, listener);
+  };
+}
+
+export function streamStats() {
+  return { ...stats, max: MAX_STREAMS, conversations: emitter.eventNames().length };
+}
@@ -0,0 +1,273 @@
+import { v4 as uuidv4 } from 'uuid';
+import { getCollection } from './mongodb';
+import { publishMessage } from './chat-events';
+
+// Chat messages live in fixed-size buckets ({ chatId, bucket, count, messages })
+// in chat_messages; chats holds one compact summary per conversation. Each
+// message gets a per-conversation sequence number from an atomic $inc on the
+// summary, which also decides its bucket, so buckets never exceed BUCKET_SIZE.
+//
+// Concurrent appends can finish their bucket writes out of order, so readers
+// never trust messageCount as a cursor. storedSeq on the summary is the highest
+// seq below which every message is stored; it only moves forward over a
+// contiguous run, and only that run is published, so a client that advances
+// its cursor past seq N has already been given every message up to N.
+//
+// An append can die between the $inc and its bucket write. A bucket write that
+// fails is retried once and otherwise leaves a tombstone for its seq, and a seq
+// that never arrives is skipped once a later message is older than
+// CHAT_LOST_APPEND_GRACE_MS, so one lost append cannot hold back the rest.
+export const BUCKET_SIZE = 50;
+const LOST_APPEND_GRACE_MS = parseInt(process.env.CHAT_LOST_APPEND_GRACE_MS || '30000', 10);
+
+export function bucketFor(seq) {
+  return Math.floor((seq - 1) / BUCKET_SIZE);
+}
+
+// Highest seq a reader may be shown; summaries written before storedSeq had every counted message stored
+export function storedSeq(chat) {
+  return chat.storedSeq ?? chat.messageCount ?? 0;
+}
+
+export function newMessage(sender, message) {
+  return {
+    id: uuidv4(),
+    sender,
+    message,
+    timestamp: new Date(),
+    read: false
+  };
+}
+
+function isDuplicateKeyError(error) {
+  const writeErrors = error.writeErrors ? [].concat(error.writeErrors) : [];
+  return writeErrors.length ? writeErrors.every(e => e.code === 11000) : error.code === 11000;
+}
+
+// Idempotent: a seq already in its bucket is never pushed twice, so a retried write is safe
+async function addToBucket(chatId, message) {
+  const buckets = await getCollection('chat_messages');
+  const bucket = bucketFor(message.seq);
+  const filter = { chatId, bucket, 'messages.seq': { $ne: message.seq } };
+  const update = {
+    $push: { messages: { $each: [message], $sort: { seq: 1 } } },
+    $inc: { count: 1 },
+    $setOnInsert: { chatId, bucket }
+  };
+  try {
+    await buckets.updateOne(filter, update, { upsert: true });
+  } catch (error) {
+    // Two writers raced to create the same bucket (or the seq is already stored);
+    // the plain update either adds the message or matches nothing
+    if (!isDuplicateKeyError(error)) throw error;
+    await buckets.updateOne(filter, update);
+  }
+}
+
+async function storeMessage(chatId, message) {
+  try {
+    await addToBucket(chatId, message);
+  } catch (error) {
+    try {
+      await addToBucket(chatId, message);
+    } catch {
+      // Close the seq so storedSeq can move past it, then report the failed append
+      const tombstone = { id: message.id, seq: message.seq, timestamp: message.timestamp, tombstone: true };
+      await addToBucket(chatId, tombstone).catch(() => {});
+      await advanceStoredSeq(chatId).catch(() => {});
+      throw error;
+    }
+  }
+}
+
+// Move a pre-bucket conversation's embedded messages array into buckets.
+// $setOnInsert never overwrites a bucket that already exists, so concurrent
+// upgrades (or one racing a new append) cannot lose messages. Two upserts of
+// the same bucket can still race to insert it; the loser's duplicate-key error
+// means that bucket is already in place.
+export async function upgradeLegacyChat(chat) {
+  if (!chat || !Array.isArray(chat.messages)) return chat;
+
+  const messages = chat.messages.map((m, i) => ({ ...m, seq: i + 1 }));
+  const buckets = await getCollection('chat_messages');
+  const ops = [];
+  for (let start = 0; start < messages.length; start += BUCKET_SIZE) {
+    const slice = messages.slice(start, start + BUCKET_SIZE);
+    const bucket = bucketFor(slice[0].seq);
+    ops.push({
+      updateOne: {
+        filter: { chatId: chat.id, bucket },
+        update: { $setOnInsert: { chatId: chat.id, bucket, count: slice.length, messages: slice } },
+        upsert: true
+      }
+    });
+  }
+  if (ops.length) {
+    try {
+      await buckets.bulkWrite(ops, { ordered: false });
+    } catch (error) {
+      if (!isDuplicateKeyError(error)) throw error;
+    }
+  }
+
+  const chats = await getCollection('chats');
+  await chats.updateOne(
+    { id: chat.id, messages: { $exists: true } },
+    {
+      $set: {
+        messageCount: messages.length,
+        storedSeq: messages.length,
+        lastMessage: messages[messages.length - 1] || null
+      },
+      $unset: { messages: '' }
+    }
+  );
+  return chats.findOne({ id: chat.id });
+}
+
+export async function findConversation(query) {
+  const chats = await getCollection('chats');
+  const chat = await upgradeLegacyChat(await chats.findOne(query));
+  // storedSeq only lags while appends are in flight, or when one was lost and
+  // its grace period may have run out; a reader settles it in that case
+  if (chat && storedSeq(chat) < (chat.messageCount || 0)) {
+    return { ...chat, ...(await advanceStoredSeq(chat.id)) };
+  }
+  return chat;
+}
+
+export async function createConversation(fields, message) {
+  const chats = await getCollection('chats');
+  const first = { ...message, seq: 1 };
+  const summary = {
+    id: uuidv4(),
+    ...fields,
+    unreadCount: message.sender === 'customer' ? 1 : 0,
+    messageCount: 1,
+    storedSeq: 1,
+    lastMessage: first,
+    createdAt: new Date(),
+    lastMessageAt: first.timestamp
+  };
+  await chats.insertOne(summary);
+  await addToBucket(summary.id, first);
+  return summary;
+}
+
+// Raise storedSeq over every message stored contiguously after it and publish
+// that run in order. Every append calls this after its own bucket write, so the
+// append that fills a gap also releases the messages stored behind it. Tombstones
+// count as stored but are not published.
+async function advanceStoredSeq(chatId) {
+  const chats = await getCollection('chats');
+  for (;;) {
+    const chat = await chats.findOne(
+      { id: chatId },
+      { projection: { _id: 0, storedSeq: 1, messageCount: 1, lastMessage: 1 } }
+    );
+    if (!chat) return {};
+    const from = storedSeq(chat);
+    let to = from;
+    const run = [];
+    if (from < (chat.messageCount || 0)) {
+      const stored = await loadMessages(chatId, from, chat.messageCount, { tombstones: true });
+      for (const message of stored) {
+        // The missing seqs were allocated before this message's; once it is past the
+        // grace period their appends are taken as lost rather than still in flight
+        if (message.seq !== to + 1 && Date.now() - new Date(message.timestamp).getTime() < LOST_APPEND_GRACE_MS) {
+          break;
+        }
+        to = message.seq;
+        if (!message.tombstone) run.push(message);
+      }
+    }
+    if (to === from) {
+      return { storedSeq: from, lastMessage: chat.lastMessage };
+    }
+
+    const lastMessage = run.length ? run[run.length - 1] : chat.lastMessage;
+    const result = await chats.updateOne({ id: chatId, storedSeq: from }, { $set: { storedSeq: to, lastMessage } });
+    if (result.modifiedCount) {
+      for (const message of run) publishMessage(chatId, message);
+      return { storedSeq: to, lastMessage };
+    }
+    // Another append advanced it first; continue from where it stopped
+  }
+}
+
+// Append one message and apply extra summary changes ({ set, inc }); returns the updated summary
+export async function appendMessage(chatId, message, { set = {}, inc = {} } = {}) {
+  const chats = await getCollection('chats');
+  await upgradeLegacyChat(await chats.findOne({ id: chatId }, { projection: { id: 1, messages: 1 } }));
+
+  // A pipeline update so storedSeq is backfilled from the pre-increment messageCount
+  // in the same atomic step; $literal keeps caller values from being read as expressions
+  const fields = Object.fromEntries(Object.entries(set).map(([key, value]) => [key, { $literal: value }]));
+  const counters = Object.fromEntries(
+    Object.entries({ ...inc, messageCount: 1 }).map(([key, by]) => [key, { $add: [{ $ifNull: [`$${key}`, 0] }, by] }])
+  );
+  const updated = await chats.findOneAndUpdate(
+    { id: chatId },
+    [
+      { $set: { storedSeq: { $ifNull: ['$storedSeq', { $ifNull: ['$messageCount', 0] }] } } },
+      { $set: { ...fields, ...counters, lastMessageAt: { $literal: message.timestamp } } }
+    ],
+    { returnDocument: 'after' }
+  );
+  if (!updated) return null;
+
+  await storeMessage(chatId, { ...message, seq: updated.messageCount });
+  return { ...updated, ...(await advanceStoredSeq(chatId)) };
+}
+
+// Messages with sinceSeq < seq <= untilSeq, oldest first, reading only the buckets that can hold them
+export async function loadMessages(chatId, sinceSeq = 0, untilSeq = Infinity, { tombstones = false } = {}) {
+  const buckets = await getCollection('chat_messages');
+  const query = { chatId };
+  if (sinceSeq > 0 || untilSeq < Infinity) {
+    query.bucket = { $gte: bucketFor(sinceSeq + 1) };
+    if (untilSeq < Infinity) query.bucket.$lte = bucketFor(untilSeq);
+  }
+  const docs = await buckets.find(query, { projection: { _id: 0, messages: 1 } }).sort({ bucket: 1 }).toArray();
+  const messages = [];
+  for (const doc of docs) {
+    for (const message of doc.messages) {
+      if (message.tombstone && !tombstones) continue;
+      if (message.seq > sinceSeq && message.seq <= untilSeq) messages.push(message);
+    }
+  }
+  return messages;
+}
+
+// The summary plus its messages array, i.e. the pre-bucket conversation response shape
+export async function withMessages(summary, sinceSeq = 0) {
+  if (!summary) return summary;
+  return { ...summary, messages: await loadMessages(summary.id, sinceSeq, storedSeq(summary)) };
+}
+
+export async function markCustomerMessagesRead(chatId) {
+  const chats = await getCollection('chats');
+  const buckets = await getCollection('chat_messages');
+  await upgradeLegacyChat(await chats.findOne({ id: chatId }, { projection: { id: 1, messages: 1 } }));
+
+  await buckets.updateMany(
+    { chatId, messages: { $elemMatch: { sender: 'customer', read: false } } },
+    { $set: { 'messages.$[elem].read': true } },
+    { arrayFilters: [{ 'elem.sender': 'customer', 'elem.read': false }] }
+  );
+  await chats.updateOne(
+    { id: chatId },
+    [{
+      $set: {
+        unreadCount: 0,
+        lastMessage: {
+          $cond: [
+            { $eq: ['$lastMessage.sender', 'customer'] },
+            { $mergeObjects: ['$lastMessage', { read: true }] },
+            '$lastMessage'
+          ]
+        }
+      }
+    }]
+  );
+}
@@ -0,0 +1,28 @@
+// Conditional GET and Cache-Control for public reads whose ETag comes from
+// lib/versions.js. Cache lifetimes are configurable per deployment:
+//   CACHE_MAX_AGE                 browser freshness in seconds (default 0: always revalidate)
+//   CACHE_S_MAXAGE                shared cache (CDN) freshness in seconds (default 0)
+//   CACHE_STALE_WHILE_REVALIDATE  seconds a stale copy may be served while revalidating (default 30)
+const MAX_AGE = parseInt(process.env.CACHE_MAX_AGE || '0', 10);
+const S_MAXAGE = parseInt(process.env.CACHE_S_MAXAGE || '0', 10);
+const STALE_WHILE_REVALIDATE = parseInt(process.env.CACHE_STALE_WHILE_REVALIDATE || '30', 10);
+
+export const PUBLIC_CACHE_CONTROL =
+  `public, max-age=${MAX_AGE}, s-maxage=${S_MAXAGE}, stale-while-revalidate=${STALE_WHILE_REVALIDATE}`;
+
+// Responses that depend on the caller's token must never be stored by a shared cache
+export const PRIVATE_CACHE_CONTROL = 'private, no-cache';
+
+// True when If-None-Match lists etag (or *); W/ prefixes are ignored as RFC 9110 requires
+export function isNotModified(request, etag) {
+  const header = request.headers.get('if-none-match');
+  if (!header) return false;
+  if (header.trim() === '*') return true;
+  return header.split(',').some(candidate => candidate.trim().replace(/^W\//, '') === etag);
+}
+
+export function setCacheHeaders(response, etag, cacheControl = PUBLIC_CACHE_CONTROL) {
+  if (etag) response.headers.set('ETag', etag);
+  response.headers.set('Cache-Control', cacheControl);
+  return response;
+}
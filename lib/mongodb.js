@@ -1,30 +1,165 @@
 import { MongoClient } from 'mongodb';
+import indexDefinitions from './indexes.json';
 
 const uri = process.env.MONGO_URL;
 const dbName = process.env.DB_NAME || 'promptforge';
 
-let cachedClient = null;
-let cachedDb = null;
+function intFromEnv(name, fallback) {
+  const value = parseInt(process.env[name], 10);
+  return Number.isNaN(value) ? fallback : value;
+}
+
+// Pool sizing and timeouts are per server instance; tune MONGO_MAX_POOL_SIZE
+// against the checkout waits reported by poolStats() (GET /api/metrics).
+// zlib compression is built into the driver; snappy/zstd need their packages.
+const clientOptions = {
+  maxPoolSize: intFromEnv('MONGO_MAX_POOL_SIZE', 20),
+  minPoolSize: intFromEnv('MONGO_MIN_POOL_SIZE', 2),
+  maxIdleTimeMS: intFromEnv('MONGO_MAX_IDLE_TIME_MS', 60000),
+  waitQueueTimeoutMS: intFromEnv('MONGO_WAIT_QUEUE_TIMEOUT_MS', 10000),
+  serverSelectionTimeoutMS: intFromEnv('MONGO_SERVER_SELECTION_TIMEOUT_MS', 10000),
+  connectTimeoutMS: intFromEnv('MONGO_CONNECT_TIMEOUT_MS', 10000),
+  socketTimeoutMS: intFromEnv('MONGO_SOCKET_TIMEOUT_MS', 0),
+  compressors: (process.env.MONGO_COMPRESSORS || 'zlib').split(',').map(name => name.trim()).filter(Boolean),
+  zlibCompressionLevel: intFromEnv('MONGO_ZLIB_LEVEL', 6)
+};
+
+const WAIT_BUCKETS_MS = [1, 10, 100, 1000];
+
+const poolCounters = {
+  checkoutsStarted: 0,
+  checkedOut: 0,
+  checkoutsFailed: 0,
+  checkedIn: 0,
+  connectionsCreated: 0,
+  connectionsClosed: 0,
+  maxWaiting: 0,
+  waitMs: 0,
+  maxWaitMs: 0,
+  waitBuckets: new Array(WAIT_BUCKETS_MS.length + 1).fill(0)
+};
+// Checkout start times per server address. The CMAP wait queue is FIFO, so when a
+// driver's checked-out event carries no durationMS the oldest start is the one served.
+const waitingSince = new Map();
 
-export async function connectToDatabase() {
-  if (cachedClient && cachedDb) {
-    return { client: cachedClient, db: cachedDb };
+function recordWait(ms) {
+  poolCounters.waitMs += ms;
+  poolCounters.maxWaitMs = Math.max(poolCounters.maxWaitMs, ms);
+  const bucket = WAIT_BUCKETS_MS.findIndex(limit => ms < limit);
+  poolCounters.waitBuckets[bucket === -1 ? WAIT_BUCKETS_MS.length : bucket]++;
+}
+
+function finishCheckout(event) {
+  const queue = waitingSince.get(event.address) || [];
+  const started = queue.shift();
+  if (typeof event.durationMS === 'number') {
+    recordWait(event.durationMS);
+  } else if (started !== undefined) {
+    recordWait(performance.now() - started);
   }
+}
 
-  const client = await MongoClient.connect(uri, {
-    useNewUrlParser: true,
-    useUnifiedTopology: true,
+function monitorPool(client) {
+  client.on('connectionCheckOutStarted', (event) => {
+    poolCounters.checkoutsStarted++;
+    if (!waitingSince.has(event.address)) waitingSince.set(event.address, []);
+    const queue = waitingSince.get(event.address);
+    queue.push(performance.now());
+    poolCounters.maxWaiting = Math.max(poolCounters.maxWaiting, queue.length);
   });
+  client.on('connectionCheckedOut', (event) => {
+    poolCounters.checkedOut++;
+    finishCheckout(event);
+  });
+  client.on('connectionCheckOutFailed', (event) => {
+    poolCounters.checkoutsFailed++;
+    finishCheckout(event);
+  });
+  client.on('connectionCheckedIn', () => {
+    poolCounters.checkedIn++;
+  });
+  client.on('connectionCreated', () => {
+    poolCounters.connectionsCreated++;
+  });
+  client.on('connectionClosed', () => {
+    poolCounters.connectionsClosed++;
+  });
+}
 
+export function poolStats() {
+  const { waitBuckets, waitMs, ...counters } = poolCounters;
+  const waits = counters.checkedOut + counters.checkoutsFailed;
+  let waiting = 0;
+  for (const queue of waitingSince.values()) waiting += queue.length;
+  return {
+    ...counters,
+    options: { maxPoolSize: clientOptions.maxPoolSize, minPoolSize: clientOptions.minPoolSize },
+    open: counters.connectionsCreated - counters.connectionsClosed,
+    inUse: counters.checkedOut - counters.checkedIn,
+    waiting,
+    avgWaitMs: waits ? waitMs / waits : 0,
+    waitBuckets: Object.fromEntries(waitBuckets.map((count, i) => [
+      i < WAIT_BUCKETS_MS.length ? `<${WAIT_BUCKETS_MS[i]}ms` : `>=${WAIT_BUCKETS_MS[WAIT_BUCKETS_MS.length - 1]}ms`,
+      count
+    ]))
+  };
+}
+
+// Create every index in lib/indexes.json. createIndex is a no-op when an index with
+// the same name and spec exists, so this is safe on every cold start. One failing
+// index (e.g. duplicate ids blocking a unique index) is logged and does not stop the rest.
+export async function ensureIndexes(db) {
+  const tasks = [];
+  for (const [collectionName, specs] of Object.entries(indexDefinitions)) {
+    for (const { key, ...options } of specs) {
+      tasks.push(
+        db.collection(collectionName).createIndex(key, options)
+          .catch(error => console.error(`Index ${collectionName}.${options.name} failed:`, error.message))
+      );
+    }
+  }
+  await Promise.all(tasks);
+}
+
+async function connect() {
+  const client = new MongoClient(uri, clientOptions);
+  monitorPool(client);
+  await client.connect();
   const db = client.db(dbName);
 
-  cachedClient = client;
-  cachedDb = db;
+  // Built in the background so a large collection does not stall the first request
+  if (process.env.MONGO_ENSURE_INDEXES !== 'false') {
+    ensureIndexes(db);
+  }
 
   return { client, db };
 }
 
+// Every caller shares one in-flight connect, so a cold-start burst opens one
+// client and pool rather than one per request. A failed connect is forgotten so
+// the next request retries. In development the promise survives hot reloads.
+const store = process.env.NODE_ENV === 'development' ? globalThis : {};
+
+export function connectToDatabase() {
+  if (!store._mongoConnection) {
+    store._mongoConnection = connect().catch(error => {
+      store._mongoConnection = null;
+      throw error;
+    });
+  }
+  return store._mongoConnection;
+}
+
 export async function getCollection(collectionName) {
   const { db } = await connectToDatabase();
   return db.collection(collectionName);
 }
+
+// Connect and open `connections` pooled sockets up front (one ping each, in
+// parallel), so the first real requests after boot do not pay for the handshakes
+export async function warmUp(connections = Math.max(1, clientOptions.minPoolSize)) {
+  const { db } = await connectToDatabase();
+  const started = performance.now();
+  await Promise.all(Array.from({ length: connections }, () => db.command({ ping: 1 })));
+  return { connections: poolStats().open, ms: performance.now() - started };
+}
@@ -0,0 +1,47 @@
+// Keyset (cursor) pagination helpers.
+// A cursor is the sort key of the last item on the previous page, encoded as
+// base64url JSON, so the next page is an indexed range scan rather than a skip.
+// Items without the date field sort after every dated one; their cursor carries
+// a null date and pages on id alone.
+
+export function parseLimit(value, defaultLimit = 50, maxLimit = 200) {
+  const limit = parseInt(value, 10);
+  if (!Number.isFinite(limit) || limit <= 0) return defaultLimit;
+  return Math.min(limit, maxLimit);
+}
+
+export function encodeCursor(date, id) {
+  const iso = date == null ? null : new Date(date).toISOString();
+  return Buffer.from(JSON.stringify([iso, id])).toString('base64url');
+}
+
+// Returns { date, id } (date is null for an undated item), null when no cursor
+// was given, or throws on a malformed cursor
+export function decodeCursor(cursor) {
+  if (!cursor) return null;
+  try {
+    const [iso, id] = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'));
+    const date = iso === null ? null : new Date(iso);
+    if ((date && Number.isNaN(date.getTime())) || typeof id !== 'string') {
+      throw new Error('bad cursor');
+    }
+    return { date, id };
+  } catch {
+    throw new Error('Invalid cursor');
+  }
+}
+
+// Filter for items strictly after the cursor in { [field]: -1, id: -1 } order
+export function descendingAfter(field, cursor) {
+  if (!cursor) return {};
+  if (cursor.date === null) {
+    return { [field]: null, id: { $lt: cursor.id } };
+  }
+  return {
+    $or: [
+      { [field]: { $lt: cursor.date } },
+      { [field]: cursor.date, id: { $lt: cursor.id } },
+      { [field]: null }
+    ]
+  };
+}
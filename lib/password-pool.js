@@ -0,0 +1,153 @@
+import { Worker } from 'worker_threads';
+import os from 'os';
+import bcrypt from 'bcryptjs';
+
+// bcrypt hashing and verification on a small pool of worker threads, so a
+// login burst queues here instead of blocking the event loop for every other
+// request. Workers are started lazily and unref'd; a full queue rejects with
+// status 503 rather than growing without bound.
+//   PASSWORD_POOL_SIZE       worker threads (default: CPU count - 1, 1 to 4);
+//                            0 uses bcryptjs's async API on the main thread
+//   PASSWORD_POOL_MAX_QUEUE  tasks allowed to wait for a worker (default 1000)
+const cpus = typeof os.availableParallelism === 'function' ? os.availableParallelism() : os.cpus().length;
+const POOL_SIZE = parseInt(process.env.PASSWORD_POOL_SIZE || String(Math.min(4, Math.max(1, cpus - 1))), 10);
+const MAX_QUEUE = parseInt(process.env.PASSWORD_POOL_MAX_QUEUE || '1000', 10);
+
+// Evaluated source rather than a file path, so bundling the route does not have to
+// emit a separate worker entry; bcryptjs is resolved from node_modules at runtime.
+const WORKER_SOURCE = `
+const { parentPort } = require('worker_threads');
+const bcrypt = require('bcryptjs');
+parentPort.on('message', ({ op, args }) => {
+  try {
+    const result = op === 'hash' ? bcrypt.hashSync(args[0], args[1]) : bcrypt.compareSync(args[0], args[1]);
+    parentPort.postMessage({ result });
+  } catch (error) {
+    parentPort.postMessage({ error: error.message });
+  }
+});
+`;
+
+const idle = [];
+const queue = [];
+let started = 0;
+const stats = {
+  completed: 0,
+  failed: 0,
+  rejected: 0,
+  maxQueued: 0,
+  waitMs: 0,
+  runMs: 0
+};
+
+function startWorker() {
+  const worker = new Worker(WORKER_SOURCE, { eval: true });
+  started++;
+
+  worker.on('message', ({ result, error }) => {
+    const task = worker.task;
+    worker.task = null;
+    stats.runMs += performance.now() - task.startedAt;
+    if (error) {
+      stats.failed++;
+      task.reject(new Error(error));
+    } else {
+      stats.completed++;
+      task.resolve(result);
+    }
+    release(worker);
+  });
+
+  // A crashed worker fails its task and is replaced on demand
+  worker.on('error', (error) => {
+    if (worker.task) {
+      stats.failed++;
+      worker.task.reject(error);
+      worker.task = null;
+    }
+  });
+  worker.on('exit', () => {
+    if (worker.task) {
+      stats.failed++;
+      worker.task.reject(new Error('Password worker exited'));
+      worker.task = null;
+    }
+    started--;
+    const index = idle.indexOf(worker);
+    if (index !== -1) idle.splice(index, 1);
+    drain();
+  });
+  // Idle workers must not keep the process alive (attach listeners first: they re-ref)
+  worker.unref();
+  return worker;
+}
+
+function run(worker, task) {
+  task.startedAt = performance.now();
+  stats.waitMs += task.startedAt - task.queuedAt;
+  worker.task = task;
+  worker.postMessage({ op: task.op, args: task.args });
+}
+
+function release(worker) {
+  const next = queue.shift();
+  if (next) {
+    run(worker, next);
+  } else {
+    idle.push(worker);
+  }
+}
+
+function drain() {
+  while (queue.length && started < POOL_SIZE) {
+    run(startWorker(), queue.shift());
+  }
+}
+
+function submit(op, args) {
+  if (POOL_SIZE <= 0) {
+    return op === 'hash' ? bcrypt.hash(args[0], args[1]) : bcrypt.compare(args[0], args[1]);
+  }
+  return new Promise((resolve, reject) => {
+    const task = { op, args, resolve, reject, queuedAt: performance.now() };
+    const worker = idle.pop() || (started < POOL_SIZE ? startWorker() : null);
+    if (worker) {
+      run(worker, task);
+      return;
+    }
+    if (queue.length >= MAX_QUEUE) {
+      stats.rejected++;
+      const error = new Error('Server busy, please retry');
+      error.status = 503;
+      reject(error);
+      return;
+    }
+    queue.push(task);
+    stats.maxQueued = Math.max(stats.maxQueued, queue.length);
+  });
+}
+
+export function hashInPool(password, rounds) {
+  return submit('hash', [password, rounds]);
+}
+
+export function compareInPool(password, hash) {
+  return submit('compare', [password, hash]);
+}
+
+export function passwordPoolStats() {
+  const finished = stats.completed + stats.failed;
+  return {
+    size: POOL_SIZE,
+    workers: started,
+    busy: started - idle.length,
+    queued: queue.length,
+    maxQueue: MAX_QUEUE,
+    maxQueued: stats.maxQueued,
+    completed: stats.completed,
+    failed: stats.failed,
+    rejected: stats.rejected,
+    avgWaitMs: finished ? stats.waitMs / finished : 0,
+    avgRunMs: finished ? stats.runMs / finished : 0
+  };
+}
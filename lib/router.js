@@ -0,0 +1,79 @@
+// Table-driven router for the catch-all API route.
+// Static paths resolve with a single Map lookup. Parameterised paths such as
+// /skills/:id are bucketed by method, segment count and first segment, so
+// dispatch cost stays flat as routes are added.
+
+function toSegments(path) {
+  return (Array.isArray(path) ? path : path.split('/')).filter(Boolean);
+}
+
+function compile(pattern, handler) {
+  const segments = toSegments(pattern).map(segment =>
+    segment.startsWith(':') ? { param: segment.slice(1) } : { literal: segment }
+  );
+  return { pattern, segments, handler };
+}
+
+function bucketKey(method, length, first) {
+  return `${method} ${length} ${first}`;
+}
+
+export function createRouter(routes = []) {
+  const staticRoutes = new Map();
+  const dynamicRoutes = new Map();
+
+  function add(method, pattern, handler) {
+    const compiled = compile(pattern, handler);
+    if (compiled.segments.every(segment => segment.literal !== undefined)) {
+      staticRoutes.set(`${method} /${compiled.segments.map(s => s.literal).join('/')}`, compiled);
+      return;
+    }
+
+    const first = compiled.segments[0].literal ?? '*';
+    const key = bucketKey(method, compiled.segments.length, first);
+    if (!dynamicRoutes.has(key)) {
+      dynamicRoutes.set(key, []);
+    }
+    dynamicRoutes.get(key).push(compiled);
+  }
+
+  function matchBucket(bucket, segments) {
+    if (!bucket) return null;
+    for (const route of bucket) {
+      const params = {};
+      let matched = true;
+      for (let i = 0; i < segments.length; i++) {
+        const part = route.segments[i];
+        if (part.param !== undefined) {
+          params[part.param] = segments[i];
+        } else if (part.literal !== segments[i]) {
+          matched = false;
+          break;
+        }
+      }
+      if (matched) {
+        return { handler: route.handler, params, pattern: route.pattern };
+      }
+    }
+    return null;
+  }
+
+  // Returns { handler, params, pattern } or null when nothing matches
+  function match(method, path) {
+    const segments = toSegments(path);
+    const exact = staticRoutes.get(`${method} /${segments.join('/')}`);
+    if (exact) {
+      return { handler: exact.handler, params: {}, pattern: exact.pattern };
+    }
+    if (segments.length === 0) return null;
+
+    return matchBucket(dynamicRoutes.get(bucketKey(method, segments.length, segments[0])), segments)
+      || matchBucket(dynamicRoutes.get(bucketKey(method, segments.length, '*')), segments);
+  }
+
+  for (const [method, pattern, handler] of routes) {
+    add(method, pattern, handler);
+  }
+
+  return { add, match };
+}
@@ -0,0 +1,177 @@
+import { Readable } from 'stream';
+import fs from 'fs';
+import path from 'path';
+import formidable from 'formidable';
+
+// Multipart uploads streamed straight to disk. formidable pauses the request
+// while each chunk is written, so a slow disk applies backpressure to the
+// client instead of buffering the body in memory. A file is written under a
+// temp name and renamed into public/uploads only once it is complete, so a
+// failed or aborted upload never leaves a partial file at a public URL.
+//
+// Files are content-addressed: the SHA-256 computed while streaming names the
+// file, sharded two levels deep (uploads/ab/cd/<hash>.<ext>) so no directory
+// grows past a few hundred entries. The same bytes always map to the same URL,
+// so a re-upload reuses the stored copy and the URL can be cached as immutable
+// (see headers() in next.config.js).
+//   UPLOAD_MAX_BYTES      largest accepted file (default 10 MB); larger is 413
+//   UPLOAD_ALLOWED_TYPES  comma-separated MIME types; a trailing `*` matches a prefix
+//                         (`image/*`, or `*` for any); anything else is 415
+//                         (default: the types in EXTENSIONS)
+//
+// The stored extension comes from the declared MIME type via EXTENSIONS, never
+// from the client's filename, and types without an entry (SVG, HTML, ...) are
+// stored without one. Uploads are served from the site's own origin, so a
+// client must not be able to pick an extension the browser would render as a
+// document; next.config.js also sends nosniff so a mislabelled file is not
+// reinterpreted.
+//   UPLOAD_TMP_DIR        where partial files are written (default .uploads-tmp);
+//                         must be on the same filesystem as public/uploads
+export const UPLOAD_DIR = path.join(process.cwd(), 'public', 'uploads');
+const TMP_DIR = process.env.UPLOAD_TMP_DIR || path.join(process.cwd(), '.uploads-tmp');
+const MAX_BYTES = parseInt(process.env.UPLOAD_MAX_BYTES || String(10 * 1024 * 1024), 10);
+const EXTENSIONS = {
+  'image/jpeg': '.jpg',
+  'image/png': '.png',
+  'image/gif': '.gif',
+  'image/webp': '.webp',
+  'image/avif': '.avif',
+  'application/pdf': '.pdf',
+  'text/plain': '.txt',
+  'text/csv': '.csv',
+  'application/zip': '.zip',
+  'application/msword': '.doc',
+  'application/vnd.ms-excel': '.xls',
+  'application/vnd.ms-powerpoint': '.ppt',
+  'application/vnd.openxmlformats-officedocument.wordprocessingml.document': '.docx',
+  'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': '.xlsx',
+  'application/vnd.openxmlformats-officedocument.presentationml.presentation': '.pptx'
+};
+const ALLOWED_TYPES = (process.env.UPLOAD_ALLOWED_TYPES || Object.keys(EXTENSIONS).join(','))
+  .split(',').map(type => type.trim().toLowerCase()).filter(Boolean);
+
+// Room for the multipart boundaries and part headers around the file itself
+const MULTIPART_OVERHEAD = 64 * 1024;
+
+let directoriesReady = null;
+
+function uploadError(message, status) {
+  const error = new Error(message);
+  error.status = status;
+  return error;
+}
+
+function baseType(mimetype) {
+  return (mimetype || '').split(';')[0].trim().toLowerCase();
+}
+
+export function isAllowedType(mimetype) {
+  const type = baseType(mimetype);
+  return ALLOWED_TYPES.some(allowed => allowed === type ||
+    (allowed.endsWith('*') && type.startsWith(allowed.slice(0, -1))));
+}
+
+function ensureDirectories() {
+  if (!directoriesReady) {
+    directoriesReady = Promise.all([
+      fs.promises.mkdir(UPLOAD_DIR, { recursive: true }),
+      fs.promises.mkdir(TMP_DIR, { recursive: true })
+    ]).catch(error => {
+      directoriesReady = null;
+      throw error;
+    });
+  }
+  return directoriesReady;
+}
+
+function parseUpload(request) {
+  // formidable reads a Node request: a readable stream with a headers object
+  const body = Readable.fromWeb(request.body);
+  body.headers = Object.fromEntries(request.headers);
+
+  let rejected = false;
+  const form = formidable({
+    uploadDir: TMP_DIR,
+    maxFiles: 1,
+    maxFileSize: MAX_BYTES,
+    maxTotalFileSize: MAX_BYTES,
+    maxFields: 20,
+    maxFieldsSize: 64 * 1024,
+    allowEmptyFiles: false,
+    hashAlgorithm: 'sha256',
+    filter: ({ name, mimetype }) => {
+      if (name !== 'file') return false;
+      if (!rejected && !isAllowedType(mimetype)) {
+        rejected = true;
+        form.emit('error', uploadError(`File type ${mimetype || 'unknown'} is not allowed`, 415));
+      }
+      return !rejected;
+    }
+  });
+
+  return form.parse(body)
+    .catch(async (error) => {
+      body.destroy();
+      // formidable leaves whatever it had written when it stops part-way
+      const partial = (form.openedFiles || []).map(file => file.filepath).filter(Boolean);
+      await Promise.all(partial.map(filepath => fs.promises.rm(filepath, { force: true })));
+      if (error.status) throw error;
+      if (error.httpCode === 413) throw uploadError(`File exceeds the ${MAX_BYTES} byte upload limit`, 413);
+      if (error.httpCode && error.httpCode < 500) throw uploadError(error.message, 400);
+      throw error;
+    });
+}
+
+// Public path of the stored copy of a file: uploads/ab/cd/<hash>.<ext>
+export function contentPath(hash, mimetype) {
+  const extension = EXTENSIONS[baseType(mimetype)] || '';
+  return path.posix.join(hash.slice(0, 2), hash.slice(2, 4), `${hash}${extension}`);
+}
+
+async function exists(filepath) {
+  try {
+    await fs.promises.access(filepath);
+    return true;
+  } catch {
+    return false;
+  }
+}
+
+// Stream the `file` field of a multipart request into public/uploads and
+// return its public URL; `duplicate` is set when identical bytes were already
+// stored. Errors carry a `status` when the client is at fault.
+export async function saveUpload(request) {
+  if (!request.body || !(request.headers.get('content-type') || '').startsWith('multipart/form-data')) {
+    throw uploadError('Expected a multipart/form-data body', 400);
+  }
+  const declared = parseInt(request.headers.get('content-length'), 10);
+  if (declared > MAX_BYTES + MULTIPART_OVERHEAD) {
+    throw uploadError(`File exceeds the ${MAX_BYTES} byte upload limit`, 413);
+  }
+
+  await ensureDirectories();
+  const [, files] = await parseUpload(request);
+  const file = files.file?.[0];
+  if (!file) {
+    throw uploadError('No file uploaded', 400);
+  }
+
+  const relativePath = contentPath(file.hash, file.mimetype);
+  const target = path.join(UPLOAD_DIR, relativePath);
+  const result = { url: `/uploads/${relativePath}`, size: file.size, type: file.mimetype, duplicate: false };
+  try {
+    if (await exists(target)) {
+      result.duplicate = true;
+      await fs.promises.rm(file.filepath, { force: true });
+    } else {
+      // Two concurrent uploads of the same bytes may both get here; the second
+      // rename replaces an identical file, so readers always see a complete copy
+      await fs.promises.mkdir(path.dirname(target), { recursive: true });
+      await fs.promises.rename(file.filepath, target);
+    }
+  } catch (error) {
+    await fs.promises.rm(file.filepath, { force: true });
+    throw error;
+  }
+  return result;
+}
@@ -0,0 +1,34 @@
+import { getCollection } from './mongodb';
+
+// Per-collection version stamps ({ id: collectionName, version, updatedAt }) in the
+// versions collection. Every write to a public collection bumps its stamp after the
+// write lands, so a reader that fetches stamps before data can never tag newer data
+// with an older version. Stamps live in MongoDB rather than in memory so every
+// server instance derives the same ETag. Scripts that write public collections
+// directly (migrations.py, generate_data.py, bootstrap_data.py) bump the same
+// documents through bump_version in migrations.py, or `python migrations.py bump`.
+export const SITE_COLLECTIONS = ['site_content', 'skills', 'services', 'projects', 'contact_info'];
+
+export async function bumpVersion(collectionName) {
+  const versions = await getCollection('versions');
+  await versions.updateOne(
+    { id: collectionName },
+    { $inc: { version: 1 }, $set: { updatedAt: new Date() } },
+    { upsert: true }
+  );
+}
+
+// { collectionName: version } for the requested collections; never-written ones are 0
+export async function getVersions(collectionNames) {
+  const versions = await getCollection('versions');
+  const stamps = await versions
+    .find({ id: { $in: collectionNames } }, { projection: { _id: 0, id: 1, version: 1 } })
+    .toArray();
+  const byName = Object.fromEntries(stamps.map(stamp => [stamp.id, stamp.version]));
+  return Object.fromEntries(collectionNames.map(name => [name, byName[name] || 0]));
+}
+
+// Strong ETag over a set of collection versions, e.g. "site-3.12.4.7.1"
+export function versionTag(prefix, versions) {
+  return `"${prefix}-${Object.values(versions).join('.')}"`;
+}
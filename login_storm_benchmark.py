@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Login storm benchmark for the bcrypt worker pool (lib/password-pool.js)
+Measures public GET latency on its own, then again while many clients hammer
+POST /api/auth/login, to show password hashing no longer stalls other traffic:
+- Baseline: paced probes of a public endpoint with no logins in flight
+- Storm: the same probes while --logins threads log in back to back
+- Pool counters (queue depth, wait and run time) from GET /api/metrics
+
+Usage:
+    python login_storm_benchmark.py --logins 20 --duration 20
+    python login_storm_benchmark.py --probe /content --max-slowdown 2
+"""
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+import requests
+
+from api_client import ApiClient, get_client
+from latency_stats import Histogram
+
+
+class LoginStormBenchmark:
+    def __init__(self, base_url: str, username: str, password: str, probe: str, logins: int):
+        self.client = get_client(f"{base_url}/api")
+        # Login threads get their own connection pool so probes never queue behind them client-side
+        self.storm_client = ApiClient(f"{base_url}/api", pool_size=logins, retries=0)
+        self.username = username
+        self.password = password
+        self.probe_endpoint = probe
+        self.token: Optional[str] = None
+
+    def login(self) -> Optional[str]:
+        response = self.client.request("POST", "/auth/login",
+                                        json={"username": self.username, "password": self.password})
+        return response.json().get("token") if response.status_code == 200 else None
+
+    def pool_stats(self) -> Optional[Dict[str, Any]]:
+        if not self.token:
+            return None
+        response = self.client.request("GET", "/metrics", headers={"Authorization": f"Bearer {self.token}"})
+        return response.json().get("passwordPool") if response.status_code == 200 else None
+
+    def probe(self, duration: float, interval: float) -> Histogram:
+        """Paced GETs of the probe endpoint; latency in microseconds"""
+        histogram = Histogram()
+        end = time.perf_counter() + duration
+        while time.perf_counter() < end:
+            start = time.perf_counter()
+            try:
+                self.client.request("GET", self.probe_endpoint)
+            except requests.exceptions.RequestException:
+                pass
+            elapsed = time.perf_counter() - start
+            histogram.record(int(elapsed * 1_000_000))
+            time.sleep(max(0.0, interval - elapsed))
+        return histogram
+
+    def storm(self, logins: int, stop: threading.Event, results: Dict[str, Any]):
+        def worker():
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    response = self.storm_client.request("POST", "/auth/login",
+                                                         json={"username": self.username, "password": self.password})
+                    ok = response.status_code == 200
+                except requests.exceptions.RequestException:
+                    ok = False
+                elapsed_us = int((time.perf_counter() - start) * 1_000_000)
+                with results["lock"]:
+                    results["latency"].record(elapsed_us)
+                    results["ok" if ok else "failed"] += 1
+
+        with ThreadPoolExecutor(max_workers=logins) as pool:
+            for _ in range(logins):
+                pool.submit(worker)
+
+    def run(self, logins: int, duration: float, interval: float, max_slowdown: float) -> bool:
+        self.token = self.login()
+        if not self.token:
+            print("❌ Login failed - check --username/--password")
+            return False
+
+        print(f"📏 Baseline: probing GET {self.probe_endpoint} for {duration:.0f}s")
+        baseline = self.probe(duration, interval)
+        before = self.pool_stats()
+
+        print(f"🌪️  Storm: {logins} clients logging in while probing for {duration:.0f}s")
+        stop = threading.Event()
+        results = {"lock": threading.Lock(), "latency": Histogram(), "ok": 0, "failed": 0}
+        storm = threading.Thread(target=self.storm, args=(logins, stop, results), daemon=True)
+        storm.start()
+        time.sleep(1)  # let the queue fill before measuring
+        loaded = self.probe(duration, interval)
+        after = self.pool_stats()
+        stop.set()
+        storm.join()
+
+        print("\n" + "=" * 70)
+        print("🔐 LOGIN STORM BENCHMARK")
+        print("=" * 70)
+        print(f"{'Phase':<10} {'Probes':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        print("-" * 54)
+        for name, histogram in [("baseline", baseline), ("storm", loaded)]:
+            print(f"{name:<10} {histogram.total:>7} {histogram.percentile(50) / 1000:>8.1f} "
+                  f"{histogram.percentile(95) / 1000:>8.1f} {histogram.percentile(99) / 1000:>8.1f} "
+                  f"{histogram.max / 1000:>8.1f}")
+
+        login_latency = results["latency"]
+        print(f"\nLogins: {results['ok']} ok, {results['failed']} failed "
+              f"({results['ok'] / (duration + 1):.1f}/s), p50 {login_latency.percentile(50) / 1000:.0f}ms, "
+              f"p99 {login_latency.percentile(99) / 1000:.0f}ms")
+        if before and after:
+            completed = after["completed"] - before["completed"]
+            print(f"Password pool: {after['size']} workers, {completed} tasks, max queued {after['maxQueued']}, "
+                  f"avg wait {after['avgWaitMs']:.1f}ms, avg run {after['avgRunMs']:.1f}ms, "
+                  f"rejected {after['rejected'] - before['rejected']}")
+        else:
+            print("Password pool counters unavailable (GET /api/metrics needs a super admin)")
+
+        baseline_p99 = max(baseline.percentile(99), 1000)
+        slowdown = loaded.percentile(99) / baseline_p99
+        passed = slowdown <= max_slowdown and results["ok"] > 0
+        print(f"\n{'✅' if passed else '❌'} Probe p99 under load is {slowdown:.1f}x baseline "
+              f"(limit {max_slowdown:g}x)")
+        return passed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check public GET latency stays flat during a login storm")
+    parser.add_argument("--base-url", default="http://localhost:3000")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--probe", default="/skills", help="public endpoint measured during the storm")
+    parser.add_argument("--logins", type=int, default=20, help="concurrent login clients")
+    parser.add_argument("--duration", type=float, default=15, help="seconds per phase")
+    parser.add_argument("--interval", type=float, default=0.02, help="seconds between probes")
+    parser.add_argument("--max-slowdown", type=float, default=3.0,
+                        help="allowed probe p99 under load as a multiple of baseline p99 (floored at 1ms)")
+    args = parser.parse_args()
+
+    benchmark = LoginStormBenchmark(args.base_url, args.username, args.password, args.probe, args.logins)
+    success = benchmark.run(args.logins, args.duration, args.interval, args.max_slowdown)
+    exit(0 if success else 1)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Create, verify and report on the MongoDB indexes route.js relies on
+Index definitions live in lib/indexes.json, the same file lib/mongodb.js
+applies at connect time:
+- create: build any missing indexes (idempotent)
+- verify: check every defined index exists with the expected key and options
+- report: $indexStats usage counters per index, flagging unused and unmanaged ones
+
+Usage:
+    python manage_indexes.py create
+    python manage_indexes.py verify
+    python manage_indexes.py report [--collection chats]
+"""
+
+import argparse
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from pymongo.errors import OperationFailure
+
+from migrations import connect
+
+INDEXES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lib", "indexes.json")
+
+
+def load_definitions(path: str = INDEXES_FILE) -> Dict[str, List[Dict[str, Any]]]:
+    with open(path) as handle:
+        return json.load(handle)
+
+
+def key_list(key: Dict[str, int]) -> List[tuple]:
+    return [(field, direction) for field, direction in key.items()]
+
+
+def select(definitions: Dict[str, List[Dict[str, Any]]], collection: Optional[str]):
+    if collection:
+        return {collection: definitions.get(collection, [])}
+    return definitions
+
+
+def create_indexes(db, definitions) -> bool:
+    success = True
+    for collection_name, specs in definitions.items():
+        for spec in specs:
+            options = {k: v for k, v in spec.items() if k != "key"}
+            try:
+                db[collection_name].create_index(key_list(spec["key"]), **options)
+                print(f"✅ {collection_name}.{spec['name']}")
+            except OperationFailure as e:
+                success = False
+                print(f"❌ {collection_name}.{spec['name']}: {e.details.get('errmsg', e) if e.details else e}")
+    return success
+
+
+def verify_indexes(db, definitions) -> bool:
+    success = True
+    for collection_name, specs in definitions.items():
+        existing = db[collection_name].index_information()
+        for spec in specs:
+            index = existing.get(spec["name"])
+            if index is None:
+                success = False
+                print(f"❌ {collection_name}.{spec['name']}: missing")
+                continue
+            expected_key = key_list(spec["key"])
+            actual_key = [(field, int(direction)) for field, direction in index["key"]]
+            if actual_key != expected_key or bool(index.get("unique")) != bool(spec.get("unique")):
+                success = False
+                print(f"❌ {collection_name}.{spec['name']}: expected {expected_key} unique={bool(spec.get('unique'))}, "
+                      f"found {actual_key} unique={bool(index.get('unique'))}")
+                continue
+            print(f"✅ {collection_name}.{spec['name']}")
+    return success
+
+
+def report_usage(db, definitions):
+    for collection_name, specs in definitions.items():
+        managed = {spec["name"] for spec in specs}
+        stats = list(db[collection_name].aggregate([{"$indexStats": {}}]))
+        print(f"\n📚 {collection_name} ({db[collection_name].estimated_document_count()} documents)")
+        print(f"{'Index':<24} {'Ops':>10}  {'Since':<20} Note")
+        print("-" * 72)
+        for stat in sorted(stats, key=lambda s: s["name"]):
+            ops = stat.get("accesses", {}).get("ops", 0)
+            since = stat.get("accesses", {}).get("since")
+            note = ""
+            if stat["name"] != "_id_" and stat["name"] not in managed:
+                note = "not in lib/indexes.json"
+            elif ops == 0 and stat["name"] != "_id_":
+                note = "unused since last restart"
+            print(f"{stat['name']:<24} {ops:>10}  {str(since)[:19]:<20} {note}")
+        missing = managed - {stat["name"] for stat in stats}
+        for name in sorted(missing):
+            print(f"{name:<24} {'-':>10}  {'':<20} missing (run create)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the MongoDB indexes defined in lib/indexes.json")
+    parser.add_argument("command", choices=["create", "verify", "report"])
+    parser.add_argument("--collection", help="limit to one collection")
+    args = parser.parse_args()
+
+    definitions = select(load_definitions(), args.collection)
+    client, db = connect()
+    success = True
+    try:
+        if args.command == "create":
+            success = create_indexes(db, definitions)
+        elif args.command == "verify":
+            success = verify_indexes(db, definitions)
+        else:
+            report_usage(db, definitions)
+    finally:
+        client.close()
+    exit(0 if success else 1)
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Schema migration runner for the Prompt Forge MongoDB collections
+Named, versioned, idempotent migrations applied directly against MongoDB:
+- Each migration selects only documents that still need changing
+- Updates are sent as batched bulk_write calls (ordered=False)
+- Applied migrations are recorded in the schema_migrations collection
+- --dry-run reports how many documents each pending migration would touch
+- Every run is verified server-side (count_documents), never by loading the collection
+- A migration that modifies documents bumps its collection's version stamp
+  (lib/versions.js), so public ETags change; `bump` does the same for any other
+  script that writes public collections outside the API
+
+Usage:
+    python migrations.py status
+    python migrations.py up --dry-run
+    python migrations.py up [--to VERSION] [--only VERSION ...] [--force] [--batch-size 1000]
+    python migrations.py bump COLLECTION [COLLECTION ...]
+"""
+
+import argparse
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+from bson import ObjectId
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError
+
+MIGRATIONS_COLLECTION = "schema_migrations"
+DEFAULT_BATCH_SIZE = 1000
+# Must match BUCKET_SIZE in lib/chat-store.js
+CHAT_BUCKET_SIZE = 50
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class Migration:
+    """Base class: select documents with `filter`, rewrite each one with `plan`"""
+
+    version = 0
+    name = ""
+    collection = ""
+    filter: Dict[str, Any] = {}
+    # Fields plan() needs; _id is always returned
+    projection: Optional[Dict[str, int]] = {"_id": 1}
+    # Overrides the runner's batch size for migrations that read large documents
+    batch_size: Optional[int] = None
+
+    def plan(self, doc: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the update document for one matched document, or None to skip it"""
+        raise NotImplementedError
+
+    def target(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        """Filter for the write: the same document, only while it still matches `filter`.
+        The batch is a snapshot, so the app may have changed the document since it was read."""
+        return {**self.filter, "_id": doc["_id"]}
+
+    def apply_batch(self, db, docs: List[Dict[str, Any]]) -> int:
+        """Write one batch server-side; returns the number of modified documents"""
+        ops = []
+        for doc in docs:
+            update = self.plan(doc)
+            if update:
+                ops.append(UpdateOne(self.target(doc), update))
+        if not ops:
+            return 0
+        result = db[self.collection].bulk_write(ops, ordered=False)
+        return result.modified_count
+
+    def pending(self, db) -> int:
+        return db[self.collection].count_documents(self.filter)
+
+    def verify(self, db) -> int:
+        """Documents still matching the migration filter after it ran (0 means done)"""
+        return self.pending(db)
+
+
+class RemoveSkillLevel(Migration):
+    """Skills no longer carry a percentage level (replaces fix_skills.py's PUT loop)"""
+
+    version = 1
+    name = "remove_skill_level"
+    collection = "skills"
+    filter = {"level": {"$exists": True}}
+
+    def plan(self, doc):
+        return {"$unset": {"level": ""}}
+
+
+class BucketChatMessages(Migration):
+    """Move embedded chats.messages arrays into fixed-size chat_messages buckets (see lib/chat-store.js)"""
+
+    version = 2
+    name = "bucket_chat_messages"
+    collection = "chats"
+    filter = {"messages": {"$exists": True}}
+    projection = {"_id": 1, "id": 1, "messages": 1}
+    batch_size = 100
+
+    @staticmethod
+    def numbered(doc):
+        return [dict(message, seq=index + 1) for index, message in enumerate(doc.get("messages") or [])]
+
+    def plan(self, doc):
+        messages = self.numbered(doc)
+        return {
+            "$set": {
+                "messageCount": len(messages),
+                "storedSeq": len(messages),
+                "lastMessage": messages[-1] if messages else None
+            },
+            "$unset": {"messages": ""}
+        }
+
+    def apply_batch(self, db, docs):
+        # Buckets first, so a summary never loses its messages array before they are stored.
+        # $setOnInsert leaves buckets the app already created (lazy upgrade) untouched, and
+        # target() skips summaries the app upgraded (and maybe appended to) since the batch was read.
+        ops = []
+        for doc in docs:
+            messages = self.numbered(doc)
+            for start in range(0, len(messages), CHAT_BUCKET_SIZE):
+                chunk = messages[start:start + CHAT_BUCKET_SIZE]
+                bucket = start // CHAT_BUCKET_SIZE
+                ops.append(UpdateOne(
+                    {"chatId": doc["id"], "bucket": bucket},
+                    {"$setOnInsert": {"chatId": doc["id"], "bucket": bucket, "count": len(chunk), "messages": chunk}},
+                    upsert=True
+                ))
+        if ops:
+            try:
+                db["chat_messages"].bulk_write(ops, ordered=False)
+            except BulkWriteError as e:
+                # A lazy upgrade inserted the same bucket first; its copy stands
+                if any(error["code"] != 11000 for error in e.details["writeErrors"]):
+                    raise
+        return super().apply_batch(db, docs)
+
+
+class BackfillStorageCreatedAt(Migration):
+    """Give private_storage items without createdAt one, so GET /storage pages them by date"""
+
+    version = 3
+    name = "backfill_storage_created_at"
+    collection = "private_storage"
+    filter = {"createdAt": None}
+    projection = {"_id": 1, "updatedAt": 1}
+
+    def plan(self, doc):
+        # Best known creation time: the last update, else the ObjectId timestamp, else the
+        # epoch so the item keeps sorting after every dated one
+        created = doc.get("updatedAt")
+        if not isinstance(created, datetime):
+            created = doc["_id"].generation_time if isinstance(doc["_id"], ObjectId) else EPOCH
+        return {"$set": {"createdAt": created}}
+
+
+MIGRATIONS: List[Migration] = [
+    RemoveSkillLevel(),
+    BucketChatMessages(),
+    BackfillStorageCreatedAt(),
+]
+
+
+def connect():
+    """Connect using the same MONGO_URL / DB_NAME settings as lib/mongodb.js"""
+    client = MongoClient(os.getenv("MONGO_URL", "mongodb://localhost:27017"))
+    db = client[os.getenv("DB_NAME", "promptforge")]
+    return client, db
+
+
+def bump_version(db, collection_name: str):
+    """Advance a collection's version stamp, as bumpVersion in lib/versions.js does after API writes"""
+    db["versions"].update_one(
+        {"id": collection_name},
+        {"$inc": {"version": 1}, "$set": {"updatedAt": datetime.now(timezone.utc)}},
+        upsert=True
+    )
+
+
+def iter_batches(collection, filter: Dict[str, Any], projection: Optional[Dict[str, int]],
+                 batch_size: int, limit: int = 0) -> Iterator[List[Dict[str, Any]]]:
+    """Stream matching documents in fixed-size batches without materialising the collection
+    (limit > 0 caps the cursor server-side)"""
+    batch = []
+    for doc in collection.find(filter, projection, batch_size=batch_size).limit(limit):
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def applied_migrations(db) -> Dict[int, Dict[str, Any]]:
+    return {record["_id"]: record for record in db[MIGRATIONS_COLLECTION].find({})}
+
+
+def run_migration(db, migration: Migration, batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, int]:
+    matched = 0
+    modified = 0
+    batch_size = migration.batch_size or batch_size
+    for batch in iter_batches(db[migration.collection], migration.filter, migration.projection, batch_size):
+        matched += len(batch)
+        modified += migration.apply_batch(db, batch)
+    if modified:
+        bump_version(db, migration.collection)
+
+    remaining = migration.verify(db)
+    if remaining:
+        # Leave it unrecorded so the next run picks it up again
+        return {"matched": matched, "modified": modified, "remaining": remaining}
+
+    db[MIGRATIONS_COLLECTION].update_one(
+        {"_id": migration.version},
+        {"$set": {
+            "name": migration.name,
+            "collection": migration.collection,
+            "matched": matched,
+            "modified": modified,
+            "appliedAt": datetime.now(timezone.utc)
+        }},
+        upsert=True
+    )
+    return {"matched": matched, "modified": modified, "remaining": 0}
+
+
+def sample_matching(collection, filter: Dict[str, Any], projection: Optional[Dict[str, int]] = None,
+                    limit: int = 10, batch_size: int = DEFAULT_BATCH_SIZE) -> List[Dict[str, Any]]:
+    """Up to `limit` projected documents matching filter, streamed from a batched cursor"""
+    if limit <= 0:
+        return []
+    found = []
+    for batch in iter_batches(collection, filter, projection or {"_id": 1}, min(batch_size, limit), limit):
+        found.extend(batch)
+    return found
+
+
+def run_migrations(db, dry_run: bool = False, to_version: Optional[int] = None, only: Optional[List[int]] = None,
+                   force: bool = False, batch_size: int = DEFAULT_BATCH_SIZE) -> bool:
+    """Apply the selected migrations in version order; returns False if any failed verification"""
+    success = True
+    applied = applied_migrations(db)
+    selected = [m for m in sorted(MIGRATIONS, key=lambda m: m.version)
+                if (to_version is None or m.version <= to_version) and (not only or m.version in only)]
+
+    for migration in selected:
+        label = f"{migration.version:04d}_{migration.name}"
+        if migration.version in applied and not force:
+            print(f"✅ {label}: already applied at {applied[migration.version].get('appliedAt')}")
+            continue
+
+        if dry_run:
+            print(f"🔎 {label}: would update {migration.pending(db)} document(s) in '{migration.collection}'")
+            continue
+
+        result = run_migration(db, migration, batch_size)
+        if result["remaining"]:
+            success = False
+            print(f"❌ {label}: {result['remaining']} document(s) in '{migration.collection}' still match after "
+                  f"modifying {result['modified']}")
+            continue
+        print(f"✅ {label}: matched {result['matched']}, modified {result['modified']} in '{migration.collection}'")
+
+    return success
+
+
+def print_status(db):
+    applied = applied_migrations(db)
+    for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+        label = f"{migration.version:04d}_{migration.name}"
+        record = applied.get(migration.version)
+        if record:
+            print(f"✅ {label}: applied at {record.get('appliedAt')} (modified {record.get('modified', 0)})")
+        else:
+            print(f"⏳ {label}: pending ({migration.pending(db)} document(s) to update)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run Prompt Forge schema migrations")
+    parser.add_argument("command", choices=["status", "up", "bump"])
+    parser.add_argument("collections", nargs="*", help="collections whose version stamp `bump` advances")
+    parser.add_argument("--dry-run", action="store_true", help="only count the documents each migration would touch")
+    parser.add_argument("--to", type=int, dest="to_version", help="apply migrations up to this version")
+    parser.add_argument("--only", type=int, nargs="+", help="apply only these versions")
+    parser.add_argument("--force", action="store_true", help="re-run migrations already recorded as applied")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    client, db = connect()
+    success = True
+    try:
+        if args.command == "status":
+            print_status(db)
+        elif args.command == "bump":
+            if not args.collections:
+                parser.error("bump needs at least one collection name")
+            for name in args.collections:
+                bump_version(db, name)
+                print(f"🔖 {name}: version stamp bumped")
+        else:
+            success = run_migrations(db, args.dry_run, args.to_version, args.only, args.force, args.batch_size)
+    finally:
+        client.close()
+    exit(0 if success else 1)
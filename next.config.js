@@ -5,7 +5,10 @@ const nextConfig = {
   },
   experimental: {
     // Remove if not using Server Components
-    serverComponentsExternalPackages: ['mongodb'],
+    // (bcryptjs stays external: the password worker threads require it at runtime)
+    serverComponentsExternalPackages: ['mongodb', 'bcryptjs'],
+    // Runs instrumentation.js once per server start (pool warm-up, default data bootstrap)
+    instrumentationHook: true,
   },
   webpack(config, { dev }) {
     if (dev) {
@@ -34,6 +37,14 @@ const nextConfig = {
           { key: "Access-Control-Allow-Headers", value: "*" },
         ],
       },
+      {
+        // Content-addressed uploads (lib/uploads.js): a URL's bytes never change
+        source: "/uploads/:a([0-9a-f]{2})/:b([0-9a-f]{2})/:file",
+        headers: [
+          { key: "Cache-Control", value: "public, max-age=31536000, immutable" },
+          { key: "X-Content-Type-Options", value: "nosniff" },
+        ],
+      },
     ];
   },
 };
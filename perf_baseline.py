@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Performance regression baseline for the backend API suites
+Compares per-route p95 latency from a run (latency_stats JSON, as written by
+--latency-out) against the last accepted baseline and fails when any route
+regresses by more than the allowed fraction.
+
+Usage:
+    python perf_baseline.py compare run.json --baseline perf_baseline.json --threshold 0.25
+    python perf_baseline.py accept run.json --baseline perf_baseline.json
+
+The harnesses accept the same options directly:
+    python backend_test.py --baseline perf_baseline.json --max-regression 0.25
+    python backend_test.py --baseline perf_baseline.json --accept-baseline
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, List
+
+DEFAULT_BASELINE = os.getenv("PERF_BASELINE", "perf_baseline.json")
+DEFAULT_THRESHOLD = float(os.getenv("PERF_MAX_REGRESSION", "0.25"))
+# Routes with fewer samples, or slowdowns smaller than this many ms, are too noisy to gate on
+MIN_SAMPLES = 5
+MIN_DELTA_MS = 2.0
+
+
+def load_rows(path: str) -> List[Dict[str, Any]]:
+    """Read the per-route rows from a latency_stats JSON dump"""
+    with open(path) as handle:
+        return json.load(handle).get("routes", [])
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    with open(path) as handle:
+        return json.load(handle)
+
+
+def save_baseline(rows: List[Dict[str, Any]], path: str):
+    baseline = {
+        "accepted_at": datetime.now().isoformat(),
+        "routes": {
+            row["route"]: {
+                "count": row["count"],
+                "p50_ms": row["p50_ms"],
+                "p95_ms": row["p95_ms"],
+                "p99_ms": row["p99_ms"]
+            }
+            for row in rows if row["count"] > 0
+        }
+    }
+    with open(path, "w") as handle:
+        json.dump(baseline, handle, indent=2, sort_keys=True)
+
+
+def compare(rows: List[Dict[str, Any]], baseline: Dict[str, Any], threshold: float,
+            min_samples: int = MIN_SAMPLES, min_delta_ms: float = MIN_DELTA_MS) -> List[Dict[str, Any]]:
+    """Return one entry per route whose p95 regressed beyond threshold"""
+    regressions = []
+    accepted = baseline.get("routes", {})
+    for row in rows:
+        previous = accepted.get(row["route"])
+        if not previous or row["count"] < min_samples or previous.get("count", 0) < min_samples:
+            continue
+        before, after = previous["p95_ms"], row["p95_ms"]
+        if after - before < min_delta_ms:
+            continue
+        if before <= 0 or (after - before) / before > threshold:
+            regressions.append({
+                "route": row["route"],
+                "baseline_p95_ms": before,
+                "current_p95_ms": after,
+                "change": (after - before) / before if before > 0 else float("inf")
+            })
+    return regressions
+
+
+def check_against_baseline(rows: List[Dict[str, Any]], baseline_path: str, threshold: float = DEFAULT_THRESHOLD,
+                           accept: bool = False) -> bool:
+    """Print a regression report for a run; returns False when the run should fail"""
+    print("\n📈 PERFORMANCE BASELINE CHECK")
+    print("=" * 50)
+
+    if accept:
+        save_baseline(rows, baseline_path)
+        print(f"Accepted {len(rows)} routes as the new baseline in {baseline_path}")
+        return True
+
+    if not os.path.exists(baseline_path):
+        print(f"No baseline at {baseline_path} - run with --accept-baseline to create one")
+        return True
+
+    baseline = load_baseline(baseline_path)
+    regressions = compare(rows, baseline, threshold)
+    known = baseline.get("routes", {})
+    new_routes = [row["route"] for row in rows if row["route"] not in known]
+
+    print(f"Baseline accepted at: {baseline.get('accepted_at', 'unknown')}")
+    print(f"Allowed p95 regression: {threshold * 100:.0f}%")
+    if new_routes:
+        print(f"New routes (not gated): {', '.join(new_routes)}")
+
+    if not regressions:
+        print("✅ No p95 regressions")
+        return True
+
+    print(f"❌ {len(regressions)} route(s) regressed:")
+    for item in regressions:
+        print(f"  • {item['route']}: p95 {item['baseline_p95_ms']:.1f} ms → {item['current_p95_ms']:.1f} ms "
+              f"(+{item['change'] * 100:.0f}%)")
+    return False
+
+
+def add_baseline_arguments(parser: argparse.ArgumentParser):
+    """Register the --baseline/--max-regression/--accept-baseline options on a harness"""
+    parser.add_argument("--baseline", help="compare per-route p95 latency against this baseline file")
+    parser.add_argument("--max-regression", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed p95 regression as a fraction (default %(default)s)")
+    parser.add_argument("--accept-baseline", action="store_true",
+                        help="store this run's latencies as the new baseline instead of comparing")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare or accept API latency baselines")
+    parser.add_argument("command", choices=["compare", "accept"])
+    parser.add_argument("run", help="latency JSON written by a harness --latency-out")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed p95 regression as a fraction (default %(default)s)")
+    args = parser.parse_args()
+
+    ok = check_against_baseline(load_rows(args.run), args.baseline, args.threshold,
+                                accept=args.command == "accept")
+    exit(0 if ok else 1)
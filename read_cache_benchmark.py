@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Read cache benchmark for the small public collections served from lib/cache.js
+Hammers the cached public GETs and reports server-side handler time (Server-Timing
+total) and client latency per endpoint, plus readCache hit/miss counters from
+GET /api/metrics:
+- /content, /skills, /services, /contact/info
+- Optional comparison against a run saved with the cache disabled
+
+Run the server once with READ_CACHE_TTL_MS=0 and --out, then again with the
+cache enabled and --compare pointing at the first file.
+
+Usage:
+    python read_cache_benchmark.py --iterations 500 --out cache-off.json
+    python read_cache_benchmark.py --iterations 500 --compare cache-off.json
+"""
+
+import argparse
+
+from perf_baseline import add_baseline_arguments, check_against_baseline
+from route_benchmark import RouteBenchmark, add_benchmark_arguments, run_benchmark
+
+
+class ReadCacheBenchmark(RouteBenchmark):
+    title = "🗄️  READ CACHE BENCHMARK"
+    routes = ["/content", "/skills", "/services", "/contact/info"]
+    counters = "readCache"
+
+    def print_counters(self, before, after):
+        print(f"{self.hit_summary(before, after)}, ttl {after['ttlMs']}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure public read latency with and without the in-process cache")
+    add_benchmark_arguments(parser, warmup=20)
+    add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    benchmark = ReadCacheBenchmark(args.base_url)
+    success = run_benchmark(benchmark, args)
+    if args.baseline:
+        success = check_against_baseline(benchmark.client.recorder.rows(), args.baseline,
+                                         args.max_regression, args.accept_baseline) and success
+    exit(0 if success else 1)
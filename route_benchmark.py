@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Shared harness for the per-route GET benchmarks (read_cache_benchmark.py,
+auth_cache_benchmark.py)
+A subclass names the routes to probe and the GET /api/metrics counters to read
+around the run; this module does the rest:
+- client latency and server handler time (Server-Timing total) per route
+- counter deltas from GET /api/metrics (needs a super admin login)
+- --out / --compare to save a run and compare a later one against it
+"""
+
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from api_client import get_client
+from dispatch_benchmark import parse_server_timing
+from latency_stats import Histogram
+
+
+class RouteBenchmark:
+    """Probe `routes` with GET and report latency per route"""
+
+    title = ""
+    routes: List[str] = []
+    # Key of the GET /api/metrics section reported around the run
+    counters = ""
+    # Send the login token with every probe
+    authenticated = False
+
+    def __init__(self, base_url: str = "http://localhost:3000"):
+        self.client = get_client(f"{base_url}/api")
+        self.token: Optional[str] = None
+        self.server_us: Dict[str, Histogram] = {}
+        self.client_us: Dict[str, Histogram] = {}
+        self.errors = 0
+
+    def login(self, username: str, password: str) -> bool:
+        response = self.client.request("POST", "/auth/login", json={"username": username, "password": password})
+        self.token = response.json().get("token") if response.status_code == 200 else None
+        return bool(self.token)
+
+    def counter_stats(self) -> Optional[Dict[str, Any]]:
+        if not self.token:
+            return None
+        response = self.client.request("GET", "/metrics", headers={"Authorization": f"Bearer {self.token}"})
+        return response.json().get(self.counters) if response.status_code == 200 else None
+
+    def probe(self, route: str):
+        headers = {"Authorization": f"Bearer {self.token}"} if self.authenticated else None
+        start = time.perf_counter()
+        try:
+            response = self.client.request("GET", route, headers=headers)
+        except requests.exceptions.RequestException as e:
+            self.errors += 1
+            print(f"❌ GET {route}: {e}")
+            return
+        elapsed_us = int((time.perf_counter() - start) * 1_000_000)
+        if response.status_code >= 400:
+            self.errors += 1
+            return
+
+        self.client_us.setdefault(route, Histogram()).record(elapsed_us)
+        timings = parse_server_timing(response.headers.get("Server-Timing"))
+        if "total" in timings:
+            self.server_us.setdefault(route, Histogram()).record(int(timings["total"] * 1000))
+
+    def run(self, iterations: int, warmup: int = 0, concurrency: int = 1) -> float:
+        print(f"🚀 {len(self.routes)} routes × {iterations} iterations, concurrency {concurrency}, "
+              f"at {self.client.api_base}")
+        if warmup:
+            for _ in range(warmup):
+                for route in self.routes:
+                    self.probe(route)
+            self.server_us.clear()
+            self.client_us.clear()
+            self.client.recorder.reset()
+
+        start = time.time()
+        work = [route for _ in range(iterations) for route in self.routes]
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(self.probe, work))
+        return time.time() - start
+
+    def rows(self) -> List[Dict[str, Any]]:
+        rows = []
+        for route in self.routes:
+            client = self.client_us.get(route)
+            if not client:
+                continue
+            server = self.server_us.get(route)
+            rows.append({
+                "route": f"GET {route}",
+                "count": client.total,
+                "server_p50_us": server.percentile(50) if server else None,
+                "server_p99_us": server.percentile(99) if server else None,
+                "client_p50_us": client.percentile(50),
+                "client_p99_us": client.percentile(99)
+            })
+        return rows
+
+    def hit_summary(self, before: Dict[str, Any], after: Dict[str, Any]) -> str:
+        """Hits, misses and fill of a cache counter section over the run"""
+        hits = after["hits"] - before["hits"]
+        misses = after["misses"] - before["misses"]
+        ratio = hits / (hits + misses) if hits + misses else 0
+        return (f"{self.counters}: {hits} hits, {misses} misses ({ratio:.1%} hit rate), "
+                f"{after['size']}/{after['maxEntries']} entries")
+
+    def print_counters(self, before: Dict[str, Any], after: Dict[str, Any]):
+        """Report the counter section; subclasses print what their counters mean"""
+        raise NotImplementedError
+
+    def print_report(self, elapsed: float, before: Optional[Dict], after: Optional[Dict],
+                     compare: Optional[List[Dict[str, Any]]] = None):
+        rows = self.rows()
+        print("\n" + "=" * 80)
+        print(self.title)
+        print("=" * 80)
+        if self.errors:
+            print(f"⚠️  {self.errors} requests failed or returned an error status")
+        print(f"{'Route':<34} {'Count':>6} {'srv p50 µs':>11} {'srv p99 µs':>11} {'cli p50 µs':>11} {'cli p99 µs':>11}")
+        print("-" * 90)
+        for row in rows:
+            print(f"{row['route']:<34} {row['count']:>6} {row['server_p50_us'] or '-':>11} "
+                  f"{row['server_p99_us'] or '-':>11} {row['client_p50_us']:>11} {row['client_p99_us']:>11}")
+
+        if before is not None and after is not None:
+            print()
+            self.print_counters(before, after)
+        else:
+            print(f"\n{self.counters} counters unavailable (GET /api/metrics needs a super admin)")
+
+        if compare:
+            previous = {row["route"]: row for row in compare}
+            print(f"\n{'Route':<34} {'before p50 µs':>14} {'now p50 µs':>11} {'saved µs':>9} {'speedup':>8}")
+            print("-" * 80)
+            for row in rows:
+                old = previous.get(row["route"], {}).get("server_p50_us")
+                now = row["server_p50_us"]
+                saved = f"{old - now}" if old is not None and now is not None else "-"
+                speedup = f"{old / now:.1f}x" if old and now else "-"
+                print(f"{row['route']:<34} {old if old is not None else '-':>14} "
+                      f"{now if now is not None else '-':>11} {saved:>9} {speedup:>8}")
+
+        print(f"\nElapsed: {elapsed:.1f}s")
+        self.client.print_connection_stats()
+
+
+def add_benchmark_arguments(parser: argparse.ArgumentParser, warmup: int = 0):
+    parser.add_argument("--base-url", default="http://localhost:3000")
+    parser.add_argument("--username", default="admin", help="super admin used to read /api/metrics")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--iterations", type=int, default=200, help="passes over the routes")
+    parser.add_argument("--warmup", type=int, default=warmup, help="unrecorded passes before measuring")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--out", help="write the per-route rows to this JSON file")
+    parser.add_argument("--compare", help="rows JSON from an earlier run to compare against")
+
+
+def run_benchmark(benchmark: RouteBenchmark, args: argparse.Namespace, login_required: bool = False) -> bool:
+    """Log in, run, report and save; True when every route answered without errors"""
+    if not benchmark.login(args.username, args.password):
+        if login_required:
+            print("❌ Login failed - check --username/--password")
+            return False
+        print(f"⚠️  Login failed - {benchmark.counters} counters will not be reported")
+    before = benchmark.counter_stats()
+    elapsed = benchmark.run(args.iterations, args.warmup, args.concurrency)
+    after = benchmark.counter_stats()
+
+    compare = None
+    if args.compare:
+        with open(args.compare) as handle:
+            compare = json.load(handle)["routes"]
+    benchmark.print_report(elapsed, before, after, compare)
+
+    if args.out:
+        with open(args.out, "w") as handle:
+            json.dump({"routes": benchmark.rows(), benchmark.counters: after}, handle, indent=2)
+        print(f"📝 Route timings written to {args.out}")
+
+    return bool(benchmark.rows()) and not benchmark.errors
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Dependency-aware parallel scheduler for the backend test suites
+Each test declares the tests it needs (e.g. "needs super-admin token",
+"needs the regular admin created in test 1"); tests whose dependencies
+have finished run concurrently, and cleanup always runs once at the end.
+"""
+
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+class SuiteTask:
+    def __init__(self, name: str, func: Callable[[], Any], requires: Sequence[str] = ()):
+        self.name = name
+        self.func = func
+        self.requires = tuple(requires)
+
+
+def validate_tasks(tasks: List[SuiteTask]):
+    """Reject unknown or duplicate task names and dependency cycles"""
+    names = [task.name for task in tasks]
+    if len(set(names)) != len(names):
+        raise ValueError("Duplicate task names in suite")
+    by_name = {task.name: task for task in tasks}
+    for task in tasks:
+        missing = [dep for dep in task.requires if dep not in by_name]
+        if missing:
+            raise ValueError(f"Task '{task.name}' requires unknown tasks: {', '.join(missing)}")
+
+    visiting, done = set(), set()
+
+    def visit(name: str):
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Dependency cycle through task '{name}'")
+        visiting.add(name)
+        for dep in by_name[name].requires:
+            visit(dep)
+        visiting.discard(name)
+        done.add(name)
+
+    for name in names:
+        visit(name)
+
+
+def run_suite(tasks: List[SuiteTask], cleanup: Optional[Callable[[], Any]] = None, workers: int = 4) -> List[Any]:
+    """Run tasks as soon as their dependencies finish; returns results in declaration order.
+
+    Dependencies only order execution: a dependent still runs when its dependency
+    returned False, exactly as in the old sequential runners. A task that raises
+    is reported and counted as False. Cleanup runs even if a task raises.
+    """
+    validate_tasks(tasks)
+    results: Dict[str, Any] = {}
+    finished = set()
+    pending = list(tasks)
+    print_lock = threading.Lock()
+
+    def execute(task: SuiteTask):
+        try:
+            return task.func()
+        except Exception:
+            with print_lock:
+                print(f"❌ Task '{task.name}' raised an exception:")
+                traceback.print_exc()
+            return False
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            running = {}
+            while pending or running:
+                # Submit in declaration order so workers=1 reproduces the sequential run
+                for task in list(pending):
+                    if len(running) >= max(1, workers):
+                        break
+                    if all(dep in finished for dep in task.requires):
+                        pending.remove(task)
+                        running[pool.submit(execute, task)] = task
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    results[task.name] = future.result()
+                    finished.add(task.name)
+    finally:
+        if cleanup:
+            cleanup()
+
+    return [results.get(task.name, False) for task in tasks]
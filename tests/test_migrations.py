@@ -0,0 +1,126 @@
+"""
+Unit tests for migrations.py against a small in-memory stand-in for the
+pymongo calls the runner makes (find, count_documents, bulk_write of UpdateOne)
+"""
+
+import copy
+import unittest
+
+from bson import ObjectId
+
+from migrations import BucketChatMessages, run_migration
+
+
+def matches(doc, filter):
+    for key, condition in filter.items():
+        if isinstance(condition, dict) and "$exists" in condition:
+            if (key in doc) != condition["$exists"]:
+                return False
+        elif doc.get(key) != condition:
+            return False
+    return True
+
+
+class BulkResult:
+    def __init__(self, modified_count):
+        self.modified_count = modified_count
+
+
+class FakeCollection:
+    def __init__(self, name, docs=None):
+        self.name = name
+        self.docs = docs or []
+        # Called with the collection after find() has produced its snapshot
+        self.after_find = None
+
+    def find(self, filter=None, projection=None, batch_size=0):
+        snapshot = [copy.deepcopy(doc) for doc in self.docs if matches(doc, filter or {})]
+        if self.after_find:
+            self.after_find(self)
+        return FakeCursor(snapshot)
+
+    def find_one(self, filter):
+        return next((doc for doc in self.docs if matches(doc, filter)), None)
+
+    def count_documents(self, filter):
+        return sum(matches(doc, filter) for doc in self.docs)
+
+    def update_one(self, filter, update, upsert=False):
+        doc = self.find_one(filter)
+        if doc is None:
+            if not upsert:
+                return BulkResult(0)
+            doc = {key: value for key, value in filter.items() if not isinstance(value, dict)}
+            doc.update(copy.deepcopy(update.get("$setOnInsert", {})))
+            self.docs.append(doc)
+        elif "$setOnInsert" in update and len(update) == 1:
+            return BulkResult(0)
+        doc.update(copy.deepcopy(update.get("$set", {})))
+        for key, by in update.get("$inc", {}).items():
+            doc[key] = doc.get(key, 0) + by
+        for key in update.get("$unset", {}):
+            doc.pop(key, None)
+        return BulkResult(1)
+
+    def bulk_write(self, ops, ordered=True):
+        modified = sum(self.update_one(op._filter, op._doc, op._upsert).modified_count for op in ops)
+        return BulkResult(modified)
+
+
+class FakeCursor(list):
+    def limit(self, limit):
+        return FakeCursor(self[:limit]) if limit else self
+
+
+class FakeDatabase(dict):
+    def __missing__(self, name):
+        collection = self[name] = FakeCollection(name)
+        return collection
+
+
+def message(seq, text):
+    return {"id": f"m{seq}", "sender": "customer", "message": text, "read": False}
+
+
+class BucketChatMessagesTest(unittest.TestCase):
+    def setUp(self):
+        self.db = FakeDatabase()
+        self.db["chats"].docs.append({
+            "_id": ObjectId(),
+            "id": "chat-1",
+            "messages": [message(1, "hello"), message(2, "anyone there?")]
+        })
+
+    def test_buckets_legacy_messages(self):
+        result = run_migration(self.db, BucketChatMessages())
+
+        chat = self.db["chats"].find_one({"id": "chat-1"})
+        bucket = self.db["chat_messages"].find_one({"chatId": "chat-1", "bucket": 0})
+        self.assertEqual(result["remaining"], 0)
+        self.assertNotIn("messages", chat)
+        self.assertEqual((chat["messageCount"], chat["storedSeq"]), (2, 2))
+        self.assertEqual([m["seq"] for m in bucket["messages"]], [1, 2])
+
+    def test_chat_upgraded_between_find_and_write(self):
+        def lazy_upgrade_and_append(chats):
+            # What upgradeLegacyChat + appendMessage in lib/chat-store.js do meanwhile
+            chat = chats.docs[0]
+            stored = [dict(m, seq=i + 1) for i, m in enumerate(chat.pop("messages"))]
+            stored.append(dict(message(3, "still here"), seq=3))
+            chat.update(messageCount=3, storedSeq=3, lastMessage=stored[-1])
+            self.db["chat_messages"].docs.append(
+                {"chatId": "chat-1", "bucket": 0, "count": len(stored), "messages": stored})
+
+        self.db["chats"].after_find = lazy_upgrade_and_append
+        result = run_migration(self.db, BucketChatMessages())
+
+        chat = self.db["chats"].find_one({"id": "chat-1"})
+        bucket = self.db["chat_messages"].find_one({"chatId": "chat-1", "bucket": 0})
+        self.assertEqual(result["modified"], 0)
+        self.assertEqual((chat["messageCount"], chat["storedSeq"]), (3, 3))
+        self.assertEqual(chat["lastMessage"]["seq"], 3)
+        self.assertEqual([m["seq"] for m in bucket["messages"]], [1, 2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()